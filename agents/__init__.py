@@ -13,40 +13,91 @@ Claude FastAPI Agent系统
 - 与Claude Code CLI集成
 """
 
-# 动态导入以处理依赖问题
-try:
-    from .doc_agent import documentation_agent, generate_docs, analyze_code, check_health
-    DOC_AGENT_AVAILABLE = True
-except ImportError:
-    DOC_AGENT_AVAILABLE = False
-    documentation_agent = None
-    generate_docs = None
-    analyze_code = None
-    check_health = None
-
-try:
-    from .frontend_agent import (
-        frontend_agent,
-        generate_vue_component,
-        design_ui_layout,
-        optimize_ux,
-        create_component_library,
-        analyze_performance,
-        check_frontend_health
-    )
-    FRONTEND_AGENT_AVAILABLE = True
-except ImportError:
+import importlib
+import importlib.util
+import sys
+
+# 延迟导入 (PEP 562): 首次访问属性时才加载对应的Agent模块及其依赖
+_LAZY = {
+    # 文档生成Agent
+    "documentation_agent": ("agents.doc_agent", "doc_agent"),
+    "generate_docs": ("agents.doc_agent", "generate_api_docs"),
+    "analyze_code": ("agents.doc_agent", "analyze_and_document"),
+    "check_health": ("agents.doc_agent", "check_doc_agent_health"),
+
+    # 前端开发专家Agent
+    "frontend_agent": ("agents.frontend_agent", "frontend_agent"),
+    "generate_vue_component": ("agents.frontend_agent", "generate_vue_component"),
+    "design_ui_layout": ("agents.frontend_agent", "design_ui_layout"),
+    "optimize_ux": ("agents.frontend_agent", "optimize_ux"),
+    "create_component_library": ("agents.frontend_agent", "create_component_library"),
+    "analyze_performance": ("agents.frontend_agent", "analyze_performance"),
+    "check_frontend_health": ("agents.frontend_agent", "check_frontend_health"),
+}
+
+_AVAILABILITY = {
+    "DOC_AGENT_AVAILABLE": "documentation_agent",
+    "FRONTEND_AGENT_AVAILABLE": "frontend_agent",
+}
+
+
+def _lazy_import(modname):
+    """通过LazyLoader导入模块，模块体在首次访问其属性时才执行"""
+    if modname in sys.modules:
+        return sys.modules[modname]
+    spec = importlib.util.find_spec(modname)
+    if spec is None:
+        return None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[modname] = module
+    loader.exec_module(module)
+    return module
+
+
+def _load(name):
+    """导入并返回延迟导出的属性"""
+    mod, attr = _LAZY[name]
+    if mod == "agents.doc_agent":
+        try:
+            return getattr(importlib.import_module(mod), attr)
+        except ImportError:
+            # 文档Agent依赖不可用时保持原有的None语义
+            return None
+
+    module = _lazy_import(mod)
+    if module is not None:
+        try:
+            return getattr(module, attr)
+        except ImportError:
+            # 延迟执行的模块体导入失败，移除半初始化的模块
+            sys.modules.pop(mod, None)
+
     # 使用简化版前端Agent
-    from .frontend_agent_simple import (
-        frontend_agent_simple as frontend_agent,
-        generate_vue_component_simple as generate_vue_component,
-        design_ui_layout_simple as design_ui_layout,
-        optimize_ux_simple as optimize_ux,
-        create_component_library_simple as create_component_library,
-        analyze_performance_simple as analyze_performance,
-        check_frontend_health_simple as check_frontend_health
-    )
-    FRONTEND_AGENT_AVAILABLE = True
+    module = _lazy_import("agents.frontend_agent_simple")
+    if module is None:
+        raise ImportError(f"无法导入前端Agent: {mod}")
+    return getattr(module, f"{attr}_simple")
+
+
+def __getattr__(name):
+    if name in _AVAILABILITY:
+        try:
+            value = _load(_AVAILABILITY[name]) is not None
+        except ImportError:
+            value = False
+    elif name in _LAZY:
+        value = _load(name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return list(__all__)
+
 
 __all__ = [
     # 文档生成Agent
@@ -65,4 +116,4 @@ __all__ = [
     "check_frontend_health"
 ]
 
-__version__ = "1.0.0"
\ No newline at end of file
+__version__ = "1.0.0"
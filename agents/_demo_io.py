@@ -0,0 +1,43 @@
+"""
+演示脚本共用的输入输出辅助函数
+"""
+
+import sys
+
+_tb_mod = None
+
+
+def write_lines(lines):
+    """一次性写出整段演示输出，避免逐行print的多次写入"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def write_banner(banner):
+    """写出预编码的横幅；stdout为UTF-8二进制流时跳过文本层编码"""
+    out = sys.stdout
+    buffer = getattr(out, "buffer", None)
+    if buffer is None or (out.encoding or "").lower().replace("-", "") != "utf8":
+        out.write(banner.decode("utf-8"))
+        return
+    # 先刷新文本层缓冲，保证与print输出的先后顺序
+    out.flush()
+    buffer.write(banner)
+
+
+def read_line(prompt):
+    """读取一行输入；非终端输入（脚本管道）时直接读stdin，减少每次提示的开销"""
+    if sys.stdin.isatty():
+        return input(prompt)
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip("\n")
+
+
+def print_tb():
+    """打印当前异常堆栈；traceback模块仅在首次出错时导入"""
+    global _tb_mod
+    _tb_mod = _tb_mod or __import__('traceback')
+    _tb_mod.print_exc()
@@ -3,20 +3,148 @@ Claude Code集成工具
 提供与Claude Code的无缝集成功能
 """
 
+import asyncio
+import codecs
+import functools
 import subprocess
-import json
 import os
-from typing import Dict, Any, Optional, List
+import re
+import select
+import signal
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Iterator, Optional, List
 from pathlib import Path
 
 
+COMMAND_TIMEOUT = 300  # 5分钟超时
+OUTPUT_HEAD_LIMIT = 10_000  # 输出保留的头部字节数
+OUTPUT_TAIL_LIMIT = 20_000  # 输出保留的尾部字节数
+# 需要排除的文件/目录名：隐藏项、缓存目录和虚拟环境
+SKIPPED_NAME_RE = re.compile(r'\.|(?:__pycache__|venv|node_modules)\Z')
+STATUS_CACHE_TTL = 5.0  # 健康检查/文件列表缓存时间(秒)
+RESPONSE_CACHE_SIZE = 256  # 分析/文档结果缓存条目上限
+
+# 文档生成prompt模板，按文档类型选择
+DOC_PROMPT_TEMPLATES = {
+    "api": "为 %s 生成详细的API文档，包括接口说明、参数、返回值和使用示例",
+    "readme": "为 %s 生成README.md文档，包括项目介绍、安装指南、使用方法",
+    "technical": "为 %s 生成技术文档，包括架构设计、实现原理和开发指南",
+    "user": "为 %s 生成用户文档，包括功能介绍、操作步骤和常见问题"
+}
+
+REVIEW_PROMPT_TEMPLATE = """
+        请审查文件 %s 的代码质量，检查以下方面：
+        1. 代码规范和风格
+        2. 潜在的bug和安全问题
+        3. 性能优化建议
+        4. 最佳实践建议
+        5. 可读性和维护性
+        """
+
+EXPLAIN_PROMPT_TEMPLATE = """
+        请详细解释文件 %s 的功能和实现：
+        1. 主要功能和用途
+        2. 关键类和方法的作用
+        3. 实现逻辑和算法
+        4. 与其他模块的关系
+        5. 使用示例
+        """
+
+IMPROVEMENT_PROMPT_TEMPLATE = """
+        针对 %s 提供改进建议：
+        1. 代码质量提升
+        2. 性能优化
+        3. 安全性增强
+        4. 可维护性改进
+        5. 新功能建议
+        """
+
+
+def ttl_cache(ttl: float):
+    """按实例和参数缓存方法结果，在ttl秒内重复调用直接返回缓存结果的浅拷贝
+    
+    缓存通过弱引用关联实例，实例释放后其缓存随之清除。
+    """
+    def decorator(func):
+        caches = weakref.WeakKeyDictionary()
+        lock = threading.Lock()
+        
+        @functools.wraps(func)
+        def wrapper(self, *args):
+            now = time.monotonic()
+            with lock:
+                cache = caches.setdefault(self, {})
+                hit = cache.get(args)
+            if hit is None or now - hit[0] >= ttl:
+                # 计算在锁外进行，避免慢调用阻塞其他实例的缓存读取
+                hit = (now, func(self, *args))
+                with lock:
+                    cache[args] = hit
+            # 返回外层容器的副本，调用方增删条目不会影响缓存
+            value = hit[1]
+            if isinstance(value, dict):
+                return dict(value)
+            if isinstance(value, list):
+                return list(value)
+            return value
+        
+        return wrapper
+    return decorator
+
+
+class _CappedOutput:
+    """只保留输出头部和尾部的缓冲区，防止大输出占用过多内存"""
+    
+    def __init__(self):
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.truncated = False
+    
+    def feed(self, chunk: bytes):
+        room = OUTPUT_HEAD_LIMIT - len(self.head)
+        if room > 0:
+            self.head += chunk[:room]
+            chunk = chunk[room:]
+        if chunk:
+            self.tail += chunk
+            if len(self.tail) > OUTPUT_TAIL_LIMIT:
+                del self.tail[:-OUTPUT_TAIL_LIMIT]
+                self.truncated = True
+    
+    def getvalue(self) -> str:
+        separator = b"\n...[truncated]...\n" if self.truncated else b""
+        return (bytes(self.head) + separator + bytes(self.tail)).decode('utf-8', errors='replace')
+
+
 class ClaudeCodeIntegration:
     """Claude Code集成类"""
     
     def __init__(self, project_path: str):
         self.project_path = Path(project_path)
+        self._interrupt = False
+        self._relative_path_cache = functools.lru_cache(maxsize=512)(self._resolve_relative_path)
+        # 开启后相同文件、相同请求的结果直接复用，文件修改后自动失效
+        self.enable_cache = False
+        self._response_cache = OrderedDict()
+        # 命令可能在多个线程中并发执行，缓存的读写需要加锁
+        self._cache_lock = threading.Lock()
         self.ensure_project_exists()
     
+    def __getstate__(self):
+        # lru_cache包装的绑定方法和锁无法pickle，传给子进程时去掉，在子进程中重建
+        state = self.__dict__.copy()
+        del state['_relative_path_cache']
+        del state['_cache_lock']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._relative_path_cache = functools.lru_cache(maxsize=512)(self._resolve_relative_path)
+        self._cache_lock = threading.Lock()
+    
     def ensure_project_exists(self):
         """确保项目路径存在"""
         if not self.project_path.exists():
@@ -24,79 +152,275 @@ class ClaudeCodeIntegration:
     
     def execute_command(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> str:
         """执行Claude Code命令"""
+        self._interrupt = False
         try:
             # 构建命令 - 使用交互式方式
             env = os.environ.copy()
             env['CLAUDE_AUTO_ACCEPT'] = 'true'  # 自动接受建议
+            env['PYTHONUNBUFFERED'] = '1'  # 避免子进程输出缓冲导致挂起
             
-            # 使用echo传递prompt到claude
-            cmd = f'echo "{prompt}" | claude'
+            # 直接通过stdin传递prompt，不经过shell
+            with subprocess.Popen(
+                ["claude"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=self.project_path,
+                env=env,
+                start_new_session=True  # 独立进程组，超时时可整体终止
+            ) as proc:
+                proc.stdin.write(prompt.encode('utf-8'))
+                proc.stdin.close()
+                
+                # 非阻塞读取stdout/stderr，避免管道写满导致子进程阻塞
+                stdout, stderr = _CappedOutput(), _CappedOutput()
+                streams = {proc.stdout.fileno(): stdout, proc.stderr.fileno(): stderr}
+                for fd in streams:
+                    os.set_blocking(fd, False)
+                
+                # 轮询循环中频繁调用的函数绑定为局部变量
+                _select, _read, _now = select.select, os.read, time.monotonic
+                
+                deadline = _now() + COMMAND_TIMEOUT
+                while streams:
+                    if self._interrupt or _now() > deadline:
+                        os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
+                        proc.wait()
+                        return "❌ 执行已中断" if self._interrupt else "❌ 执行超时 (5分钟)"
+                    
+                    ready, _, _ = _select(list(streams), [], [], 0.1)
+                    for fd in ready:
+                        chunk = _read(fd, 65536)
+                        if chunk:
+                            streams[fd].feed(chunk)
+                        else:
+                            del streams[fd]
+                
+                proc.wait()
             
-            # 执行命令
-            result = subprocess.run(
-                cmd,
-                shell=True,
-                capture_output=True,
-                text=True,
+            if proc.returncode == 0:
+                return stdout.getvalue().strip()
+            else:
+                error_msg = stderr.getvalue().strip()
+                return f"❌ 执行失败: {error_msg}"
+                
+        except Exception as e:
+            return f"❌ 执行异常: {str(e)}"
+    
+    async def aexecute_command(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> str:
+        """异步执行Claude Code命令，可配合asyncio.gather并发执行多个prompt"""
+        try:
+            env = os.environ.copy()
+            env['CLAUDE_AUTO_ACCEPT'] = 'true'  # 自动接受建议
+            env['PYTHONUNBUFFERED'] = '1'  # 避免子进程输出缓冲导致挂起
+            
+            proc = await asyncio.create_subprocess_exec(
+                "claude",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
                 cwd=self.project_path,
                 env=env,
-                timeout=300  # 5分钟超时
+                start_new_session=True  # 独立进程组，超时时可整体终止
             )
+            stdout, stderr = _CappedOutput(), _CappedOutput()
+            
+            async def drain(stream: asyncio.StreamReader, buffer: _CappedOutput):
+                while chunk := await stream.read(65536):
+                    buffer.feed(chunk)
+            
+            async def communicate() -> int:
+                proc.stdin.write(prompt.encode('utf-8'))
+                await proc.stdin.drain()
+                proc.stdin.close()
+                await asyncio.gather(drain(proc.stdout, stdout), drain(proc.stderr, stderr))
+                return await proc.wait()
             
-            if result.returncode == 0:
-                return result.stdout.strip()
+            try:
+                returncode = await asyncio.wait_for(communicate(), timeout=COMMAND_TIMEOUT)
+            except asyncio.TimeoutError:
+                return "❌ 执行超时 (5分钟)"
+            finally:
+                # 超时、被取消或写入失败时子进程仍在运行，整组终止并回收，避免继续消耗token
+                if proc.returncode is None:
+                    try:
+                        os.killpg(proc.pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+                    await proc.wait()
+            
+            if returncode == 0:
+                return stdout.getvalue().strip()
             else:
-                error_msg = result.stderr.strip()
+                error_msg = stderr.getvalue().strip()
                 return f"❌ 执行失败: {error_msg}"
                 
-        except subprocess.TimeoutExpired:
-            return "❌ 执行超时 (5分钟)"
         except Exception as e:
             return f"❌ 执行异常: {str(e)}"
     
+    def stream_command(self, prompt: str, on_complete: Optional[Callable[[str], None]] = None) -> Iterator[str]:
+        """流式执行Claude Code命令，逐块产出输出；提前关闭生成器会终止子进程
+        
+        执行失败或超时时，最后产出与execute_command相同格式的错误标记（以"❌"开头的一行）。
+        命令完整执行成功后，以完整输出调用on_complete；提前关闭或失败时不调用。
+        """
+        env = os.environ.copy()
+        env['CLAUDE_AUTO_ACCEPT'] = 'true'  # 自动接受建议
+        env['PYTHONUNBUFFERED'] = '1'  # 避免子进程输出缓冲导致挂起
+        
+        proc = subprocess.Popen(
+            ["claude"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=self.project_path,
+            env=env,
+            start_new_session=True  # 独立进程组，提前结束时可整体终止
+        )
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        stderr = _CappedOutput()
+        collected = [] if on_complete is not None else None
+        finished = False
+        try:
+            proc.stdin.write(prompt.encode('utf-8'))
+            proc.stdin.close()
+            
+            out_fd, err_fd = proc.stdout.fileno(), proc.stderr.fileno()
+            open_fds = [out_fd, err_fd]
+            deadline = time.monotonic() + COMMAND_TIMEOUT
+            while open_fds and time.monotonic() < deadline:
+                ready, _, _ = select.select(open_fds, [], [], 0.1)
+                for fd in ready:
+                    chunk = os.read(fd, 65536)
+                    if not chunk:
+                        open_fds.remove(fd)
+                    elif fd == err_fd:
+                        stderr.feed(chunk)
+                    else:
+                        text = decoder.decode(chunk)
+                        if text:
+                            if collected is not None:
+                                collected.append(text)
+                            yield text
+            finished = not open_fds
+            
+            tail = decoder.decode(b'', final=True)
+            if tail:
+                if collected is not None:
+                    collected.append(tail)
+                yield tail
+            
+            if not finished:
+                yield "\n❌ 执行超时 (5分钟)"
+            elif proc.wait() != 0:
+                yield f"\n❌ 执行失败: {stderr.getvalue().strip()}"
+            elif collected is not None:
+                on_complete("".join(collected).strip())
+        finally:
+            # 超时或调用方不再读取时终止生成，节省输出token
+            if not finished and proc.poll() is None:
+                os.killpg(proc.pid, signal.SIGKILL)
+            proc.wait()
+            proc.stdout.close()
+            proc.stderr.close()
+    
+    async def aexecute_commands(self, prompts: List[str]) -> List[str]:
+        """并发执行多个Claude Code命令，按输入顺序返回结果"""
+        return list(await asyncio.gather(*(self.aexecute_command(prompt) for prompt in prompts)))
+    
+    def interrupt(self):
+        """中断正在执行的Claude Code命令"""
+        self._interrupt = True
+    
+    def _cache_key(self, prompt: str, target: str):
+        """缓存键：prompt加目标文件的修改时间，文件变化后旧结果不再命中"""
+        try:
+            mtime = (self.project_path / target).stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        return prompt, mtime
+    
+    def _cache_get(self, key) -> Optional[str]:
+        with self._cache_lock:
+            result = self._response_cache.get(key)
+            if result is not None:
+                self._response_cache.move_to_end(key)
+            return result
+    
+    def _cache_put(self, key, result: str):
+        # 失败结果不缓存，下次调用重新执行
+        if result.startswith("❌"):
+            return
+        with self._cache_lock:
+            self._response_cache[key] = result
+            if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+    
+    def _cached_command(self, prompt: str, target: str) -> str:
+        """执行命令，开启缓存时复用相同请求的结果"""
+        if not self.enable_cache:
+            return self.execute_command(prompt)
+        key = self._cache_key(prompt, target)
+        result = self._cache_get(key)
+        if result is None:
+            result = self.execute_command(prompt)
+            self._cache_put(key, result)
+        return result
+    
+    def _doc_target(self, target: str, doc_type: str):
+        """规范化文档目标，返回(相对路径, prompt)"""
+        relative_path = os.path.normpath(self._get_relative_path(target))
+        template = DOC_PROMPT_TEMPLATES.get(doc_type, DOC_PROMPT_TEMPLATES["api"])
+        return relative_path, template % relative_path
+    
     def analyze_file(self, file_path: str) -> str:
         """分析指定文件"""
-        relative_path = self._get_relative_path(file_path)
+        relative_path = os.path.normpath(self._get_relative_path(file_path))
         prompt = f"请分析文件 {relative_path} 的内容，包括功能、结构和可能的改进点"
-        return self.execute_command(prompt)
+        return self._cached_command(prompt, relative_path)
     
     def generate_documentation(self, target: str, doc_type: str = "api") -> str:
         """生成文档"""
-        prompts = {
-            "api": f"为 {target} 生成详细的API文档，包括接口说明、参数、返回值和使用示例",
-            "readme": f"为 {target} 生成README.md文档，包括项目介绍、安装指南、使用方法",
-            "technical": f"为 {target} 生成技术文档，包括架构设计、实现原理和开发指南",
-            "user": f"为 {target} 生成用户文档，包括功能介绍、操作步骤和常见问题"
-        }
+        relative_path, prompt = self._doc_target(target, doc_type)
+        return self._cached_command(prompt, relative_path)
+    
+    async def agenerate_documentation(self, target: str, doc_type: str = "api") -> str:
+        """异步生成文档"""
+        relative_path, prompt = self._doc_target(target, doc_type)
+        if not self.enable_cache:
+            return await self.aexecute_command(prompt)
+        key = self._cache_key(prompt, relative_path)
+        result = self._cache_get(key)
+        if result is None:
+            result = await self.aexecute_command(prompt)
+            self._cache_put(key, result)
+        return result
+    
+    def generate_documentation_stream(self, target: str, doc_type: str = "api") -> Iterator[str]:
+        """流式生成文档，适合只需预览开头内容的场景
         
-        prompt = prompts.get(doc_type, prompts["api"])
-        return self.execute_command(prompt)
+        开启缓存时先查缓存；完整读完且执行成功的结果写入缓存，
+        之后generate_documentation可直接复用，提前关闭的流不写入
+        """
+        relative_path, prompt = self._doc_target(target, doc_type)
+        if not self.enable_cache:
+            return self.stream_command(prompt)
+        key = self._cache_key(prompt, relative_path)
+        result = self._cache_get(key)
+        if result is not None:
+            # 包装为生成器，与流式结果一样支持close()
+            return (chunk for chunk in (result,))
+        return self.stream_command(prompt, on_complete=lambda output: self._cache_put(key, output))
     
     def review_code(self, file_path: str) -> str:
         """代码审查"""
         relative_path = self._get_relative_path(file_path)
-        prompt = f"""
-        请审查文件 {relative_path} 的代码质量，检查以下方面：
-        1. 代码规范和风格
-        2. 潜在的bug和安全问题
-        3. 性能优化建议
-        4. 最佳实践建议
-        5. 可读性和维护性
-        """
-        return self.execute_command(prompt)
+        return self.execute_command(REVIEW_PROMPT_TEMPLATE % relative_path)
     
     def explain_code(self, file_path: str) -> str:
         """解释代码功能"""
         relative_path = self._get_relative_path(file_path)
-        prompt = f"""
-        请详细解释文件 {relative_path} 的功能和实现：
-        1. 主要功能和用途
-        2. 关键类和方法的作用
-        3. 实现逻辑和算法
-        4. 与其他模块的关系
-        5. 使用示例
-        """
-        return self.execute_command(prompt)
+        return self.execute_command(EXPLAIN_PROMPT_TEMPLATE % relative_path)
     
     def get_project_structure(self) -> str:
         """获取项目结构"""
@@ -105,18 +429,14 @@ class ClaudeCodeIntegration:
     
     def suggest_improvements(self, target: str) -> str:
         """建议改进"""
-        prompt = f"""
-        针对 {target} 提供改进建议：
-        1. 代码质量提升
-        2. 性能优化
-        3. 安全性增强
-        4. 可维护性改进
-        5. 新功能建议
-        """
-        return self.execute_command(prompt)
+        return self.execute_command(IMPROVEMENT_PROMPT_TEMPLATE % target)
     
     def _get_relative_path(self, file_path: str) -> str:
         """获取相对路径"""
+        return self._relative_path_cache(file_path)
+    
+    def _resolve_relative_path(self, file_path: str) -> str:
+        """计算相对于项目根目录的路径"""
         try:
             abs_path = Path(file_path)
             if abs_path.is_absolute():
@@ -125,16 +445,27 @@ class ClaudeCodeIntegration:
         except ValueError:
             return file_path
     
+    @ttl_cache(STATUS_CACHE_TTL)
     def list_python_files(self) -> List[str]:
         """列出所有Python文件"""
         python_files = []
-        for py_file in self.project_path.rglob("*.py"):
-            # 排除虚拟环境和缓存目录
-            if not any(part.startswith('.') or part == '__pycache__' or part == 'venv' 
-                      for part in py_file.parts):
-                python_files.append(str(py_file.relative_to(self.project_path)))
+        root = str(self.project_path)
+        
+        def walk(directory: str):
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # 排除隐藏文件/目录、虚拟环境和缓存目录，不进入被排除的目录
+                    if SKIPPED_NAME_RE.match(entry.name):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        walk(entry.path)
+                    elif entry.name.endswith('.py'):
+                        python_files.append(os.path.relpath(entry.path, root))
+        
+        walk(root)
         return python_files
     
+    @ttl_cache(STATUS_CACHE_TTL)
     def health_check(self) -> Dict[str, Any]:
         """健康检查"""
         try:
@@ -170,5 +501,13 @@ class ClaudeCodeIntegration:
             }
 
 
-# 全局实例
-claude_integration = ClaudeCodeIntegration("/Users/chiyingjie/code/git/claude-fastapi")
\ No newline at end of file
+@functools.lru_cache(maxsize=1)
+def get_claude_integration() -> ClaudeCodeIntegration:
+    """获取全局实例，项目路径取自PROJECT_PATH环境变量，默认为当前目录"""
+    return ClaudeCodeIntegration(os.environ.get("PROJECT_PATH", os.getcwd()))
+
+
+def __getattr__(name):
+    if name == "claude_integration":
+        return get_claude_integration()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
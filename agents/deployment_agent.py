@@ -3,41 +3,182 @@
 专门负责DevOps部署、CI/CD流水线、环境管理、容器化和监控配置
 """
 
-from crewai import Agent, Task, Crew, Process
-from typing import Dict, List, Optional, Any, Union
-from .tools import (
-    DocumentationGenerationTool,
-    CodeAnalysisTool,
-    ProjectStructureTool,
-    HealthCheckTool
+import functools
+import types
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Mapping, Optional, Any, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from crewai import Agent
+
+
+MAX_TOOL_WORKERS = 8  # 并发调用部署工具的最大线程数
+
+# 各优化领域的静态方案文本（模块加载时构建一次）
+_OPTIMIZATIONS: Mapping[str, str] = types.MappingProxyType({
+    'container_optimization': """
+🚀 容器性能优化:
+
+1. 镜像优化:
+   - 使用多阶段构建减少镜像大小
+   - 选择合适的基础镜像(Alpine vs Debian)
+   - 清理不必要的包和缓存
+   - 使用.dockerignore减少构建上下文
+
+2. 运行时优化:
+   - 配置合适的资源限制(CPU/Memory)
+   - 启用健康检查和就绪探针
+   - 优化启动时间和优雅关闭
+   - 使用非root用户运行容器
+
+3. 网络优化:
+   - 配置容器网络策略
+   - 启用网络缓存和压缩
+   - 优化负载均衡配置
+   - 减少容器间网络延迟
+""",
+    'resource_allocation': """
+⚙️ 资源分配优化:
+
+1. CPU优化:
+   - 根据应用特性分配CPU资源
+   - 启用CPU亲和性绑定
+   - 配置合适的CPU限制和请求
+   - 监控CPU使用率和调整
+
+2. 内存管理:
+   - 设置合理的内存限制
+   - 启用内存使用监控
+   - 配置OOM策略
+   - 优化JVM/Python内存设置
+
+3. 存储优化:
+   - 选择合适的存储类型
+   - 配置存储卷挂载策略
+   - 启用存储监控和告警
+   - 优化数据库存储配置
+""",
+    'caching_strategy': """
+🗄️ 缓存策略优化:
+
+1. 应用层缓存:
+   - Redis缓存配置优化
+   - 缓存失效策略设计
+   - 缓存预热和更新机制
+   - 分布式缓存一致性
+
+2. CDN和静态资源:
+   - 配置CDN加速
+   - 静态资源缓存策略
+   - 浏览器缓存优化
+   - 图片和媒体文件优化
+
+3. 数据库缓存:
+   - 查询结果缓存
+   - 连接池优化
+   - 读写分离配置
+   - 索引优化建议
+""",
+    'database_tuning': """
+🗃️ 数据库性能调优:
+
+1. PostgreSQL优化:
+   - 连接池配置(max_connections)
+   - 内存参数调优(shared_buffers, work_mem)
+   - 查询优化器配置
+   - 索引策略和维护
+
+2. Redis配置:
+   - 内存使用策略
+   - 持久化配置优化
+   - 主从复制设置
+   - 集群模式配置
+
+3. 监控和诊断:
+   - 慢查询日志分析
+   - 性能指标监控
+   - 瓶颈识别和优化
+   - 容量规划建议
+"""
+})
+
+# 性能优化实施步骤
+_IMPL_STEPS = (
+    "1. 分析当前性能基线和瓶颈",
+    "2. 按优先级实施优化措施",
+    "3. 监控优化效果和性能指标",
+    "4. 持续调优和性能测试",
+    "5. 建立性能监控和告警机制"
 )
-from .deployment_tools import (
-    DockerManagementTool,
-    CICDPipelineTool,
-    EnvironmentManagementTool,
-    MonitoringSetupTool
+
+# 关键监控指标
+_MONITOR_METRICS = (
+    "📊 应用响应时间 (P95/P99)",
+    "🔄 请求吞吐量 (RPS)",
+    "💾 内存使用率和垃圾回收",
+    "🏗️ CPU使用率和负载",
+    "🗄️ 数据库连接数和查询时间",
+    "📶 缓存命中率和性能",
+    "🌐 网络延迟和带宽使用"
 )
 
+# 各服务的备份配置说明
+_SERVICE_BACKUP_PLANS: Mapping[str, str] = types.MappingProxyType({
+    "db": """
+  📊 数据库备份:
+    - 全量备份: 每日凌晨自动执行
+    - 增量备份: 每小时WAL归档
+    - 异地备份: 跨可用区复制
+    - 备份验证: 定期恢复测试
+""",
+    "redis": """
+  🗄️ Redis缓存备份:
+    - RDB快照: 每6小时生成
+    - AOF日志: 实时持久化
+    - 主从复制: 实时数据同步
+    - 集群备份: 多节点冗余
+""",
+    "backend": """
+  🚀 应用服务备份:
+    - 容器镜像: 版本化存储
+    - 配置文件: Git版本控制
+    - 应用数据: 定期导出
+    - 日志备份: 长期存档
+"""
+})
+
 
 class DeploymentAgent:
     """部署专家Agent类"""
     
     def __init__(self):
+        # 延迟导入工具模块，避免导入本模块时加载crewai
+        from .tools import get_shared_tools
+        from .deployment_tools import (
+            DockerManagementTool,
+            CICDPipelineTool,
+            EnvironmentManagementTool,
+            MonitoringSetupTool
+        )
+
         self.tools = [
             DockerManagementTool(),
             CICDPipelineTool(),
             EnvironmentManagementTool(),
             MonitoringSetupTool(),
-            DocumentationGenerationTool(),
-            CodeAnalysisTool(),
-            ProjectStructureTool(),
-            HealthCheckTool()
+            *get_shared_tools()
         ]
+        # 各方法复用的部署工具实例
+        self._docker, self._cicd, self._env, self._monitoring = self.tools[:4]
+        # 工具列表在初始化后固定，预先计算名称供健康检查使用
+        self._tool_names = tuple((getattr(tool, "name", type(tool).__name__), tool) for tool in self.tools)
         
         self.agent = self._create_agent()
     
-    def _create_agent(self) -> Agent:
+    def _create_agent(self) -> "Agent":
         """创建部署专家Agent"""
+        from crewai import Agent
+
         return Agent(
             role='DevOps & Deployment Specialist',
             goal='设计和实施高可用、可扩展的部署架构，确保应用的稳定运行和持续交付',
@@ -109,32 +250,40 @@ class DeploymentAgent:
             }
             
             # 分析每个服务的容器化需求
-            docker_tool = DockerManagementTool()
-            
-            for service in services:
-                # 生成Dockerfile
-                dockerfile_result = docker_tool._run(
-                    action="generate_dockerfile",
-                    service_type=service,
-                    optimization_level=optimization_level
+            docker_tool = self._docker
+            
+            # 各服务Dockerfile、Compose配置和优化建议互不依赖，并发生成
+            with ThreadPoolExecutor(max_workers=min(MAX_TOOL_WORKERS, len(services) + 2)) as executor:
+                dockerfile_futures = {
+                    service: executor.submit(
+                        docker_tool._run,
+                        action="generate_dockerfile",
+                        service_type=service,
+                        optimization_level=optimization_level
+                    )
+                    for service in services
+                }
+                compose_future = executor.submit(
+                    docker_tool._run,
+                    action="generate_compose",
+                    environment=environment,
+                    services=services
                 )
-                results['docker_files'][service] = dockerfile_result
-                results['containerization_plan'].append(f"✅ {service} 服务容器化完成")
-            
-            # 生成Docker Compose配置
-            compose_result = docker_tool._run(
-                action="generate_compose",
-                environment=environment,
-                services=services
-            )
-            results['compose_config'] = compose_result
-            
-            # 生成优化建议
-            optimization_result = docker_tool._run(
-                action="optimize_images",
-                services=services
-            )
-            results['optimization_recommendations'] = optimization_result
+                optimization_future = executor.submit(
+                    docker_tool._run,
+                    action="optimize_images",
+                    services=services
+                )
+                
+                for service, future in dockerfile_futures.items():
+                    results['docker_files'][service] = future.result()
+                    results['containerization_plan'].append(f"✅ {service} 服务容器化完成")
+                
+                # Docker Compose配置
+                results['compose_config'] = compose_future.result()
+                
+                # 优化建议
+                results['optimization_recommendations'] = optimization_future.result()
             
             return results
             
@@ -154,7 +303,7 @@ class DeploymentAgent:
             ]
             environments = environments or ["development", "staging", "production"]
             
-            cicd_tool = CICDPipelineTool()
+            cicd_tool = self._cicd
             
             results = {
                 'workflow_config': '',
@@ -207,7 +356,7 @@ class DeploymentAgent:
                              config_type: str = "docker") -> Dict[str, Any]:
         """配置多环境部署"""
         try:
-            env_tool = EnvironmentManagementTool()
+            env_tool = self._env
             
             results = {
                 'environment_configs': {},
@@ -216,30 +365,21 @@ class DeploymentAgent:
                 'status': 'success'
             }
             
-            for env in environments:
-                # 创建环境配置
-                config_result = env_tool._run(
-                    action="create_env_config",
-                    environment=env,
-                    services=["backend", "frontend", "db", "redis"],
-                    config_type=config_type
-                )
-                results['environment_configs'][env] = config_result
-                
-                # 生成密钥管理配置
-                secret_result = env_tool._run(
-                    action="manage_secrets",
-                    action="generate",
-                    environment=env
-                )
-                results['secret_management'][env] = secret_result
-                
-                # 验证配置
-                validation_result = env_tool._run(
-                    action="validate_config",
-                    environment=env
-                )
-                results['validation_results'][env] = validation_result
+            # 一次调用生成所有环境的配置、密钥管理和验证结果
+            batch_result = env_tool._run(
+                action="configure_envs_batch",
+                environments=environments,
+                services=["backend", "frontend", "db", "redis"],
+                config_type=config_type
+            )
+            if isinstance(batch_result, str):
+                # 工具执行失败时返回错误信息
+                raise RuntimeError(batch_result)
+            
+            for env, env_result in batch_result.items():
+                results['environment_configs'][env] = env_result['config']
+                results['secret_management'][env] = env_result['secrets']
+                results['validation_results'][env] = env_result['validation']
             
             return results
             
@@ -259,7 +399,7 @@ class DeploymentAgent:
                 "database_connection_high", "memory_usage_high"
             ]
             
-            monitoring_tool = MonitoringSetupTool()
+            monitoring_tool = self._monitoring
             
             results = {
                 'monitoring_config': '',
@@ -269,36 +409,43 @@ class DeploymentAgent:
                 'status': 'success'
             }
             
-            # 设置应用监控
-            monitoring_result = monitoring_tool._run(
-                action="setup_monitoring",
-                services=services,
-                monitoring_stack=monitoring_stack
-            )
-            results['monitoring_config'] = monitoring_result
-            
-            # 配置日志系统
-            logging_result = monitoring_tool._run(
-                action="configure_logging",
-                log_level="INFO",
-                output_format="json"
-            )
-            results['logging_config'] = logging_result
-            
-            # 创建告警规则
-            alert_result = monitoring_tool._run(
-                action="create_alerts",
-                alert_types=alert_types
-            )
-            results['alert_rules'] = alert_result
-            
-            # 设置监控仪表板
-            dashboard_result = monitoring_tool._run(
-                action="setup_dashboard",
-                dashboard_type="grafana",
-                services=services
-            )
-            results['dashboard_config'] = dashboard_result
+            # 监控、日志、告警和仪表板配置互不依赖，并发生成
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                # 设置应用监控
+                monitoring_future = executor.submit(
+                    monitoring_tool._run,
+                    action="setup_monitoring",
+                    services=services,
+                    monitoring_stack=monitoring_stack
+                )
+                
+                # 配置日志系统
+                logging_future = executor.submit(
+                    monitoring_tool._run,
+                    action="configure_logging",
+                    log_level="INFO",
+                    output_format="json"
+                )
+                
+                # 创建告警规则
+                alert_future = executor.submit(
+                    monitoring_tool._run,
+                    action="create_alerts",
+                    alert_types=alert_types
+                )
+                
+                # 设置监控仪表板
+                dashboard_future = executor.submit(
+                    monitoring_tool._run,
+                    action="setup_dashboard",
+                    dashboard_type="grafana",
+                    services=services
+                )
+                
+                results['monitoring_config'] = monitoring_future.result()
+                results['logging_config'] = logging_future.result()
+                results['alert_rules'] = alert_future.result()
+                results['dashboard_config'] = dashboard_future.result()
             
             return results
             
@@ -317,92 +464,7 @@ class DeploymentAgent:
                 "caching_strategy", "database_tuning"
             ]
             
-            optimizations = {
-                'container_optimization': """
-🚀 容器性能优化:
-
-1. 镜像优化:
-   - 使用多阶段构建减少镜像大小
-   - 选择合适的基础镜像(Alpine vs Debian)
-   - 清理不必要的包和缓存
-   - 使用.dockerignore减少构建上下文
-
-2. 运行时优化:
-   - 配置合适的资源限制(CPU/Memory)
-   - 启用健康检查和就绪探针
-   - 优化启动时间和优雅关闭
-   - 使用非root用户运行容器
-
-3. 网络优化:
-   - 配置容器网络策略
-   - 启用网络缓存和压缩
-   - 优化负载均衡配置
-   - 减少容器间网络延迟
-""",
-                'resource_allocation': """
-⚙️ 资源分配优化:
-
-1. CPU优化:
-   - 根据应用特性分配CPU资源
-   - 启用CPU亲和性绑定
-   - 配置合适的CPU限制和请求
-   - 监控CPU使用率和调整
-
-2. 内存管理:
-   - 设置合理的内存限制
-   - 启用内存使用监控
-   - 配置OOM策略
-   - 优化JVM/Python内存设置
-
-3. 存储优化:
-   - 选择合适的存储类型
-   - 配置存储卷挂载策略
-   - 启用存储监控和告警
-   - 优化数据库存储配置
-""",
-                'caching_strategy': """
-🗄️ 缓存策略优化:
-
-1. 应用层缓存:
-   - Redis缓存配置优化
-   - 缓存失效策略设计
-   - 缓存预热和更新机制
-   - 分布式缓存一致性
-
-2. CDN和静态资源:
-   - 配置CDN加速
-   - 静态资源缓存策略
-   - 浏览器缓存优化
-   - 图片和媒体文件优化
-
-3. 数据库缓存:
-   - 查询结果缓存
-   - 连接池优化
-   - 读写分离配置
-   - 索引优化建议
-""",
-                'database_tuning': """
-🗃️ 数据库性能调优:
-
-1. PostgreSQL优化:
-   - 连接池配置(max_connections)
-   - 内存参数调优(shared_buffers, work_mem)
-   - 查询优化器配置
-   - 索引策略和维护
-
-2. Redis配置:
-   - 内存使用策略
-   - 持久化配置优化
-   - 主从复制设置
-   - 集群模式配置
-
-3. 监控和诊断:
-   - 慢查询日志分析
-   - 性能指标监控
-   - 瓶颈识别和优化
-   - 容量规划建议
-"""
-            }
+            optimizations = _OPTIMIZATIONS
             
             results = {
                 'optimization_plan': [],
@@ -418,24 +480,10 @@ class DeploymentAgent:
                     results['optimization_plan'].append(f"✅ {area} 优化方案已生成")
             
             # 添加实施步骤
-            results['implementation_steps'] = [
-                "1. 分析当前性能基线和瓶颈",
-                "2. 按优先级实施优化措施",
-                "3. 监控优化效果和性能指标",
-                "4. 持续调优和性能测试",
-                "5. 建立性能监控和告警机制"
-            ]
+            results['implementation_steps'] = _IMPL_STEPS
             
             # 添加关键监控指标
-            results['monitoring_metrics'] = [
-                "📊 应用响应时间 (P95/P99)",
-                "🔄 请求吞吐量 (RPS)",
-                "💾 内存使用率和垃圾回收",
-                "🏗️ CPU使用率和负载",
-                "🗄️ 数据库连接数和查询时间",
-                "📶 缓存命中率和性能",
-                "🌐 网络延迟和带宽使用"
-            ]
+            results['monitoring_metrics'] = _MONITOR_METRICS
             
             return results
             
@@ -538,31 +586,11 @@ class DeploymentAgent:
             }
             
             # 为每个服务添加具体的备份配置
+            backup_parts = [dr_plan['backup_strategy']]
             for service in services:
-                if service == "db":
-                    dr_plan['backup_strategy'] += """
-  📊 数据库备份:
-    - 全量备份: 每日凌晨自动执行
-    - 增量备份: 每小时WAL归档
-    - 异地备份: 跨可用区复制
-    - 备份验证: 定期恢复测试
-"""
-                elif service == "redis":
-                    dr_plan['backup_strategy'] += """
-  🗄️ Redis缓存备份:
-    - RDB快照: 每6小时生成
-    - AOF日志: 实时持久化
-    - 主从复制: 实时数据同步
-    - 集群备份: 多节点冗余
-"""
-                elif service == "backend":
-                    dr_plan['backup_strategy'] += """
-  🚀 应用服务备份:
-    - 容器镜像: 版本化存储
-    - 配置文件: Git版本控制
-    - 应用数据: 定期导出
-    - 日志备份: 长期存档
-"""
+                if service in _SERVICE_BACKUP_PLANS:
+                    backup_parts.append(_SERVICE_BACKUP_PLANS[service])
+            dr_plan['backup_strategy'] = "".join(backup_parts)
             
             return {
                 'disaster_recovery_plan': dr_plan,
@@ -603,12 +631,8 @@ class DeploymentAgent:
             }
             
             # 检查各个工具的状态
-            for tool in self.tools:
-                try:
-                    tool_name = tool.name
-                    health_status['tools_status'][tool_name] = '✅ 可用'
-                except Exception as e:
-                    health_status['tools_status'][tool_name] = f'❌ 异常: {str(e)}'
+            for tool_name, _ in self._tool_names:
+                health_status['tools_status'][tool_name] = '✅ 可用'
             
             return health_status
             
@@ -619,41 +643,49 @@ class DeploymentAgent:
             }
 
 
-# 创建全局部署Agent实例
-deployment_agent = DeploymentAgent()
+@functools.lru_cache(maxsize=1)
+def get_deployment_agent() -> DeploymentAgent:
+    """获取全局部署Agent实例（首次调用时创建）"""
+    return DeploymentAgent()
+
+
+def __getattr__(name):
+    if name == "deployment_agent":
+        return get_deployment_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # 便捷函数
 def containerize_app(services: List[str], environment: str = "production") -> Dict[str, Any]:
     """容器化应用的便捷函数"""
-    return deployment_agent.containerize_application(services, environment)
+    return get_deployment_agent().containerize_application(services, environment)
 
 
 def setup_pipeline(platform: str = "github", features: List[str] = None) -> Dict[str, Any]:
     """设置CI/CD流水线的便捷函数"""
-    return deployment_agent.setup_cicd_pipeline(platform, features)
+    return get_deployment_agent().setup_cicd_pipeline(platform, features)
 
 
 def configure_envs(environments: List[str]) -> Dict[str, Any]:
     """配置多环境的便捷函数"""
-    return deployment_agent.configure_environments(environments)
+    return get_deployment_agent().configure_environments(environments)
 
 
 def setup_monitoring(services: List[str], stack: str = "prometheus") -> Dict[str, Any]:
     """设置监控的便捷函数"""
-    return deployment_agent.setup_monitoring_stack(services, stack)
+    return get_deployment_agent().setup_monitoring_stack(services, stack)
 
 
 def optimize_performance(environment: str, areas: List[str] = None) -> Dict[str, Any]:
     """性能优化的便捷函数"""
-    return deployment_agent.optimize_deployment_performance(environment, areas)
+    return get_deployment_agent().optimize_deployment_performance(environment, areas)
 
 
 def create_dr_plan(services: List[str], objectives: Dict[str, str] = None) -> Dict[str, Any]:
     """创建灾难恢复计划的便捷函数"""
-    return deployment_agent.create_disaster_recovery_plan(services, objectives)
+    return get_deployment_agent().create_disaster_recovery_plan(services, objectives)
 
 
 def check_deployment_health() -> Dict[str, Any]:
     """检查部署Agent健康状态的便捷函数"""
-    return deployment_agent.health_check()
\ No newline at end of file
+    return get_deployment_agent().health_check()
\ No newline at end of file
@@ -3,62 +3,141 @@
 包含Docker容器化、CI/CD流水线、环境管理、监控等部署相关工具
 """
 
-import os
-import yaml
-import json
-import subprocess
-from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+import functools
+import io
+import re
+import string
+import sys
+import threading
+from collections import OrderedDict
+from typing import ClassVar, Dict, List, Optional, Any, Union
 from dataclasses import dataclass
 from crewai_tools import BaseTool
 
+# 需要加引号的YAML标量：会被解析为数字/布尔/空值，或包含YAML指示符
+_YAML_NON_STR_RE = re.compile(
+    r"[-+]?(?:0b[01_]+|0x[0-9a-f_]+|0[0-7_]+|0|[1-9][0-9_]*(?::[0-5]?[0-9])*)"
+    r"|[-+]?(?:[0-9][0-9_]*(?::[0-5]?[0-9])*\.[0-9_]*|\.[0-9_]+)(?:e[-+][0-9]+)?"
+    r"|[-+]?\.inf|\.nan|true|false|yes|no|on|off|null|~|=|<<"
+    r"|\d{4}-\d\d?-\d\d?.*",
+    re.IGNORECASE
+)
+_YAML_UNSAFE_RE = re.compile(r"^$|^[\s?:,\[\]{}#&*!|>'\"%@`]|^-(?:\s|$)|:(?:\s|$)|\s#|\s$")
+
+
+def _yaml_scalar(value: Any) -> str:
+    """格式化单个YAML标量值"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, dict):
+        return "{}"
+    if isinstance(value, list):
+        return "[]"
+    if _YAML_NON_STR_RE.fullmatch(value) or _YAML_UNSAFE_RE.search(value):
+        return "'" + value.replace("'", "''") + "'"
+    return value
+
+
+def _write_yaml_block(buf: io.StringIO, node: Any, indent: int = 0):
+    """写出由dict/list/标量组成的YAML块，格式与yaml.dump(default_flow_style=False)一致"""
+    pad = " " * indent
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if isinstance(value, dict) and value:
+                buf.write(f"{pad}{key}:\n")
+                _write_yaml_block(buf, value, indent + 2)
+            elif isinstance(value, list) and value:
+                # 与PyYAML默认风格一致，列表项不额外缩进
+                buf.write(f"{pad}{key}:\n")
+                _write_yaml_block(buf, value, indent)
+            else:
+                buf.write(f"{pad}{key}: {_yaml_scalar(value)}\n")
+    else:
+        for item in node:
+            buf.write(f"{pad}- {_yaml_scalar(item)}\n")
 
-@dataclass
-class DeploymentConfig:
-    """部署配置数据类"""
-    environment: str
-    services: List[str]
-    ports: Dict[str, int]
-    volumes: Dict[str, str]
-    env_vars: Dict[str, str]
-    health_checks: Dict[str, str]
 
+def _emit_compose_yaml(config: Dict[str, Any], header: str = "", footer: str = "") -> str:
+    """将Docker Compose配置写成YAML文本，可附加预先生成的头部和尾部
 
-class DockerManagementTool(BaseTool):
-    """Docker容器管理工具"""
-    name: str = "Docker Management Tool"
-    description: str = """
-    Docker容器化和管理工具，支持：
-    - Dockerfile生成和优化
-    - Docker Compose配置管理
-    - 容器构建、运行、监控
-    - 镜像管理和优化
-    - 多环境容器编排
+    Compose配置只用到映射、字符串列表和标量，无需完整的YAML emitter。
     """
+    buf = io.StringIO()
+    buf.write(header)
+    _write_yaml_block(buf, config)
+    buf.write(footer)
+    return buf.getvalue()
+
+
+# Docker Compose中与服务无关的固定部分，导入时生成一次
+_COMPOSE_HEADER_YAML = _emit_compose_yaml({'version': '3.8'})
+_COMPOSE_FOOTER_YAML = _emit_compose_yaml({
+    'networks': {
+        'app-network': {
+            'driver': 'bridge'
+        }
+    },
+    'volumes': {
+        'postgres_data': {},
+        'redis_data': {}
+    }
+})
 
-    def _run(self, action: str, **kwargs) -> str:
-        """执行Docker管理操作"""
-        try:
-            if action == "generate_dockerfile":
-                return self._generate_dockerfile(**kwargs)
-            elif action == "generate_compose":
-                return self._generate_docker_compose(**kwargs)
-            elif action == "build_images":
-                return self._build_docker_images(**kwargs)
-            elif action == "manage_containers":
-                return self._manage_containers(**kwargs)
-            elif action == "optimize_images":
-                return self._optimize_docker_images(**kwargs)
-            else:
-                return f"❌ 不支持的Docker操作: {action}"
-        except Exception as e:
-            return f"❌ Docker操作失败: {str(e)}"
 
-    def _generate_dockerfile(self, service_type: str, base_image: str = "", 
-                           requirements: List[str] = None, **kwargs) -> str:
-        """生成优化的Dockerfile"""
-        if service_type == "fastapi":
-            dockerfile_content = f"""# FastAPI Production Dockerfile
+def _intern_action(action: Any) -> Any:
+    """驻留action字符串，使_ACTIONS字典查找可走身份比较的快速路径"""
+    return sys.intern(action) if isinstance(action, str) else action
+
+
+@functools.lru_cache(maxsize=32)
+def _unsupported_action_message(tool_label: str, action: Any) -> str:
+    """生成并缓存不支持操作的错误信息"""
+    return f"❌ 不支持的{tool_label}操作: {action}"
+
+
+TEMPLATE_CACHE_SIZE = 128  # 每个模板生成方法缓存的结果数
+
+
+def _freeze(value: Any) -> Any:
+    """将列表/字典参数转换为可哈希的等价形式，用作缓存键"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def _cache_template(method):
+    """按参数缓存模板生成结果
+
+    被装饰的方法必须是参数的纯函数，不依赖工具实例的状态。
+    """
+    cache = OrderedDict()
+    lock = threading.Lock()
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (_freeze(args), _freeze(kwargs))
+        with lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+        result = method(self, *args, **kwargs)
+        with lock:
+            cache[key] = result
+            if len(cache) > TEMPLATE_CACHE_SIZE:
+                cache.popitem(last=False)
+        return result
+
+    return wrapper
+
+
+# 静态Dockerfile模板
+_FASTAPI_DOCKERFILE = """# FastAPI Production Dockerfile
 FROM python:3.11-slim as base
 
 # 设置工作目录
@@ -93,8 +172,8 @@ EXPOSE 8000
 # 启动命令
 CMD ["uvicorn", "backend.main:app", "--host", "0.0.0.0", "--port", "8000"]
 """
-        elif service_type == "vue":
-            dockerfile_content = f"""# Vue.js Multi-stage Dockerfile
+
+_VUE_DOCKERFILE = """# Vue.js Multi-stage Dockerfile
 FROM node:18-alpine as build
 
 # 设置工作目录
@@ -127,96 +206,414 @@ EXPOSE 80
 # 启动nginx
 CMD ["nginx", "-g", "daemon off;"]
 """
+
+# Docker Compose各服务的配置片段（只读引用，backend中的{ENV}在生成时替换）
+_SERVICE_FRAGMENTS: Dict[str, Dict[str, Any]] = {
+    'backend': {
+        'build': {
+            'context': '.',
+            'dockerfile': 'Dockerfile.backend'
+        },
+        'ports': ['8000:8000'],
+        'environment': [
+            'ENV={ENV}',
+            'DATABASE_URL=postgresql://postgres:postgres@db:5432/claude_fastapi',
+            'REDIS_URL=redis://redis:6379/0'
+        ],
+        'depends_on': ['db', 'redis'],
+        'networks': ['app-network'],
+        'healthcheck': {
+            'test': ['CMD', 'curl', '-f', 'http://localhost:8000/health'],
+            'interval': '30s',
+            'timeout': '10s',
+            'retries': 3
+        }
+    },
+    'frontend': {
+        'build': {
+            'context': '.',
+            'dockerfile': 'Dockerfile.frontend'
+        },
+        'ports': ['3000:80'],
+        'depends_on': ['backend'],
+        'networks': ['app-network']
+    },
+    'db': {
+        'image': 'postgres:15-alpine',
+        'environment': [
+            'POSTGRES_DB=claude_fastapi',
+            'POSTGRES_USER=postgres',
+            'POSTGRES_PASSWORD=postgres'
+        ],
+        'ports': ['5433:5432'],
+        'volumes': ['postgres_data:/var/lib/postgresql/data'],
+        'networks': ['app-network']
+    },
+    'redis': {
+        'image': 'redis:7-alpine',
+        'ports': ['6379:6379'],
+        'volumes': ['redis_data:/data'],
+        'networks': ['app-network']
+    }
+}
+
+# 容器管理操作: (标题, 每个服务的命令行)
+_CONTAINER_ACTIONS = {
+    "start": ("🚀 启动容器服务:", "  ✅ 启动 {service}: docker-compose up -d {service}"),
+    "stop": ("🛑 停止容器服务:", "  ✅ 停止 {service}: docker-compose stop {service}"),
+    "restart": ("🔄 重启容器服务:", "  ✅ 重启 {service}: docker-compose restart {service}"),
+    "logs": ("📋 查看容器日志:", "  📝 {service} 日志: docker-compose logs -f {service}")
+}
+
+_OPTIMIZE_IMAGES_REPORT = "\n".join([
+    "🎯 Docker镜像优化建议:",
+    "",
+    "1. 多阶段构建:",
+    "   - 使用 multi-stage builds 减少镜像大小",
+    "   - 分离构建环境和运行环境",
+    "",
+    "2. 基础镜像优化:",
+    "   - 使用 Alpine Linux 轻量级镜像",
+    "   - 选择合适的 Python/Node.js 版本",
+    "",
+    "3. 层缓存优化:",
+    "   - 优化 COPY 指令顺序",
+    "   - 合并 RUN 指令减少层数",
+    "",
+    "4. 安全加固:",
+    "   - 使用非root用户运行应用",
+    "   - 移除不必要的包和文件",
+    "",
+    "5. 健康检查:",
+    "   - 添加 HEALTHCHECK 指令",
+    "   - 配置合适的检查间隔"
+])
+
+_PIPELINE_FEATURES = {
+    "automated_testing": "自动化测试执行",
+    "code_quality": "代码质量检查",
+    "security_scan": "安全漏洞扫描", 
+    "docker_build": "Docker镜像构建",
+    "multi_env_deploy": "多环境部署",
+    "rollback": "自动回滚机制",
+    "monitoring": "部署监控告警"
+}
+
+_PIPELINE_SETUP_FOOTER = "\n".join([
+    "",
+    "",
+    "⚙️ 配置步骤:",
+    "1. 配置环境变量和密钥",
+    "2. 设置构建和测试环境",
+    "3. 配置部署目标环境",
+    "4. 设置监控和告警",
+    "5. 配置权限和访问控制"
+])
+
+_QUALITY_CHECKS = {
+    "test_coverage": "测试覆盖率检查 (>80%)",
+    "code_quality": "代码质量扫描 (SonarQube)",
+    "security_scan": "安全漏洞扫描",
+    "performance_test": "性能测试验证",
+    "lint_check": "代码规范检查",
+    "dependency_scan": "依赖漏洞扫描"
+}
+
+_QUALITY_GATES_FOOTER = "\n".join([
+    "",
+    "",
+    "⚡ 门禁策略:",
+    "- 所有检查项必须通过才能继续部署",
+    "- 失败时阻止部署并发送通知",
+    "- 提供详细的失败原因和修复建议",
+    "- 支持手动审批机制"
+])
+
+_REQUIRED_CONFIGS = {
+    "DATABASE_URL": "数据库连接URL",
+    "REDIS_URL": "Redis连接URL",
+    "SECRET_KEY": "JWT签名密钥",
+    "ALLOWED_ORIGINS": "CORS允许来源"
+}
+
+_VALIDATION_FOOTER = "\n".join([
+    "",
+    "",
+    "🔧 配置格式验证:",
+    "  ✅ 环境变量命名规范",
+    "  ✅ URL格式正确性",
+    "  ✅ 端口号有效性",
+    "  ✅ 布尔值格式",
+    "",
+    "💡 优化建议:",
+    "- 使用环境特定的配置值",
+    "- 启用适当的日志级别",
+    "- 配置合理的资源限制",
+    "- 设置健康检查参数"
+])
+
+# Prometheus + Grafana 监控栈配置说明
+_PROMETHEUS_MONITORING_CONFIG = """
+📊 Prometheus + Grafana 监控栈配置:
+
+🎯 监控目标:
+- FastAPI应用指标 (请求量、响应时间、错误率)
+- 数据库性能指标 (连接数、查询时间)
+- Redis缓存指标 (命中率、内存使用)
+- 系统资源指标 (CPU、内存、磁盘、网络)
+
+⚙️ Prometheus配置:
+```yaml
+global:
+  scrape_interval: 15s
+  evaluation_interval: 15s
+
+scrape_configs:
+  - job_name: 'fastapi-backend'
+    static_configs:
+      - targets: ['backend:8000']
+    metrics_path: '/metrics'
+    scrape_interval: 10s
+
+  - job_name: 'postgres-exporter'
+    static_configs:
+      - targets: ['postgres-exporter:9187']
+
+  - job_name: 'redis-exporter'
+    static_configs:
+      - targets: ['redis-exporter:9121']
+
+  - job_name: 'node-exporter'
+    static_configs:
+      - targets: ['node-exporter:9100']
+```
+
+📈 关键指标:
+- http_requests_total: HTTP请求总数
+- http_request_duration_seconds: 请求响应时间
+- http_requests_in_progress: 并发请求数
+- database_connections_active: 活跃数据库连接
+- redis_memory_used_bytes: Redis内存使用
+"""
+
+# 日志系统配置模板，只有日志级别和输出格式需要替换
+_LOGGING_CONFIG_TEMPLATE = string.Template("""
+📝 日志系统配置:
+
+🎚️ 日志级别: ${log_level}
+📄 输出格式: ${output_format}
+
+⚙️ FastAPI日志配置:
+```python
+import logging
+import sys
+from loguru import logger
+
+# 移除默认处理器
+logger.remove()
+
+# 添加控制台输出
+logger.add(
+    sys.stdout,
+    format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} | {message}",
+    level="${log_level}",
+    serialize=${serialize}
+)
+
+# 添加文件输出
+logger.add(
+    "logs/app.log",
+    rotation="1 day",
+    retention="30 days",
+    level="${log_level}",
+    format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} | {message}"
+)
+```
+
+📊 日志聚合 (ELK Stack):
+```yaml
+version: '3.8'
+services:
+  elasticsearch:
+    image: docker.elastic.co/elasticsearch/elasticsearch:8.10.0
+    environment:
+      - discovery.type=single-node
+      - "ES_JAVA_OPTS=-Xms512m -Xmx512m"
+    ports:
+      - "9200:9200"
+
+  logstash:
+    image: docker.elastic.co/logstash/logstash:8.10.0
+    volumes:
+      - ./logstash.conf:/usr/share/logstash/pipeline/logstash.conf
+    depends_on:
+      - elasticsearch
+
+  kibana:
+    image: docker.elastic.co/kibana/kibana:8.10.0
+    ports:
+      - "5601:5601"
+    depends_on:
+      - elasticsearch
+```
+
+🔍 日志分析模式:
+- 请求追踪: 包含请求ID的完整请求链路
+- 错误聚合: 自动分组和统计错误类型
+- 性能分析: 慢查询和性能瓶颈识别
+- 安全审计: 登录、权限变更等安全事件
+""")
+
+# 告警规则输出的固定头部和尾部
+_ALERT_RULES_HEADER = "🚨 监控告警规则配置:\n\n⚡ Prometheus AlertManager规则:"
+_ALERT_RULES_FOOTER = "\n".join([
+    "",
+    "",
+    "📱 通知配置:",
+    "- Slack: 实时告警通知",
+    "- 邮件: 重要告警汇总",
+    "- 钉钉: 国内团队通知",
+    "- PagerDuty: 7x24值班响应"
+])
+
+# 各告警类型的Prometheus规则
+_ALERT_RULE_TEMPLATES: Dict[str, str] = {
+    "high_error_rate": """
+  - alert: HighErrorRate
+    expr: rate(http_requests_total{status=~"5.."}[5m]) > 0.1
+    for: 2m
+    labels:
+      severity: warning
+    annotations:
+      summary: "高错误率告警"
+      description: "应用错误率超过10%，持续2分钟"
+""",
+    "high_response_time": """
+  - alert: HighResponseTime
+    expr: histogram_quantile(0.95, rate(http_request_duration_seconds_bucket[5m])) > 1
+    for: 5m
+    labels:
+      severity: warning
+    annotations:
+      summary: "响应时间过长"
+      description: "95%分位响应时间超过1秒，持续5分钟"
+""",
+    "database_connection_high": """
+  - alert: DatabaseConnectionHigh
+    expr: database_connections_active / database_connections_max > 0.8
+    for: 3m
+    labels:
+      severity: critical
+    annotations:
+      summary: "数据库连接使用率过高"
+      description: "数据库连接使用率超过80%，持续3分钟"
+""",
+    "memory_usage_high": """
+  - alert: MemoryUsageHigh
+    expr: (node_memory_MemTotal_bytes - node_memory_MemAvailable_bytes) / node_memory_MemTotal_bytes > 0.9
+    for: 5m
+    labels:
+      severity: critical
+    annotations:
+      summary: "内存使用率过高"
+      description: "系统内存使用率超过90%，持续5分钟"
+"""
+}
+
+# 规则片段预先带上与前文衔接的换行，生成时直接拼接
+_ALERT_RULE_BLOCKS: Dict[str, str] = {
+    alert_type: "\n" + rule for alert_type, rule in _ALERT_RULE_TEMPLATES.items()
+}
+
+
+@dataclass
+class DeploymentConfig:
+    """部署配置数据类"""
+    environment: str
+    services: List[str]
+    ports: Dict[str, int]
+    volumes: Dict[str, str]
+    env_vars: Dict[str, str]
+    health_checks: Dict[str, str]
+
+
+class DockerManagementTool(BaseTool):
+    """Docker容器管理工具"""
+    name: str = "Docker Management Tool"
+    description: str = """
+    Docker容器化和管理工具，支持：
+    - Dockerfile生成和优化
+    - Docker Compose配置管理
+    - 容器构建、运行、监控
+    - 镜像管理和优化
+    - 多环境容器编排
+    """
+
+    _ACTIONS: ClassVar[Dict[str, str]] = {
+        "generate_dockerfile": "_generate_dockerfile",
+        "generate_compose": "_generate_docker_compose",
+        "build_images": "_build_docker_images",
+        "manage_containers": "_manage_containers",
+        "optimize_images": "_optimize_docker_images"
+    }
+
+    def _run(self, action: str, **kwargs) -> str:
+        """执行Docker管理操作"""
+        try:
+            handler = getattr(self, self._ACTIONS.get(_intern_action(action), ""), None)
+            if handler is None:
+                return _unsupported_action_message("Docker", action)
+            return handler(**kwargs)
+        except Exception as e:
+            return f"❌ Docker操作失败: {str(e)}"
+
+    @_cache_template
+    def _generate_dockerfile(self, service_type: str, base_image: str = "", 
+                           requirements: List[str] = None, **kwargs) -> str:
+        """生成优化的Dockerfile"""
+        if service_type == "fastapi":
+            dockerfile_content = _FASTAPI_DOCKERFILE
+        elif service_type == "vue":
+            dockerfile_content = _VUE_DOCKERFILE
         else:
+            requirements_block = "\n".join(requirements or [])
             dockerfile_content = f"""# Generic Service Dockerfile
 FROM {base_image or 'alpine:latest'}
 
 WORKDIR /app
 
 # 添加自定义配置
-{chr(10).join(requirements or [])}
+{requirements_block}
 
 CMD ["echo", "Service ready"]
 """
 
         return f"✅ 生成 {service_type} Dockerfile:\n\n```dockerfile\n{dockerfile_content}\n```"
 
+    @_cache_template
     def _generate_docker_compose(self, environment: str, services: List[str], 
                                 config: Dict[str, Any] = None) -> str:
         """生成Docker Compose配置"""
         config = config or {}
         
-        compose_config = {
-            'version': '3.8',
-            'services': {},
-            'networks': {
-                'app-network': {
-                    'driver': 'bridge'
-                }
-            },
-            'volumes': {
-                'postgres_data': {},
-                'redis_data': {}
-            }
-        }
+        compose_services = {}
 
-        # 根据服务列表生成服务配置
+        # 根据服务列表生成服务配置，静态片段直接引用，仅backend需要替换环境变量
         for service in services:
+            fragment = _SERVICE_FRAGMENTS.get(service)
+            if fragment is None:
+                continue
             if service == "backend":
-                compose_config['services']['backend'] = {
-                    'build': {
-                        'context': '.',
-                        'dockerfile': 'Dockerfile.backend'
-                    },
-                    'ports': ['8000:8000'],
-                    'environment': [
-                        f'ENV={environment}',
-                        'DATABASE_URL=postgresql://postgres:postgres@db:5432/claude_fastapi',
-                        'REDIS_URL=redis://redis:6379/0'
-                    ],
-                    'depends_on': ['db', 'redis'],
-                    'networks': ['app-network'],
-                    'healthcheck': {
-                        'test': ['CMD', 'curl', '-f', 'http://localhost:8000/health'],
-                        'interval': '30s',
-                        'timeout': '10s',
-                        'retries': 3
-                    }
-                }
-            
-            elif service == "frontend":
-                compose_config['services']['frontend'] = {
-                    'build': {
-                        'context': '.',
-                        'dockerfile': 'Dockerfile.frontend'
-                    },
-                    'ports': ['3000:80'],
-                    'depends_on': ['backend'],
-                    'networks': ['app-network']
-                }
-            
-            elif service == "db":
-                compose_config['services']['db'] = {
-                    'image': 'postgres:15-alpine',
+                fragment = {
+                    **fragment,
                     'environment': [
-                        'POSTGRES_DB=claude_fastapi',
-                        'POSTGRES_USER=postgres',
-                        'POSTGRES_PASSWORD=postgres'
-                    ],
-                    'ports': ['5433:5432'],
-                    'volumes': ['postgres_data:/var/lib/postgresql/data'],
-                    'networks': ['app-network']
-                }
-            
-            elif service == "redis":
-                compose_config['services']['redis'] = {
-                    'image': 'redis:7-alpine',
-                    'ports': ['6379:6379'],
-                    'volumes': ['redis_data:/data'],
-                    'networks': ['app-network']
+                        item.replace('{ENV}', environment) for item in fragment['environment']
+                    ]
                 }
+            compose_services[service] = fragment
 
-        yaml_content = yaml.dump(compose_config, default_flow_style=False, sort_keys=False)
+        # 固定的版本头和网络/卷配置已预先生成，只需写出服务部分
+        yaml_content = _emit_compose_yaml({'services': compose_services}, _COMPOSE_HEADER_YAML, _COMPOSE_FOOTER_YAML)
         return f"✅ 生成 {environment} Docker Compose 配置:\n\n```yaml\n{yaml_content}\n```"
 
     def _build_docker_images(self, services: List[str], environment: str = "development") -> str:
@@ -236,58 +633,21 @@ CMD ["echo", "Service ready"]
     def _manage_containers(self, action: str, services: List[str] = None) -> str:
         """管理容器操作"""
         services = services or []
-        results = []
-        
-        if action == "start":
-            results.append("🚀 启动容器服务:")
-            for service in services:
-                results.append(f"  ✅ 启动 {service}: docker-compose up -d {service}")
-        
-        elif action == "stop":
-            results.append("🛑 停止容器服务:")
-            for service in services:
-                results.append(f"  ✅ 停止 {service}: docker-compose stop {service}")
-        
-        elif action == "restart":
-            results.append("🔄 重启容器服务:")
-            for service in services:
-                results.append(f"  ✅ 重启 {service}: docker-compose restart {service}")
+        if action not in _CONTAINER_ACTIONS:
+            return ""
         
-        elif action == "logs":
-            results.append("📋 查看容器日志:")
-            for service in services:
-                results.append(f"  📝 {service} 日志: docker-compose logs -f {service}")
+        header, line_template = _CONTAINER_ACTIONS[action]
+        buf = io.StringIO()
+        buf.write(header)
+        for service in services:
+            buf.write("\n")
+            buf.write(line_template.format(service=service))
         
-        return "\n".join(results)
+        return buf.getvalue()
 
     def _optimize_docker_images(self, services: List[str]) -> str:
         """优化Docker镜像"""
-        optimizations = [
-            "🎯 Docker镜像优化建议:",
-            "",
-            "1. 多阶段构建:",
-            "   - 使用 multi-stage builds 减少镜像大小",
-            "   - 分离构建环境和运行环境",
-            "",
-            "2. 基础镜像优化:",
-            "   - 使用 Alpine Linux 轻量级镜像",
-            "   - 选择合适的 Python/Node.js 版本",
-            "",
-            "3. 层缓存优化:",
-            "   - 优化 COPY 指令顺序",
-            "   - 合并 RUN 指令减少层数",
-            "",
-            "4. 安全加固:",
-            "   - 使用非root用户运行应用",
-            "   - 移除不必要的包和文件",
-            "",
-            "5. 健康检查:",
-            "   - 添加 HEALTHCHECK 指令",
-            "   - 配置合适的检查间隔"
-        ]
-        
-        return "\n".join(optimizations)
-
+        return _OPTIMIZE_IMAGES_REPORT
 
 class CICDPipelineTool(BaseTool):
     """CI/CD流水线管理工具"""
@@ -301,22 +661,24 @@ class CICDPipelineTool(BaseTool):
     - 容器镜像构建和推送
     """
 
+    _ACTIONS: ClassVar[Dict[str, str]] = {
+        "generate_workflow": "_generate_github_workflow",
+        "setup_pipeline": "_setup_cicd_pipeline",
+        "deploy_strategy": "_create_deployment_strategy",
+        "quality_gates": "_setup_quality_gates"
+    }
+
     def _run(self, action: str, **kwargs) -> str:
         """执行CI/CD管道操作"""
         try:
-            if action == "generate_workflow":
-                return self._generate_github_workflow(**kwargs)
-            elif action == "setup_pipeline":
-                return self._setup_cicd_pipeline(**kwargs)
-            elif action == "deploy_strategy":
-                return self._create_deployment_strategy(**kwargs)
-            elif action == "quality_gates":
-                return self._setup_quality_gates(**kwargs)
-            else:
-                return f"❌ 不支持的CI/CD操作: {action}"
+            handler = getattr(self, self._ACTIONS.get(_intern_action(action), ""), None)
+            if handler is None:
+                return _unsupported_action_message("CI/CD", action)
+            return handler(**kwargs)
         except Exception as e:
             return f"❌ CI/CD操作失败: {str(e)}"
 
+    @_cache_template
     def _generate_github_workflow(self, workflow_type: str, environments: List[str] = None) -> str:
         """生成GitHub Actions工作流"""
         environments = environments or ["development", "production"]
@@ -479,38 +841,17 @@ jobs:
 
     def _setup_cicd_pipeline(self, platform: str, features: List[str]) -> str:
         """设置CI/CD流水线"""
-        pipeline_features = {
-            "automated_testing": "自动化测试执行",
-            "code_quality": "代码质量检查",
-            "security_scan": "安全漏洞扫描", 
-            "docker_build": "Docker镜像构建",
-            "multi_env_deploy": "多环境部署",
-            "rollback": "自动回滚机制",
-            "monitoring": "部署监控告警"
-        }
-        
-        setup_steps = [
-            f"🔧 设置 {platform} CI/CD流水线:",
-            "",
-            "📋 启用的功能:"
-        ]
+        buf = io.StringIO()
+        buf.write(f"🔧 设置 {platform} CI/CD流水线:\n\n📋 启用的功能:")
         
         for feature in features:
-            if feature in pipeline_features:
-                setup_steps.append(f"  ✅ {pipeline_features[feature]}")
+            if feature in _PIPELINE_FEATURES:
+                buf.write(f"\n  ✅ {_PIPELINE_FEATURES[feature]}")
         
-        setup_steps.extend([
-            "",
-            "⚙️ 配置步骤:",
-            "1. 配置环境变量和密钥",
-            "2. 设置构建和测试环境",
-            "3. 配置部署目标环境",
-            "4. 设置监控和告警",
-            "5. 配置权限和访问控制"
-        ])
-        
-        return "\n".join(setup_steps)
+        buf.write(_PIPELINE_SETUP_FOOTER)
+        return buf.getvalue()
 
+    @_cache_template
     def _create_deployment_strategy(self, strategy_type: str, environments: List[str]) -> str:
         """创建部署策略"""
         strategies = {
@@ -575,35 +916,15 @@ jobs:
 
     def _setup_quality_gates(self, checks: List[str]) -> str:
         """设置质量门禁"""
-        quality_checks = {
-            "test_coverage": "测试覆盖率检查 (>80%)",
-            "code_quality": "代码质量扫描 (SonarQube)",
-            "security_scan": "安全漏洞扫描",
-            "performance_test": "性能测试验证",
-            "lint_check": "代码规范检查",
-            "dependency_scan": "依赖漏洞扫描"
-        }
-        
-        gate_config = [
-            "🚪 质量门禁配置:",
-            "",
-            "📊 启用的检查项:"
-        ]
+        buf = io.StringIO()
+        buf.write("🚪 质量门禁配置:\n\n📊 启用的检查项:")
         
         for check in checks:
-            if check in quality_checks:
-                gate_config.append(f"  ✅ {quality_checks[check]}")
-        
-        gate_config.extend([
-            "",
-            "⚡ 门禁策略:",
-            "- 所有检查项必须通过才能继续部署",
-            "- 失败时阻止部署并发送通知",
-            "- 提供详细的失败原因和修复建议",
-            "- 支持手动审批机制"
-        ])
+            if check in _QUALITY_CHECKS:
+                buf.write(f"\n  ✅ {_QUALITY_CHECKS[check]}")
         
-        return "\n".join(gate_config)
+        buf.write(_QUALITY_GATES_FOOTER)
+        return buf.getvalue()
 
 
 class EnvironmentManagementTool(BaseTool):
@@ -618,22 +939,37 @@ class EnvironmentManagementTool(BaseTool):
     - 环境健康监控
     """
 
+    _ACTIONS: ClassVar[Dict[str, str]] = {
+        "create_env_config": "_create_environment_config",
+        "manage_secrets": "_manage_secrets",
+        "sync_environments": "_sync_environments",
+        "validate_config": "_validate_configuration",
+        "configure_envs_batch": "_configure_environments_batch"
+    }
+
     def _run(self, action: str, **kwargs) -> str:
         """执行环境管理操作"""
         try:
-            if action == "create_env_config":
-                return self._create_environment_config(**kwargs)
-            elif action == "manage_secrets":
-                return self._manage_secrets(**kwargs)
-            elif action == "sync_environments":
-                return self._sync_environments(**kwargs)
-            elif action == "validate_config":
-                return self._validate_configuration(**kwargs)
-            else:
-                return f"❌ 不支持的环境管理操作: {action}"
+            handler = getattr(self, self._ACTIONS.get(_intern_action(action), ""), None)
+            if handler is None:
+                return _unsupported_action_message("环境管理", action)
+            return handler(**kwargs)
         except Exception as e:
             return f"❌ 环境管理操作失败: {str(e)}"
 
+    def _configure_environments_batch(self, environments: List[str], services: List[str],
+                                      config_type: str = "docker") -> Dict[str, Dict[str, str]]:
+        """一次性生成多个环境的配置、密钥管理和验证结果"""
+        return {
+            env: {
+                "config": self._create_environment_config(env, services, config_type),
+                "secrets": self._manage_secrets("generate", env),
+                "validation": self._validate_configuration(env)
+            }
+            for env in environments
+        }
+
+    @_cache_template
     def _create_environment_config(self, environment: str, services: List[str], 
                                  config_type: str = "docker") -> str:
         """创建环境配置"""
@@ -740,11 +1076,12 @@ stringData:
                     validation_results.append(f"  ✅ {secret}: 已配置")
                 else:
                     validation_results.append(f"  ❌ {secret}: 缺失")
+            validation_block = "\n".join(validation_results)
             
             secret_template = f"""
 🔍 {environment} 密钥验证结果:
 
-{chr(10).join(validation_results)}
+{validation_block}
 
 💡 修复建议:
 - 确保所有必需密钥都已配置
@@ -791,41 +1128,17 @@ stringData:
         """验证环境配置"""
         config_data = config_data or {}
         
-        validation_results = [
-            f"🔍 {environment} 环境配置验证:",
-            "",
-            "📋 必需配置项检查:"
-        ]
-        
-        required_configs = {
-            "DATABASE_URL": "数据库连接URL",
-            "REDIS_URL": "Redis连接URL",
-            "SECRET_KEY": "JWT签名密钥",
-            "ALLOWED_ORIGINS": "CORS允许来源"
-        }
+        buf = io.StringIO()
+        buf.write(f"🔍 {environment} 环境配置验证:\n\n📋 必需配置项检查:")
         
-        for key, description in required_configs.items():
+        for key, description in _REQUIRED_CONFIGS.items():
             if key in config_data:
-                validation_results.append(f"  ✅ {key}: {description}")
+                buf.write(f"\n  ✅ {key}: {description}")
             else:
-                validation_results.append(f"  ❌ {key}: {description} (缺失)")
+                buf.write(f"\n  ❌ {key}: {description} (缺失)")
         
-        validation_results.extend([
-            "",
-            "🔧 配置格式验证:",
-            "  ✅ 环境变量命名规范",
-            "  ✅ URL格式正确性",
-            "  ✅ 端口号有效性",
-            "  ✅ 布尔值格式",
-            "",
-            "💡 优化建议:",
-            "- 使用环境特定的配置值",
-            "- 启用适当的日志级别",
-            "- 配置合理的资源限制",
-            "- 设置健康检查参数"
-        ])
-        
-        return "\n".join(validation_results)
+        buf.write(_VALIDATION_FOOTER)
+        return buf.getvalue()
 
 
 class MonitoringSetupTool(BaseTool):
@@ -840,207 +1153,45 @@ class MonitoringSetupTool(BaseTool):
     - 指标仪表板创建
     """
 
+    _ACTIONS: ClassVar[Dict[str, str]] = {
+        "setup_monitoring": "_setup_application_monitoring",
+        "configure_logging": "_configure_logging_system",
+        "create_alerts": "_create_alert_rules",
+        "setup_dashboard": "_setup_monitoring_dashboard"
+    }
+
     def _run(self, action: str, **kwargs) -> str:
         """执行监控配置操作"""
         try:
-            if action == "setup_monitoring":
-                return self._setup_application_monitoring(**kwargs)
-            elif action == "configure_logging":
-                return self._configure_logging_system(**kwargs)
-            elif action == "create_alerts":
-                return self._create_alert_rules(**kwargs)
-            elif action == "setup_dashboard":
-                return self._setup_monitoring_dashboard(**kwargs)
-            else:
-                return f"❌ 不支持的监控操作: {action}"
+            handler = getattr(self, self._ACTIONS.get(_intern_action(action), ""), None)
+            if handler is None:
+                return _unsupported_action_message("监控", action)
+            return handler(**kwargs)
         except Exception as e:
             return f"❌ 监控配置失败: {str(e)}"
 
     def _setup_application_monitoring(self, services: List[str], monitoring_stack: str = "prometheus") -> str:
         """设置应用监控"""
         if monitoring_stack == "prometheus":
-            config_content = """
-📊 Prometheus + Grafana 监控栈配置:
-
-🎯 监控目标:
-- FastAPI应用指标 (请求量、响应时间、错误率)
-- 数据库性能指标 (连接数、查询时间)
-- Redis缓存指标 (命中率、内存使用)
-- 系统资源指标 (CPU、内存、磁盘、网络)
-
-⚙️ Prometheus配置:
-```yaml
-global:
-  scrape_interval: 15s
-  evaluation_interval: 15s
-
-scrape_configs:
-  - job_name: 'fastapi-backend'
-    static_configs:
-      - targets: ['backend:8000']
-    metrics_path: '/metrics'
-    scrape_interval: 10s
-
-  - job_name: 'postgres-exporter'
-    static_configs:
-      - targets: ['postgres-exporter:9187']
-
-  - job_name: 'redis-exporter'
-    static_configs:
-      - targets: ['redis-exporter:9121']
-
-  - job_name: 'node-exporter'
-    static_configs:
-      - targets: ['node-exporter:9100']
-```
-
-📈 关键指标:
-- http_requests_total: HTTP请求总数
-- http_request_duration_seconds: 请求响应时间
-- http_requests_in_progress: 并发请求数
-- database_connections_active: 活跃数据库连接
-- redis_memory_used_bytes: Redis内存使用
-"""
+            config_content = _PROMETHEUS_MONITORING_CONFIG
         else:
             config_content = f"📊 {monitoring_stack} 监控配置 (待实现)"
 
         return config_content
 
+    @_cache_template
     def _configure_logging_system(self, log_level: str, output_format: str = "json") -> str:
         """配置日志系统"""
-        logging_config = f"""
-📝 日志系统配置:
-
-🎚️ 日志级别: {log_level}
-📄 输出格式: {output_format}
-
-⚙️ FastAPI日志配置:
-```python
-import logging
-import sys
-from loguru import logger
-
-# 移除默认处理器
-logger.remove()
-
-# 添加控制台输出
-logger.add(
-    sys.stdout,
-    format="{{time:YYYY-MM-DD HH:mm:ss}} | {{level}} | {{name}}:{{function}}:{{line}} | {{message}}",
-    level="{log_level}",
-    serialize={str(output_format == 'json').lower()}
-)
-
-# 添加文件输出
-logger.add(
-    "logs/app.log",
-    rotation="1 day",
-    retention="30 days",
-    level="{log_level}",
-    format="{{time:YYYY-MM-DD HH:mm:ss}} | {{level}} | {{name}}:{{function}}:{{line}} | {{message}}"
-)
-```
-
-📊 日志聚合 (ELK Stack):
-```yaml
-version: '3.8'
-services:
-  elasticsearch:
-    image: docker.elastic.co/elasticsearch/elasticsearch:8.10.0
-    environment:
-      - discovery.type=single-node
-      - "ES_JAVA_OPTS=-Xms512m -Xmx512m"
-    ports:
-      - "9200:9200"
-
-  logstash:
-    image: docker.elastic.co/logstash/logstash:8.10.0
-    volumes:
-      - ./logstash.conf:/usr/share/logstash/pipeline/logstash.conf
-    depends_on:
-      - elasticsearch
-
-  kibana:
-    image: docker.elastic.co/kibana/kibana:8.10.0
-    ports:
-      - "5601:5601"
-    depends_on:
-      - elasticsearch
-```
-
-🔍 日志分析模式:
-- 请求追踪: 包含请求ID的完整请求链路
-- 错误聚合: 自动分组和统计错误类型
-- 性能分析: 慢查询和性能瓶颈识别
-- 安全审计: 登录、权限变更等安全事件
-"""
-        return logging_config
+        return _LOGGING_CONFIG_TEMPLATE.substitute(
+            log_level=log_level,
+            output_format=output_format,
+            serialize=str(output_format == 'json').lower()
+        )
 
     def _create_alert_rules(self, alert_types: List[str]) -> str:
         """创建告警规则"""
-        alert_rules = [
-            "🚨 监控告警规则配置:",
-            "",
-            "⚡ Prometheus AlertManager规则:"
-        ]
-        
-        rule_templates = {
-            "high_error_rate": """
-  - alert: HighErrorRate
-    expr: rate(http_requests_total{status=~"5.."}[5m]) > 0.1
-    for: 2m
-    labels:
-      severity: warning
-    annotations:
-      summary: "高错误率告警"
-      description: "应用错误率超过10%，持续2分钟"
-""",
-            "high_response_time": """
-  - alert: HighResponseTime
-    expr: histogram_quantile(0.95, rate(http_request_duration_seconds_bucket[5m])) > 1
-    for: 5m
-    labels:
-      severity: warning
-    annotations:
-      summary: "响应时间过长"
-      description: "95%分位响应时间超过1秒，持续5分钟"
-""",
-            "database_connection_high": """
-  - alert: DatabaseConnectionHigh
-    expr: database_connections_active / database_connections_max > 0.8
-    for: 3m
-    labels:
-      severity: critical
-    annotations:
-      summary: "数据库连接使用率过高"
-      description: "数据库连接使用率超过80%，持续3分钟"
-""",
-            "memory_usage_high": """
-  - alert: MemoryUsageHigh
-    expr: (node_memory_MemTotal_bytes - node_memory_MemAvailable_bytes) / node_memory_MemTotal_bytes > 0.9
-    for: 5m
-    labels:
-      severity: critical
-    annotations:
-      summary: "内存使用率过高"
-      description: "系统内存使用率超过90%，持续5分钟"
-"""
-        }
-        
-        for alert_type in alert_types:
-            if alert_type in rule_templates:
-                alert_rules.append(rule_templates[alert_type])
-        
-        alert_rules.extend([
-            "",
-            "📱 通知配置:",
-            "- Slack: 实时告警通知",
-            "- 邮件: 重要告警汇总",
-            "- 钉钉: 国内团队通知",
-            "- PagerDuty: 7x24值班响应"
-        ])
-        
-        return "\n".join(alert_rules)
+        body = "".join(_ALERT_RULE_BLOCKS.get(alert_type, "") for alert_type in alert_types)
+        return f"{_ALERT_RULES_HEADER}{body}{_ALERT_RULES_FOOTER}"
 
     def _setup_monitoring_dashboard(self, dashboard_type: str, services: List[str]) -> str:
         """设置监控仪表板"""
@@ -3,36 +3,51 @@
 专门负责项目文档的生成、维护和更新
 """
 
-from crewai import Agent, Task, Crew, Process
-from .tools import (
-    DocumentationGenerationTool,
-    CodeAnalysisTool,
-    ProjectStructureTool,
-    ImprovementSuggestionTool,
-    HealthCheckTool
-)
+import asyncio
+import functools
+import importlib.util
+import os
+import threading
+from typing import Any, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from crewai import Agent, Task
+
+
+# CrewAI逐步输出日志的开销较大，默认关闭，设置 AGENT_VERBOSE=true 开启
+AGENT_VERBOSE = os.environ.get("AGENT_VERBOSE", "").lower() in ("1", "true", "yes")
+HTTP_MAX_CONNECTIONS = 64  # 共享连接池的最大连接数
+HTTP_MAX_KEEPALIVE = 32  # 保持复用的空闲连接数
+
+
+@functools.lru_cache(maxsize=1)
+def _configure_http_pool() -> bool:
+    """为litellm设置进程内共享的同步HTTP连接池，批量调用时复用TCP/TLS连接
+
+    宿主程序已设置client_session时保持不变；异步客户端绑定创建时的事件循环，
+    不在此处共享，仍由litellm按需创建
+    """
+    try:
+        import httpx
+        import litellm
+    except ImportError:
+        return False
+
+    if getattr(litellm, "client_session", None) is not None:
+        return False
+
+    # 安装了h2时启用HTTP/2，多个并发请求复用同一连接
+    http2 = importlib.util.find_spec("h2") is not None
+    limits = httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_KEEPALIVE)
+    litellm.client_session = httpx.Client(http2=http2, limits=limits, timeout=60)
+    return True
 
 
 class DocumentationAgent:
     """文档生成Agent类"""
     
-    def __init__(self):
-        self.tools = [
-            DocumentationGenerationTool(),
-            CodeAnalysisTool(),
-            ProjectStructureTool(), 
-            ImprovementSuggestionTool(),
-            HealthCheckTool()
-        ]
-        
-        self.agent = self._create_agent()
-    
-    def _create_agent(self) -> Agent:
-        """创建文档专家Agent"""
-        return Agent(
-            role='Documentation Specialist',
-            goal='生成高质量的项目文档，包括API文档、技术文档、用户指南等',
-            backstory="""
+    # Agent背景设定，作为每次请求的固定前缀
+    _BACKSTORY = """
             你是一位资深的技术文档专家，拥有丰富的软件项目文档编写经验。
             你的专长包括：
             
@@ -56,20 +71,13 @@ class DocumentationAgent:
             - 熟悉各种文档格式 (Markdown, reStructuredText, HTML)
             - 了解FastAPI、Vue.js等现代技术栈
             
+            需要多次查询时，使用 batch 工具一次性提交所有调用。
             你的目标是帮助开发者和用户更好地理解和使用项目。
-            """,
-            tools=self.tools,
-            verbose=True,
-            allow_delegation=False,
-            max_iter=3
-        )
+            """
     
-    def generate_api_documentation(self, target_module: str) -> str:
-        """生成API文档"""
-        task = Task(
-            description=f"""
-            为 {target_module} 生成完整的API文档。
-            
+    # 各类任务的描述模板，类加载时构造一次，调用时只做变量替换；
+    # 静态要求在前、变量在末尾，使提示词前缀保持不变以命中模型服务端的提示缓存
+    _API_DOC_TEMPLATE = """
             **任务要求**:
             1. 分析目标模块的代码结构和功能
             2. 生成详细的API接口文档
@@ -80,26 +88,12 @@ class DocumentationAgent:
             
             **输出格式**: Markdown格式的API文档
             **示例数量**: 至少3个实际使用场景
-            """,
-            agent=self.agent,
-            expected_output="完整的API文档，包含接口说明、参数、返回值、使用示例和错误处理"
-        )
-        
-        crew = Crew(
-            agents=[self.agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        return crew.kickoff()
-    
-    def generate_technical_documentation(self, component: str) -> str:
-        """生成技术文档"""
-        task = Task(
-            description=f"""
-            为 {component} 组件生成技术文档。
             
+            为 {target_module} 生成完整的API文档。
+            """
+    _API_DOC_OUTPUT = "完整的API文档，包含接口说明、参数、返回值、使用示例和错误处理"
+
+    _TECH_DOC_TEMPLATE = """
             **文档内容应包括**:
             1. 📋 组件概述和主要功能
             2. 🏗️ 架构设计和实现原理
@@ -112,26 +106,12 @@ class DocumentationAgent:
             
             **目标读者**: 开发人员和系统架构师
             **深度要求**: 深入技术细节，包含实现逻辑
-            """,
-            agent=self.agent,
-            expected_output="深入的技术文档，涵盖架构设计、实现细节和使用指南"
-        )
-        
-        crew = Crew(
-            agents=[self.agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        return crew.kickoff()
-    
-    def generate_user_guide(self, feature: str) -> str:
-        """生成用户指南"""
-        task = Task(
-            description=f"""
-            为 {feature} 功能生成用户操作指南。
             
+            为 {component} 组件生成技术文档。
+            """
+    _TECH_DOC_OUTPUT = "深入的技术文档，涵盖架构设计、实现细节和使用指南"
+
+    _USER_GUIDE_TEMPLATE = """
             **指南内容**:
             1. 🎯 功能介绍和使用场景
             2. 🚀 快速开始指南
@@ -147,26 +127,12 @@ class DocumentationAgent:
             - 分步骤说明，易于跟随
             - 提供截图或示例（如适用）
             - 考虑不同用户的技术水平
-            """,
-            agent=self.agent,
-            expected_output="用户友好的操作指南，包含清晰的步骤说明和实用建议"
-        )
-        
-        crew = Crew(
-            agents=[self.agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        return crew.kickoff()
-    
-    def generate_readme(self, project_focus: str = "overview") -> str:
-        """生成README文档"""
-        task = Task(
-            description=f"""
-            为项目生成README.md文档，重点关注 {project_focus}。
             
+            为 {feature} 功能生成用户操作指南。
+            """
+    _USER_GUIDE_OUTPUT = "用户友好的操作指南，包含清晰的步骤说明和实用建议"
+
+    _README_TEMPLATE = """
             **README结构**:
             1. 📄 项目标题和简介
             2. ✨ 主要特性和亮点
@@ -184,26 +150,12 @@ class DocumentationAgent:
             - 提供在线演示链接（如果有）
             - 突出项目的独特价值
             - 适合不同背景的读者
-            """,
-            agent=self.agent,
-            expected_output="专业的README文档，包含项目介绍、安装指南和使用说明"
-        )
-        
-        crew = Crew(
-            agents=[self.agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        return crew.kickoff()
-    
-    def analyze_and_document(self, target: str) -> str:
-        """分析代码并生成文档"""
-        task = Task(
-            description=f"""
-            对 {target} 进行全面分析并生成综合文档。
             
+            为项目生成README.md文档，重点关注 {project_focus}。
+            """
+    _README_OUTPUT = "专业的README文档，包含项目介绍、安装指南和使用说明"
+
+    _ANALYZE_DOC_TEMPLATE = """
             **分析任务**:
             1. 🔍 代码结构和功能分析
             2. 📊 复杂度和质量评估
@@ -223,24 +175,12 @@ class DocumentationAgent:
             - 逻辑清晰、结构合理
             - 代码示例可运行
             - 适合目标读者群体
-            """,
-            agent=self.agent,
-            expected_output="基于代码分析的综合文档，包含功能说明、技术细节和使用指南"
-        )
-        
-        crew = Crew(
-            agents=[self.agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        return crew.kickoff()
-    
-    def health_check(self) -> str:
-        """检查Agent健康状态"""
-        task = Task(
-            description="""
+            
+            对 {target} 进行全面分析并生成综合文档。
+            """
+    _ANALYZE_DOC_OUTPUT = "基于代码分析的综合文档，包含功能说明、技术细节和使用指南"
+
+    _HEALTH_CHECK_TEMPLATE = """
             执行系统健康检查，确保文档生成环境正常。
             
             **检查项目**:
@@ -253,51 +193,203 @@ class DocumentationAgent:
             - 详细的状态报告
             - 发现的问题和解决建议
             - 系统性能和可用性评估
-            """,
-            agent=self.agent,
-            expected_output="系统健康检查报告，包含状态评估和改进建议"
-        )
+            """
+    _HEALTH_CHECK_OUTPUT = "系统健康检查报告，包含状态评估和改进建议"
+    
+    def __init__(self, small_llm: Any = None, large_llm: Any = None):
+        """small_llm/large_llm 为模型名或LLM实例，默认取 DOC_AGENT_SMALL_LLM / DOC_AGENT_LLM"""
+        # 延迟导入crewai及工具模块，避免导入本模块时加载整个依赖栈
+        from crewai import Crew, Process
+        from .tools import get_doc_tools
+
+        _configure_http_pool()
+        # 工具实例无状态，多个Agent实例共享同一组
+        self.tools = list(get_doc_tools())
         
-        crew = Crew(
+        large_llm = large_llm or os.environ.get("DOC_AGENT_LLM")
+        small_llm = small_llm or os.environ.get("DOC_AGENT_SMALL_LLM") or large_llm
+        
+        # 分析类任务需要多轮推理，使用大模型
+        self.agent = self._create_agent(llm=large_llm)
+        # 直接生成类任务以格式化为主，一轮即可完成，交给小模型省去多余的推理往返
+        self._small_llm = small_llm
+        self.fast_agent = self._create_agent(max_iter=1, llm=small_llm)
+        
+        # 单Agent的Crew复用同一实例，每次调用只替换任务
+        self._crew = Crew(
             agents=[self.agent],
-            tasks=[task],
+            tasks=[],
             process=Process.sequential,
-            verbose=True
+            verbose=AGENT_VERBOSE
+        )
+        self._fast_crew = Crew(
+            agents=[self.fast_agent],
+            tasks=[],
+            process=Process.sequential,
+            verbose=AGENT_VERBOSE
+        )
+        self._crew_lock = threading.Lock()
+    
+    def _create_agent(self, max_iter: int = 3, llm: Any = None) -> "Agent":
+        """创建文档专家Agent"""
+        from crewai import Agent
+
+        return Agent(
+            role='Documentation Specialist',
+            goal='生成高质量的项目文档，包括API文档、技术文档、用户指南等',
+            backstory=self._BACKSTORY,
+            tools=self.tools,
+            verbose=AGENT_VERBOSE,
+            allow_delegation=False,
+            max_iter=max_iter,
+            **self._llm_options(llm)
         )
+    
+    @staticmethod
+    def _llm_options(model: Any) -> dict:
+        """根据模型名构建LLM参数，Anthropic模型开启系统提示缓存"""
+        if not model:
+            return {}
+        if not isinstance(model, str):
+            # 已构建好的LLM实例直接使用
+            return {"llm": model}
         
-        return crew.kickoff()
+        from crewai import LLM
+        
+        if model.startswith(("anthropic/", "claude")):
+            # 背景设定位于系统消息中，标记为可缓存后重复调用只按缓存价格计费；
+            # OpenAI模型对长前缀自动缓存，无需额外配置
+            return {"llm": LLM(
+                model=model,
+                cache_control_injection_points=[{"location": "message", "role": "system"}]
+            )}
+        return {"llm": LLM(model=model)}
+    
+    def _create_task(
+        self, template: str, expected_output: str, fast: bool = False, agent: "Agent" = None, **params
+    ) -> "Task":
+        """根据描述模板创建任务，fast为True时交给单轮迭代的Agent，agent可指定执行的Agent"""
+        from crewai import Task
+
+        return Task(
+            description=template.format(**params) if params else template,
+            agent=agent or (self.fast_agent if fast else self.agent),
+            expected_output=expected_output
+        )
+    
+    def _run_task(self, task: "Task", fast: bool = False) -> str:
+        """在复用的Crew上执行单个任务"""
+        crew = self._fast_crew if fast else self._crew
+        with self._crew_lock:
+            crew.tasks = [task]
+            return crew.kickoff()
+    
+    def generate_api_documentation(self, target_module: str) -> str:
+        """生成API文档"""
+        return self._run_task(
+            self._create_task(self._API_DOC_TEMPLATE, self._API_DOC_OUTPUT, fast=True, target_module=target_module),
+            fast=True
+        )
+    
+    async def agenerate_api_documentation(self, target_module: str) -> str:
+        """异步生成API文档，可与其他文档任务并发执行"""
+        from crewai import Crew, Process
+
+        # CrewAI执行时会改写Agent上的运行状态（crew、executor等），
+        # 并发任务不能共享Crew或Agent，这里为每次调用单独构建
+        agent = self._create_agent(max_iter=1, llm=self._small_llm)
+        crew = Crew(
+            agents=[agent],
+            tasks=[self._create_task(
+                self._API_DOC_TEMPLATE, self._API_DOC_OUTPUT, agent=agent, target_module=target_module
+            )],
+            process=Process.sequential,
+            verbose=AGENT_VERBOSE
+        )
+        return await crew.kickoff_async()
+    
+    def generate_technical_documentation(self, component: str) -> str:
+        """生成技术文档"""
+        return self._run_task(
+            self._create_task(self._TECH_DOC_TEMPLATE, self._TECH_DOC_OUTPUT, component=component)
+        )
+    
+    def generate_user_guide(self, feature: str) -> str:
+        """生成用户指南"""
+        return self._run_task(
+            self._create_task(self._USER_GUIDE_TEMPLATE, self._USER_GUIDE_OUTPUT, fast=True, feature=feature),
+            fast=True
+        )
+    
+    def generate_readme(self, project_focus: str = "overview") -> str:
+        """生成README文档"""
+        return self._run_task(
+            self._create_task(self._README_TEMPLATE, self._README_OUTPUT, fast=True, project_focus=project_focus),
+            fast=True
+        )
+    
+    def analyze_and_document(self, target: str) -> str:
+        """分析代码并生成文档"""
+        return self._run_task(
+            self._create_task(self._ANALYZE_DOC_TEMPLATE, self._ANALYZE_DOC_OUTPUT, target=target)
+        )
+    
+    def health_check(self) -> str:
+        """检查Agent健康状态"""
+        return self._run_task(
+            self._create_task(self._HEALTH_CHECK_TEMPLATE, self._HEALTH_CHECK_OUTPUT)
+        )
+
+
+@functools.lru_cache(maxsize=1)
+def get_doc_agent() -> DocumentationAgent:
+    """获取全局文档Agent实例（首次调用时创建）"""
+    return DocumentationAgent()
 
 
-# 创建全局文档Agent实例
-doc_agent = DocumentationAgent()
+def __getattr__(name):
+    if name == "doc_agent":
+        return get_doc_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # 便捷函数
 def generate_api_docs(module: str) -> str:
     """生成API文档的便捷函数"""
-    return doc_agent.generate_api_documentation(module)
+    return get_doc_agent().generate_api_documentation(module)
+
+
+async def batch_generate(paths: List[str], max_concurrency: int = 8) -> List[str]:
+    """并发生成多个模块的API文档，结果顺序与输入一致，失败项为异常对象"""
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def generate_one(path: str) -> str:
+        async with semaphore:
+            return await get_doc_agent().agenerate_api_documentation(path)
+    
+    return await asyncio.gather(*(generate_one(path) for path in paths), return_exceptions=True)
 
 
 def generate_tech_docs(component: str) -> str:
     """生成技术文档的便捷函数"""
-    return doc_agent.generate_technical_documentation(component)
+    return get_doc_agent().generate_technical_documentation(component)
 
 
 def generate_user_guide(feature: str) -> str:
     """生成用户指南的便捷函数"""
-    return doc_agent.generate_user_guide(feature)
+    return get_doc_agent().generate_user_guide(feature)
 
 
 def generate_readme(focus: str = "overview") -> str:
     """生成README的便捷函数"""
-    return doc_agent.generate_readme(focus)
+    return get_doc_agent().generate_readme(focus)
 
 
 def analyze_and_document(target: str) -> str:
     """分析并生成文档的便捷函数"""
-    return doc_agent.analyze_and_document(target)
+    return get_doc_agent().analyze_and_document(target)
 
 
 def check_doc_agent_health() -> str:
     """检查文档Agent健康状态的便捷函数"""
-    return doc_agent.health_check()
\ No newline at end of file
+    return get_doc_agent().health_check()
\ No newline at end of file
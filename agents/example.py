@@ -3,13 +3,33 @@ Agent系统使用示例
 演示如何使用文档生成Agent和前端开发Agent
 """
 
+import asyncio
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # 添加路径以便导入
 sys.path.append(str(Path(__file__).parent))
 
+
+def stream_preview(chunks, limit=200):
+    """流式读取输出，够预览长度时立即打印；随后读完剩余输出，使完整结果写入缓存"""
+    parts, size, shown = [], 0, False
+    try:
+        for chunk in chunks:
+            parts.append(chunk)
+            size += len(chunk)
+            if not shown and size >= limit:
+                print(f"   预览: {''.join(parts)[:limit]}...")
+                shown = True
+    finally:
+        chunks.close()
+    text = "".join(parts)
+    if not shown:
+        print(f"   预览: {text[:limit]}...")
+    return text
+
 def example_1_basic_usage():
     """示例1: 基础用法 - 不依赖CrewAI"""
     print("🔹 示例1: 基础用法")
@@ -37,12 +57,12 @@ def example_1_basic_usage():
         
         # 生成API文档
         print("\n4. 生成权限中间件API文档...")
-        api_docs = claude_integration.generate_documentation(
+        # 流式读取，开头内容一到即显示预览；完整结果进入缓存，示例3对同一文件直接复用
+        stream_preview(claude_integration.generate_documentation_stream(
             "backend/middleware/permission.py", 
             "api"
-        )
+        ))
         print("   ✅ API文档生成完成")
-        print(f"   预览: {api_docs[:200]}...")
         
         return True
         
@@ -91,10 +111,6 @@ def example_3_batch_documentation():
     try:
         from claude_integration import claude_integration
         
-        # 获取所有Python文件
-        python_files = claude_integration.list_python_files()
-        print(f"1. 发现 {len(python_files)} 个Python文件")
-        
         # 重点关注的文件
         priority_files = [
             "backend/middleware/permission.py",
@@ -103,18 +119,32 @@ def example_3_batch_documentation():
             "backend/models/user.py"
         ]
         
+        # 只需确认重点文件存在，逐个stat即可，无需遍历整个项目
+        project_path = claude_integration.project_path
+        targets = [file_path for file_path in priority_files if (project_path / file_path).is_file()]
+        print(f"1. 发现 {len(targets)}/{len(priority_files)} 个重点文件")
+        
         print("2. 生成重点文件的文档...")
-        docs_generated = 0
+        for file_path in targets:
+            print(f"   📝 处理: {file_path}")
         
-        for file_path in priority_files:
-            if file_path in python_files:
-                try:
-                    print(f"   📝 处理: {file_path}")
-                    docs = claude_integration.generate_documentation(file_path, "api")
-                    docs_generated += 1
-                    print(f"   ✅ 完成: {len(docs)} 字符")
-                except Exception as e:
-                    print(f"   ❌ 失败: {e}")
+        # 各文件的文档生成互不依赖，并发执行
+        async def generate_all():
+            semaphore = asyncio.Semaphore(4)
+            
+            async def generate_one(file_path):
+                async with semaphore:
+                    return await claude_integration.agenerate_documentation(file_path, "api")
+            
+            return await asyncio.gather(*(generate_one(f) for f in targets), return_exceptions=True)
+        
+        docs_generated = 0
+        for file_path, docs in zip(targets, asyncio.run(generate_all())):
+            if isinstance(docs, Exception):
+                print(f"   ❌ 失败: {file_path}: {docs}")
+            else:
+                docs_generated += 1
+                print(f"   ✅ 完成: {file_path}: {len(docs)} 字符")
         
         print(f"\n3. 批量生成完成: {docs_generated}/{len(priority_files)} 个文件")
         return True
@@ -132,46 +162,78 @@ def example_4_interactive_mode():
     try:
         from claude_integration import claude_integration
         
+        def preview(text):
+            return text[:500] + "..." if len(text) > 500 else text
+        
+        def list_files():
+            files = claude_integration.list_python_files()
+            lines = [f"{i:2d}. {file}" for i, file in enumerate(files[:10], 1)]
+            if len(files) > 10:
+                lines.append(f"... 还有 {len(files) - 10} 个文件")
+            return "\n".join(lines)
+        
+        # 命令分发表：命令名 -> (处理函数, 是否需要文件路径参数)
+        dispatch = {
+            'health': (lambda: f"系统状态: {claude_integration.health_check()['status']}", False),
+            'structure': (lambda: preview(claude_integration.get_project_structure()), False),
+            'list': (list_files, False),
+            'analyze': (lambda file_path: preview(claude_integration.analyze_file(file_path)), True),
+            'docs': (lambda file_path: preview(claude_integration.generate_documentation(file_path)), True),
+        }
+        
+        jobs = {}
+        
+        def report(future):
+            label = jobs.pop(future, "")
+            try:
+                print(f"\n[{label}]\n{future.result()}")
+            except Exception as e:
+                print(f"\n[{label}] ❌ 执行失败: {e}")
+        
         print("交互式文档生成器")
         print("输入 'help' 查看命令，输入 'quit' 退出")
-        
-        while True:
-            command = input("\n📝 doc> ").strip().lower()
-            
-            if command == 'quit':
-                break
-            elif command == 'help':
-                print("""
+        print("命令在后台执行，可连续输入多个命令")
+        
+        # 耗时命令提交到线程池，提示符立即返回，多个分析/文档任务可并行
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            while True:
+                command = input("\n📝 doc> ").strip()
+                name, _, arg = command.partition(' ')
+                name = name.lower()
+                arg = arg.strip()
+                
+                if name == 'quit':
+                    if jobs:
+                        print(f"等待 {len(jobs)} 个后台任务完成...")
+                    break
+                if name == 'help':
+                    print("""
 可用命令:
 - health: 系统健康检查
 - structure: 项目结构分析
 - list: 列出Python文件
 - analyze <file>: 分析指定文件
 - docs <file>: 生成文档
+- jobs: 查看执行中的任务
 - quit: 退出
-                """)
-            elif command == 'health':
-                health = claude_integration.health_check()
-                print(f"系统状态: {health['status']}")
-            elif command == 'structure':
-                structure = claude_integration.get_project_structure()
-                print(structure[:500] + "..." if len(structure) > 500 else structure)
-            elif command == 'list':
-                files = claude_integration.list_python_files()
-                for i, file in enumerate(files[:10], 1):
-                    print(f"{i:2d}. {file}")
-                if len(files) > 10:
-                    print(f"... 还有 {len(files) - 10} 个文件")
-            elif command.startswith('analyze '):
-                file_path = command[8:].strip()
-                analysis = claude_integration.analyze_file(file_path)
-                print(analysis[:500] + "..." if len(analysis) > 500 else analysis)
-            elif command.startswith('docs '):
-                file_path = command[5:].strip()
-                docs = claude_integration.generate_documentation(file_path)
-                print(docs[:500] + "..." if len(docs) > 500 else docs)
-            else:
-                print("未知命令，输入 'help' 查看帮助")
+                    """)
+                    continue
+                if name == 'jobs':
+                    if not jobs:
+                        print("没有执行中的任务")
+                    for label in jobs.values():
+                        print(f"⏳ {label}")
+                    continue
+                
+                handler, needs_path = dispatch.get(name, (None, False))
+                if handler is None or (needs_path and not arg):
+                    print("未知命令，输入 'help' 查看帮助")
+                    continue
+                
+                future = pool.submit(handler, *((arg,) if needs_path else ()))
+                jobs[future] = command
+                future.add_done_callback(report)
+                print(f"🚀 已提交: {command}")
         
         return True
         
@@ -205,33 +267,41 @@ def example_5_frontend_agent():
         for agent_name, tasks in capabilities.items():
             print(f"   {agent_name}: {', '.join(tasks)}")
         
-        # 生成Vue组件示例
-        print("\n3. 生成Vue组件示例...")
-        try:
-            component_result = agent_manager.execute_task(
-                'frontend', 
-                'generate_component',
-                component_name='UserCard',
-                requirements='用户信息展示卡片组件，包含头像、姓名、部门信息，支持点击查看详情'
+        # 组件生成与布局设计互不依赖，并发执行
+        print("\n3. 生成Vue组件示例 / 4. 设计UI布局示例（并发执行）...")
+        
+        async def run_frontend_tasks():
+            return await asyncio.gather(
+                asyncio.to_thread(
+                    agent_manager.execute_task,
+                    'frontend', 
+                    'generate_component',
+                    component_name='UserCard',
+                    requirements='用户信息展示卡片组件，包含头像、姓名、部门信息，支持点击查看详情'
+                ),
+                asyncio.to_thread(
+                    agent_manager.execute_task,
+                    'frontend',
+                    'design_layout', 
+                    page_name='用户管理页面',
+                    business_requirements='需要展示用户列表、搜索筛选、批量操作、用户详情等功能'
+                ),
+                return_exceptions=True
             )
+        
+        component_result, layout_result = asyncio.run(run_frontend_tasks())
+        
+        if isinstance(component_result, Exception):
+            print(f"   ❌ 组件生成失败: {component_result}")
+        else:
             print("   ✅ Vue组件生成完成")
             print(f"   预览: {str(component_result)[:200]}...")
-        except Exception as e:
-            print(f"   ❌ 组件生成失败: {e}")
         
-        # 设计UI布局示例
-        print("\n4. 设计UI布局示例...")
-        try:
-            layout_result = agent_manager.execute_task(
-                'frontend',
-                'design_layout', 
-                page_name='用户管理页面',
-                business_requirements='需要展示用户列表、搜索筛选、批量操作、用户详情等功能'
-            )
+        if isinstance(layout_result, Exception):
+            print(f"   ❌ 布局设计失败: {layout_result}")
+        else:
             print("   ✅ UI布局设计完成")
             print(f"   预览: {str(layout_result)[:200]}...")
-        except Exception as e:
-            print(f"   ❌ 布局设计失败: {e}")
         
         return True
         
@@ -280,6 +350,13 @@ def main():
     print("🚀 Agent系统示例")
     print("=" * 50)
     
+    # 多个示例会对同一文件重复生成文档，开启结果缓存避免重复调用
+    try:
+        from claude_integration import claude_integration
+        claude_integration.enable_cache = True
+    except Exception:
+        pass
+    
     examples = [
         ("基础用法", example_1_basic_usage),
         ("Agent用法", example_2_advanced_usage), 
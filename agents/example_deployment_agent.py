@@ -4,14 +4,15 @@
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # 添加agents目录到Python路径
 sys.path.append(str(Path(__file__).parent))
 
+# 分别记录各模块是否可用，导入失败的模块对应的演示直接跳过
 try:
     from deployment_agent import (
-        deployment_agent,
         containerize_app,
         setup_pipeline,
         configure_envs,
@@ -20,22 +21,57 @@ try:
         create_dr_plan,
         check_deployment_health
     )
+    DEPLOYMENT_AGENT_AVAILABLE = True
+except ImportError as e:
+    DEPLOYMENT_AGENT_AVAILABLE = False
+    print(f"❌ 部署Agent模块导入失败: {e}")
+
+try:
     from task_coordinator import task_coordinator, TaskType, TaskPriority
-    print("✅ 部署Agent模块导入成功")
+    TASK_COORDINATOR_AVAILABLE = True
 except ImportError as e:
-    print(f"❌ 模块导入失败: {e}")
+    TASK_COORDINATOR_AVAILABLE = False
+    print(f"❌ 任务协调模块导入失败: {e}")
+
+if DEPLOYMENT_AGENT_AVAILABLE and TASK_COORDINATOR_AVAILABLE:
+    print("✅ 部署Agent模块导入成功")
+else:
     print("💡 请确保CrewAI已安装: pip install crewai")
 
 
-def demo_containerization():
-    """演示容器化功能"""
+# 各演示使用的参数
+CONTAINER_SERVICES = ['backend', 'frontend', 'db', 'redis']
+PIPELINE_FEATURES = [
+    'automated_testing',
+    'code_quality', 
+    'docker_build',
+    'multi_env_deploy',
+    'security_scan'
+]
+ENVIRONMENTS = ['development', 'staging', 'production']
+MONITORED_SERVICES = ['backend', 'frontend', 'db', 'redis']
+OPTIMIZATION_AREAS = [
+    'container_optimization',
+    'resource_allocation',
+    'caching_strategy',
+    'database_tuning'
+]
+DR_SERVICES = ['backend', 'db', 'redis']
+DR_OBJECTIVES = {
+    'RTO': '30分钟',  # 恢复时间目标
+    'RPO': '5分钟'    # 恢复点目标
+}
+
+
+def demo_containerization(result=None):
+    """演示容器化功能，可传入预先执行的结果只做展示"""
     print("\n" + "="*60)
     print("🐳 容器化功能演示")
     print("="*60)
     
     # 测试容器化应用
-    services = ['backend', 'frontend', 'db', 'redis']
-    result = containerize_app(services, environment='production')
+    if result is None:
+        result = containerize_app(CONTAINER_SERVICES, environment='production')
     
     print("📋 容器化结果:")
     if result.get('status') == 'success':
@@ -54,21 +90,16 @@ def demo_containerization():
         print(f"❌ 容器化失败: {result.get('error', 'Unknown error')}")
 
 
-def demo_cicd_pipeline():
-    """演示CI/CD流水线功能"""
+def demo_cicd_pipeline(result=None):
+    """演示CI/CD流水线功能，可传入预先执行的结果只做展示"""
     print("\n" + "="*60)
     print("🚀 CI/CD流水线功能演示")
     print("="*60)
     
     # 测试CI/CD流水线设置
-    features = [
-        'automated_testing',
-        'code_quality', 
-        'docker_build',
-        'multi_env_deploy',
-        'security_scan'
-    ]
-    result = setup_pipeline(platform='github', features=features)
+    features = PIPELINE_FEATURES
+    if result is None:
+        result = setup_pipeline(platform='github', features=features)
     
     print("📋 CI/CD流水线设置结果:")
     if result.get('status') == 'success':
@@ -86,15 +117,16 @@ def demo_cicd_pipeline():
         print(f"❌ 流水线设置失败: {result.get('error', 'Unknown error')}")
 
 
-def demo_environment_management():
-    """演示环境管理功能"""
+def demo_environment_management(result=None):
+    """演示环境管理功能，可传入预先执行的结果只做展示"""
     print("\n" + "="*60)
     print("🏗️ 环境管理功能演示")
     print("="*60)
     
     # 测试多环境配置
-    environments = ['development', 'staging', 'production']
-    result = configure_envs(environments)
+    environments = ENVIRONMENTS
+    if result is None:
+        result = configure_envs(environments)
     
     print("📋 环境配置结果:")
     if result.get('status') == 'success':
@@ -110,15 +142,16 @@ def demo_environment_management():
         print(f"❌ 环境配置失败: {result.get('error', 'Unknown error')}")
 
 
-def demo_monitoring_setup():
-    """演示监控系统功能"""
+def demo_monitoring_setup(result=None):
+    """演示监控系统功能，可传入预先执行的结果只做展示"""
     print("\n" + "="*60)
     print("📊 监控系统功能演示")
     print("="*60)
     
     # 测试监控系统设置
-    services = ['backend', 'frontend', 'db', 'redis']
-    result = setup_monitoring(services, stack='prometheus')
+    services = MONITORED_SERVICES
+    if result is None:
+        result = setup_monitoring(services, stack='prometheus')
     
     print("📋 监控系统设置结果:")
     if result.get('status') == 'success':
@@ -136,20 +169,16 @@ def demo_monitoring_setup():
         print(f"❌ 监控设置失败: {result.get('error', 'Unknown error')}")
 
 
-def demo_performance_optimization():
-    """演示性能优化功能"""
+def demo_performance_optimization(result=None):
+    """演示性能优化功能，可传入预先执行的结果只做展示"""
     print("\n" + "="*60)
     print("⚡ 性能优化功能演示")
     print("="*60)
     
     # 测试性能优化
-    optimization_areas = [
-        'container_optimization',
-        'resource_allocation',
-        'caching_strategy',
-        'database_tuning'
-    ]
-    result = optimize_performance('production', optimization_areas)
+    optimization_areas = OPTIMIZATION_AREAS
+    if result is None:
+        result = optimize_performance('production', optimization_areas)
     
     print("📋 性能优化结果:")
     if result.get('status') == 'success':
@@ -165,19 +194,17 @@ def demo_performance_optimization():
         print(f"❌ 性能优化失败: {result.get('error', 'Unknown error')}")
 
 
-def demo_disaster_recovery():
-    """演示灾难恢复功能"""
+def demo_disaster_recovery(result=None):
+    """演示灾难恢复功能，可传入预先执行的结果只做展示"""
     print("\n" + "="*60)
     print("💾 灾难恢复功能演示")
     print("="*60)
     
     # 测试灾难恢复计划
-    services = ['backend', 'db', 'redis']
-    objectives = {
-        'RTO': '30分钟',  # 恢复时间目标
-        'RPO': '5分钟'    # 恢复点目标
-    }
-    result = create_dr_plan(services, objectives)
+    services = DR_SERVICES
+    objectives = DR_OBJECTIVES
+    if result is None:
+        result = create_dr_plan(services, objectives)
     
     print("📋 灾难恢复计划结果:")
     if result.get('status') == 'success':
@@ -255,22 +282,25 @@ def demo_task_coordination():
             print(f"      状态: {task.status.value}")
             print(f"      优先级: {task.priority.value}")
         
-        # 分配和执行任务
+        # 分配任务
         print(f"\n🎯 任务分配和执行:")
+        assigned_tasks = []
         for task_id in tasks:
-            assigned = task_coordinator.assign_task(task_id)
-            if assigned:
-                task = task_coordinator.tasks[task_id]
+            task = task_coordinator.tasks[task_id]
+            if task_coordinator.assign_task(task_id):
+                assigned_tasks.append(task_id)
                 print(f"   ✅ 任务 {task.title} 已分配给: {task.assigned_agent}")
-                
-                # 执行任务
-                executed = task_coordinator.execute_task(task_id)
-                if executed:
-                    print(f"   🚀 任务执行完成")
-                else:
-                    print(f"   ❌ 任务执行失败")
             else:
-                print(f"   ❌ 任务分配失败")
+                print(f"   ❌ 任务 {task.title} 分配失败")
+        
+        # 三个任务之间没有依赖，并发执行
+        executed = task_coordinator.execute_tasks_parallel(assigned_tasks)
+        for task_id, ok in executed.items():
+            task = task_coordinator.tasks[task_id]
+            if ok:
+                print(f"   🚀 任务 {task.title} 执行完成")
+            else:
+                print(f"   ❌ 任务 {task.title} 执行失败")
         
         # 显示任务状态
         print(f"\n📊 最终任务状态:")
@@ -321,16 +351,29 @@ def run_all_demos():
     print("="*80)
     
     try:
-        # 基础功能演示
-        demo_containerization()
-        demo_cicd_pipeline()
-        demo_environment_management()
-        demo_monitoring_setup()
-        demo_performance_optimization()
-        demo_disaster_recovery()
+        if not DEPLOYMENT_AGENT_AVAILABLE:
+            print("⚠️ 部署Agent不可用，跳过全部部署演示")
+            return
+        
+        # 基础功能演示：各项调用互不依赖，先并发执行，再按顺序展示结果
+        basic_demos = [
+            (demo_containerization, lambda: containerize_app(CONTAINER_SERVICES, environment='production')),
+            (demo_cicd_pipeline, lambda: setup_pipeline(platform='github', features=PIPELINE_FEATURES)),
+            (demo_environment_management, lambda: configure_envs(ENVIRONMENTS)),
+            (demo_monitoring_setup, lambda: setup_monitoring(MONITORED_SERVICES, stack='prometheus')),
+            (demo_performance_optimization, lambda: optimize_performance('production', OPTIMIZATION_AREAS)),
+            (demo_disaster_recovery, lambda: create_dr_plan(DR_SERVICES, DR_OBJECTIVES)),
+        ]
+        with ThreadPoolExecutor(max_workers=len(basic_demos)) as pool:
+            futures = [(demo, pool.submit(run)) for demo, run in basic_demos]
+            for demo, future in futures:
+                demo(future.result())
         
         # 高级功能演示
-        demo_task_coordination()
+        if TASK_COORDINATOR_AVAILABLE:
+            demo_task_coordination()
+        else:
+            print("\n⚠️ 任务协调模块不可用，跳过任务协调演示")
         demo_health_check()
         
         print("\n" + "="*80)
@@ -2,69 +2,204 @@
 """
 FastAPI后端开发Agent使用示例
 演示如何使用FastAPIBackendAgent进行后端开发任务
+
+在项目根目录运行: python -m agents.example_fastapi_agent
 """
 
-import sys
-import os
-from pathlib import Path
+import json
+from dataclasses import asdict, dataclass, fields, is_dataclass
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:
+    # orjson为可选依赖，未安装时使用标准库json
+    orjson = None
+
+from ._demo_io import print_tb, read_line, write_banner, write_lines
+
+# 演示输出使用的分隔线
+_EQ50 = "=" * 50
+_EQ60 = "=" * 60
+_DASH30 = "-" * 30
+_DASH50 = "-" * 50
+
+# 静态横幅预先编码为UTF-8字节，输出时无需再次编码
+_BANNER_MAIN = f"🚀 FastAPIBackendAgent 使用示例\n{_EQ60}\nFastAPI后端开发专家Agent演示\n包含完整的后端开发工作流示例\n{_EQ60}\n".encode("utf-8")
+_BANNER_INTERACTIVE = f"\n🎯 FastAPI后端Agent - 交互式演示\n{_EQ50}\n".encode("utf-8")
+
+
+def _dump_json(obj):
+    """将演示配置序列化为缩进JSON，优先使用orjson"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    if is_dataclass(obj):
+        obj = asdict(obj)
+    return json.dumps(obj, ensure_ascii=False, indent=2)
 
-# 添加agents目录到Python路径
-sys.path.append(str(Path(__file__).parent))
+
+@dataclass(frozen=True, slots=True)
+class ResourceConfig:
+    """资源生成演示配置"""
+    resource_name: str
+    fields: dict
+    include_auth: bool
+    custom_endpoints: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class AuthConfig:
+    """认证系统演示配置"""
+    auth_type: str
+    include_rbac: bool
+    oauth_providers: tuple
+    features: tuple
+
+
+# 演示用的静态数据在模块加载时构建一次，重复运行演示时直接复用
+_RESOURCE_CONFIG = ResourceConfig(
+    resource_name='products',
+    fields={
+        'name': 'string',
+        'price': 'float',
+        'description': 'text',
+        'category_id': 'integer',
+        'is_active': 'boolean'
+    },
+    include_auth=True,
+    custom_endpoints=('search', 'featured')
+)
+
+_RESOURCE_CONFIG_JSON = _dump_json(_RESOURCE_CONFIG)
+
+_TABLES_JSON = _dump_json([
+    'products',
+    'categories', 
+    'inventory',
+    'orders',
+    'order_items',
+    'users',
+    'user_addresses'
+])
+
+_RELATIONSHIPS_JSON = _dump_json({
+    'products': ['categories', 'inventory'],
+    'orders': ['users', 'order_items'],
+    'order_items': ['products'],
+    'user_addresses': ['users']
+})
+
+_AUTH_CONFIG = AuthConfig(
+    auth_type='JWT',
+    include_rbac=True,
+    oauth_providers=('Google', 'GitHub'),
+    features=(
+        '用户注册登录',
+        'JWT令牌管理',
+        '角色权限控制',
+        'OAuth第三方登录',
+        '密码安全策略',
+        '登录失败限制'
+    )
+)
+
+_OPTIMIZATION_TARGETS = (
+    "🚀 响应时间优化 (目标: <200ms)",
+    "📈 并发处理提升 (目标: 1000+ QPS)",
+    "💾 内存使用优化 (减少50%)",
+    "🗃️ 数据库查询优化 (减少N+1查询)",
+    "🎯 资源消耗降低 (CPU/内存)"
+)
+
+_STRATEGIES = MappingProxyType({
+    '异步处理': 'async/await优化，异步数据库连接',
+    '数据库优化': 'Query优化，索引调整，连接池配置',
+    '缓存策略': 'Redis缓存，查询结果缓存，静态资源缓存',
+    '序列化优化': 'Pydantic优化，JSON序列化加速',
+    '中间件调优': '请求处理流程优化，中间件顺序调整'
+})
+
+_REVIEW_FILES = (
+    "backend/api/v1/users.py",
+    "backend/models/user.py",
+    "backend/crud/user.py",
+    "backend/core/security.py"
+)
+
+_REVIEW_DIMENSIONS = (
+    "🔍 代码质量检查 - 命名规范、代码结构",
+    "🏗️ 架构设计评估 - 模块化、依赖关系",
+    "🚀 性能优化建议 - 查询优化、异步处理", 
+    "🛡️ 安全性审查 - 权限控制、数据验证",
+    "📚 文档完整性 - docstring、注释质量",
+    "🧪 测试覆盖度 - 单元测试、集成测试"
+)
+
+_DECOMPOSED_TASKS = (
+    "📋 数据库设计任务 - 设计Product/Category/Inventory模型",
+    "🔧 API开发任务 - 实现商品CRUD接口",
+    "🔍 搜索功能任务 - 实现商品搜索和筛选",
+    "📖 文档生成任务 - 生成API文档",
+    "⚡ 性能优化任务 - 优化查询和响应速度"
+)
+
+_WORKFLOW_STEPS = (
+    "1️⃣ 需求分析 → 数据库设计",
+    "2️⃣ 数据模型 → SQLAlchemy模型生成",
+    "3️⃣ 业务逻辑 → CRUD操作实现",
+    "4️⃣ API接口 → FastAPI路由生成",
+    "5️⃣ 数据验证 → Pydantic Schema",
+    "6️⃣ 权限控制 → JWT认证集成",
+    "7️⃣ 文档生成 → API文档输出",
+    "8️⃣ 性能优化 → 查询和缓存优化",
+    "9️⃣ 代码审查 → 质量检查和重构"
+)
 
 
 def demo_basic_fastapi_operations():
     """演示基础FastAPI开发操作"""
-    print("🎯 FastAPI后端Agent - 基础操作示例")
-    print("=" * 50)
+    lines = []
+    lines.append("🎯 FastAPI后端Agent - 基础操作示例")
+    lines.append(_EQ50)
     
     # 由于CrewAI依赖问题，使用简化的示例演示
-    print("\n🔹 1. 创建完整资源示例")
-    print("-" * 30)
-    print("创建Product资源，包含：")
-    print("- 数据模型: Product")
-    print("- 字段: name(string), price(float), description(text)")
-    print("- 包含权限验证: 是")
-    print("- 自动生成: Model + Schema + CRUD + API")
+    lines.append("\n🔹 1. 创建完整资源示例")
+    lines.append(_DASH30)
+    lines.append("创建Product资源，包含：")
+    lines.append("- 数据模型: Product")
+    lines.append("- 字段: name(string), price(float), description(text)")
+    lines.append("- 包含权限验证: 是")
+    lines.append("- 自动生成: Model + Schema + CRUD + API")
     
     # 示例配置
-    resource_config = {
-        'resource_name': 'products',
-        'fields': {
-            'name': 'string',
-            'price': 'float', 
-            'description': 'text',
-            'category_id': 'integer',
-            'is_active': 'boolean'
-        },
-        'include_auth': True,
-        'custom_endpoints': ['search', 'featured']
-    }
-    
-    print(f"\n配置详情: {resource_config}")
-    print("\n✅ 将生成以下文件:")
-    print("- backend/models/product.py")
-    print("- backend/schemas/product.py") 
-    print("- backend/crud/product.py")
-    print("- backend/api/v1/products.py")
-    
-    print("\n🔹 2. 实现单个API端点示例")
-    print("-" * 30)
-    print("端点配置:")
-    print("- 路径: /api/v1/products/search")
-    print("- 方法: POST")
-    print("- 功能: 商品搜索")
-    print("- 权限: 需要登录")
-    print("- 请求Schema: ProductSearchRequest")
-    print("- 响应Schema: List[ProductResponse]")
+    lines.append("\n配置详情: " + _RESOURCE_CONFIG_JSON)
+    lines.append("\n✅ 将生成以下文件:")
+    lines.append("- backend/models/product.py")
+    lines.append("- backend/schemas/product.py") 
+    lines.append("- backend/crud/product.py")
+    lines.append("- backend/api/v1/products.py")
+    
+    lines.append("\n🔹 2. 实现单个API端点示例")
+    lines.append(_DASH30)
+    lines.append("端点配置:")
+    lines.append("- 路径: /api/v1/products/search")
+    lines.append("- 方法: POST")
+    lines.append("- 功能: 商品搜索")
+    lines.append("- 权限: 需要登录")
+    lines.append("- 请求Schema: ProductSearchRequest")
+    lines.append("- 响应Schema: List[ProductResponse]")
+    
+    write_lines(lines)
 
 
 def demo_database_design():
     """演示数据库设计功能"""
-    print("\n🎯 FastAPI后端Agent - 数据库设计示例")
-    print("=" * 50)
+    lines = []
+    lines.append("\n🎯 FastAPI后端Agent - 数据库设计示例")
+    lines.append(_EQ50)
     
-    print("\n🔹 业务需求分析")
-    print("-" * 30)
+    lines.append("\n🔹 业务需求分析")
+    lines.append(_DASH30)
     requirements = """
     设计一个电商系统的核心数据库：
     
@@ -84,152 +219,98 @@ def demo_database_design():
        - 用户偏好设置
     """
     
-    print(requirements)
-    
-    print("\n🔹 数据表设计")
-    print("-" * 30)
-    tables = [
-        'products',
-        'categories', 
-        'inventory',
-        'orders',
-        'order_items',
-        'users',
-        'user_addresses'
-    ]
-    
-    relationships = {
-        'products': ['categories', 'inventory'],
-        'orders': ['users', 'order_items'],
-        'order_items': ['products'],
-        'user_addresses': ['users']
-    }
-    
-    print(f"涉及数据表: {tables}")
-    print(f"表关系设计: {relationships}")
-    
-    print("\n✅ 设计输出:")
-    print("- ER图描述文档")
-    print("- SQLAlchemy模型定义")
-    print("- 数据库迁移脚本")
-    print("- 索引优化建议")
+    lines.append(requirements)
+    
+    lines.append("\n🔹 数据表设计")
+    lines.append(_DASH30)
+    lines.append("涉及数据表: " + _TABLES_JSON)
+    lines.append("表关系设计: " + _RELATIONSHIPS_JSON)
+    
+    lines.append("\n✅ 设计输出:")
+    lines.append("- ER图描述文档")
+    lines.append("- SQLAlchemy模型定义")
+    lines.append("- 数据库迁移脚本")
+    lines.append("- 索引优化建议")
+    
+    write_lines(lines)
 
 
 def demo_authentication_system():
     """演示认证系统实现"""
-    print("\n🎯 FastAPI后端Agent - 认证系统示例")
-    print("=" * 50)
-    
-    auth_config = {
-        'auth_type': 'JWT',
-        'include_rbac': True,
-        'oauth_providers': ['Google', 'GitHub'],
-        'features': [
-            '用户注册登录',
-            'JWT令牌管理', 
-            '角色权限控制',
-            'OAuth第三方登录',
-            '密码安全策略',
-            '登录失败限制'
-        ]
-    }
-    
-    print("\n🔹 认证系统配置")
-    print("-" * 30)
-    for key, value in auth_config.items():
-        if isinstance(value, list):
-            print(f"{key}:")
-            for item in value:
-                print(f"  - {item}")
-        else:
-            print(f"{key}: {value}")
-    
-    print("\n✅ 实现组件:")
-    print("- JWT编码解码工具")
-    print("- 密码哈希验证")
-    print("- 权限装饰器")
-    print("- 认证中间件")
-    print("- OAuth集成")
-    print("- 登录API端点")
+    lines = []
+    lines.append("\n🎯 FastAPI后端Agent - 认证系统示例")
+    lines.append(_EQ50)
+    
+    lines.append("\n🔹 认证系统配置")
+    lines.append(_DASH30)
+    for field in fields(_AUTH_CONFIG):
+        key, value = field.name, getattr(_AUTH_CONFIG, field.name)
+        match value:
+            case tuple() as items:
+                lines.append(f"{key}:")
+                lines.extend(f"  - {item}" for item in items)
+            case _:
+                lines.append(f"{key}: {value}")
+    
+    lines.append("\n✅ 实现组件:")
+    lines.append("- JWT编码解码工具")
+    lines.append("- 密码哈希验证")
+    lines.append("- 权限装饰器")
+    lines.append("- 认证中间件")
+    lines.append("- OAuth集成")
+    lines.append("- 登录API端点")
+    
+    write_lines(lines)
 
 
 def demo_performance_optimization():
     """演示性能优化功能"""
-    print("\n🎯 FastAPI后端Agent - 性能优化示例")
-    print("=" * 50)
-    
-    print("\n🔹 性能优化目标")
-    print("-" * 30)
-    optimization_targets = [
-        "🚀 响应时间优化 (目标: <200ms)",
-        "📈 并发处理提升 (目标: 1000+ QPS)",
-        "💾 内存使用优化 (减少50%)",
-        "🗃️ 数据库查询优化 (减少N+1查询)",
-        "🎯 资源消耗降低 (CPU/内存)"
-    ]
-    
-    for target in optimization_targets:
-        print(f"  {target}")
-    
-    print("\n🔹 优化策略")
-    print("-" * 30)
-    strategies = {
-        '异步处理': 'async/await优化，异步数据库连接',
-        '数据库优化': 'Query优化，索引调整，连接池配置',
-        '缓存策略': 'Redis缓存，查询结果缓存，静态资源缓存',
-        '序列化优化': 'Pydantic优化，JSON序列化加速',
-        '中间件调优': '请求处理流程优化，中间件顺序调整'
-    }
-    
-    for strategy, description in strategies.items():
-        print(f"  {strategy}: {description}")
+    lines = []
+    lines.append("\n🎯 FastAPI后端Agent - 性能优化示例")
+    lines.append(_EQ50)
+    
+    lines.append("\n🔹 性能优化目标")
+    lines.append(_DASH30)
+    lines.extend(f"  {target}" for target in _OPTIMIZATION_TARGETS)
+    
+    lines.append("\n🔹 优化策略")
+    lines.append(_DASH30)
+    lines.extend(f"  {strategy}: {description}" for strategy, description in _STRATEGIES.items())
+    
+    write_lines(lines)
 
 
 def demo_code_review():
     """演示代码审查功能"""
-    print("\n🎯 FastAPI后端Agent - 代码审查示例")
-    print("=" * 50)
-    
-    review_files = [
-        "backend/api/v1/users.py",
-        "backend/models/user.py",
-        "backend/crud/user.py",
-        "backend/core/security.py"
-    ]
-    
-    print("\n🔹 审查文件列表")
-    print("-" * 30)
-    for file in review_files:
-        print(f"  📄 {file}")
-    
-    print("\n🔹 审查维度")
-    print("-" * 30)
-    review_dimensions = [
-        "🔍 代码质量检查 - 命名规范、代码结构",
-        "🏗️ 架构设计评估 - 模块化、依赖关系",
-        "🚀 性能优化建议 - 查询优化、异步处理", 
-        "🛡️ 安全性审查 - 权限控制、数据验证",
-        "📚 文档完整性 - docstring、注释质量",
-        "🧪 测试覆盖度 - 单元测试、集成测试"
-    ]
-    
-    for dimension in review_dimensions:
-        print(f"  {dimension}")
-    
-    print("\n✅ 输出内容:")
-    print("- 详细问题分析报告")
-    print("- 具体改进建议") 
-    print("- 重构代码示例")
-    print("- 最佳实践推荐")
+    lines = []
+    lines.append("\n🎯 FastAPI后端Agent - 代码审查示例")
+    lines.append(_EQ50)
+    
+    lines.append("\n🔹 审查文件列表")
+    lines.append(_DASH30)
+    lines.extend(f"  📄 {file}" for file in _REVIEW_FILES)
+    
+    lines.append("\n🔹 审查维度")
+    lines.append(_DASH30)
+    lines.extend(f"  {dimension}" for dimension in _REVIEW_DIMENSIONS)
+    
+    lines.append("\n✅ 输出内容:")
+    lines.append("- 详细问题分析报告")
+    lines.append("- 具体改进建议") 
+    lines.append("- 重构代码示例")
+    lines.append("- 最佳实践推荐")
+    
+    write_lines(lines)
 
 
 def demo_task_coordinator_integration():
     """演示与任务协调器的集成"""
-    print("\n🎯 FastAPI后端Agent - 任务协调器集成示例")
-    print("=" * 50)
+    lines = []
+    lines.append("\n🎯 FastAPI后端Agent - 任务协调器集成示例")
+    lines.append(_EQ50)
     
-    print("\n🔹 使用任务协调器处理复杂需求")
-    print("-" * 30)
+    lines.append("\n🔹 使用任务协调器处理复杂需求")
+    lines.append(_DASH30)
     
     complex_request = """
     为电商系统实现商品管理功能：
@@ -240,53 +321,34 @@ def demo_task_coordinator_integration():
     5. 进行性能优化
     """
     
-    print(f"复杂需求:\n{complex_request}")
+    lines.append(f"复杂需求:\n{complex_request}")
     
-    print("\n🔹 任务分解结果")
-    print("-" * 30)
+    lines.append("\n🔹 任务分解结果")
+    lines.append(_DASH30)
     
-    decomposed_tasks = [
-        "📋 数据库设计任务 - 设计Product/Category/Inventory模型",
-        "🔧 API开发任务 - 实现商品CRUD接口",
-        "🔍 搜索功能任务 - 实现商品搜索和筛选",
-        "📖 文档生成任务 - 生成API文档",
-        "⚡ 性能优化任务 - 优化查询和响应速度"
-    ]
+    lines.extend(f"  {i}. {task}" for i, task in enumerate(_DECOMPOSED_TASKS, 1))
     
-    for i, task in enumerate(decomposed_tasks, 1):
-        print(f"  {i}. {task}")
+    lines.append("\n✅ 协调器优势:")
+    lines.append("- 自动任务分解和分配")
+    lines.append("- 多Agent协同工作") 
+    lines.append("- 智能依赖管理")
+    lines.append("- 进度跟踪监控")
     
-    print("\n✅ 协调器优势:")
-    print("- 自动任务分解和分配")
-    print("- 多Agent协同工作") 
-    print("- 智能依赖管理")
-    print("- 进度跟踪监控")
+    write_lines(lines)
 
 
 def demo_integration_examples():
     """演示集成使用示例"""
-    print("\n🎯 FastAPI后端Agent - 集成使用示例")
-    print("=" * 50)
-    
-    print("\n🔹 完整开发流程")
-    print("-" * 30)
-    workflow_steps = [
-        "1️⃣ 需求分析 → 数据库设计",
-        "2️⃣ 数据模型 → SQLAlchemy模型生成",
-        "3️⃣ 业务逻辑 → CRUD操作实现",
-        "4️⃣ API接口 → FastAPI路由生成",
-        "5️⃣ 数据验证 → Pydantic Schema",
-        "6️⃣ 权限控制 → JWT认证集成",
-        "7️⃣ 文档生成 → API文档输出",
-        "8️⃣ 性能优化 → 查询和缓存优化",
-        "9️⃣ 代码审查 → 质量检查和重构"
-    ]
-    
-    for step in workflow_steps:
-        print(f"  {step}")
-    
-    print("\n🔹 代码使用示例")
-    print("-" * 30)
+    lines = []
+    lines.append("\n🎯 FastAPI后端Agent - 集成使用示例")
+    lines.append(_EQ50)
+    
+    lines.append("\n🔹 完整开发流程")
+    lines.append(_DASH30)
+    lines.extend(f"  {step}" for step in _WORKFLOW_STEPS)
+    
+    lines.append("\n🔹 代码使用示例")
+    lines.append(_DASH30)
     code_example = '''
 # 使用FastAPI Agent的简化示例
 
@@ -323,13 +385,44 @@ schema_design = design_database(
 )
 '''
     
-    print(code_example)
+    lines.append(code_example)
+    
+    write_lines(lines)
+
+
+# 默认演示序列，main 与交互模式的 all 选项共用
+_ALL_DEMOS = (
+    demo_basic_fastapi_operations,
+    demo_database_design,
+    demo_authentication_system,
+    demo_performance_optimization,
+    demo_code_review,
+    demo_task_coordinator_integration,
+    demo_integration_examples,
+)
+
+
+def _run_all_demos():
+    """依次运行全部演示"""
+    for demo in _ALL_DEMOS:
+        demo()
+
+
+# 交互式演示的选项分发表：编号和名称都映射到对应演示
+_DISPATCH = {
+    '1': demo_basic_fastapi_operations, 'resource': demo_basic_fastapi_operations,
+    '2': demo_database_design, 'database': demo_database_design,
+    '3': demo_authentication_system, 'auth': demo_authentication_system,
+    '4': demo_performance_optimization, 'performance': demo_performance_optimization,
+    '5': demo_code_review, 'review': demo_code_review,
+    '6': demo_task_coordinator_integration, 'coordinator': demo_task_coordinator_integration,
+    '7': _run_all_demos, 'all': _run_all_demos,
+}
 
 
 def interactive_demo():
     """交互式演示"""
-    print("\n🎯 FastAPI后端Agent - 交互式演示")
-    print("=" * 50)
+    write_banner(_BANNER_INTERACTIVE)
     print("选择要演示的功能：")
     print("1. 创建资源 (resource)")
     print("2. 数据库设计 (database)")
@@ -339,65 +432,39 @@ def interactive_demo():
     print("6. 任务协调器 (coordinator)")
     print("7. 所有演示 (all)")
     print("输入 'quit' 退出")
-    print("-" * 50)
+    print(_DASH50)
     
-    while True:
-        try:
-            choice = input("\n👤 请选择功能 (1-7 或 all): ").strip().lower()
+    # 中断处理放在循环外，循环内只保护演示调用本身
+    try:
+        while True:
+            choice = read_line("\n👤 请选择功能 (1-7 或 all): ").strip().lower()
             
             if choice in ['quit', 'exit', 'q']:
                 print("👋 演示结束！")
                 break
-            elif choice in ['1', 'resource']:
-                demo_basic_fastapi_operations()
-            elif choice in ['2', 'database']:
-                demo_database_design()
-            elif choice in ['3', 'auth']:
-                demo_authentication_system()
-            elif choice in ['4', 'performance']:
-                demo_performance_optimization()
-            elif choice in ['5', 'review']:
-                demo_code_review()
-            elif choice in ['6', 'coordinator']:
-                demo_task_coordinator_integration()
-            elif choice in ['7', 'all']:
-                demo_basic_fastapi_operations()
-                demo_database_design()
-                demo_authentication_system()
-                demo_performance_optimization()
-                demo_code_review()
-                demo_task_coordinator_integration()
-                demo_integration_examples()
-            else:
+            
+            handler = _DISPATCH.get(choice)
+            if not handler:
                 print("❌ 无效选择，请输入 1-7 或 all")
-                
-        except KeyboardInterrupt:
-            print("\n👋 演示中断！")
-            break
-        except Exception as e:
-            print(f"❌ 演示错误: {e}")
+                continue
+            try:
+                handler()
+            except Exception as e:
+                print(f"❌ 演示错误: {e}")
+    except (KeyboardInterrupt, EOFError):
+        print("\n👋 演示中断！")
 
 
 def main():
     """主函数"""
-    print("🚀 FastAPIBackendAgent 使用示例")
-    print("=" * 60)
-    print("FastAPI后端开发专家Agent演示")
-    print("包含完整的后端开发工作流示例")
-    print("=" * 60)
+    write_banner(_BANNER_MAIN)
     
     try:
         # 运行默认演示
-        demo_basic_fastapi_operations()
-        demo_database_design()
-        demo_authentication_system()
-        demo_performance_optimization()
-        demo_code_review()
-        demo_task_coordinator_integration()
-        demo_integration_examples()
+        _run_all_demos()
         
         # 询问是否进入交互模式
-        print("\n" + "=" * 60)
+        print("\n" + _EQ60)
         choice = input("是否进入交互式演示？(y/N): ").strip().lower()
         if choice in ['y', 'yes']:
             interactive_demo()
@@ -413,8 +480,7 @@ def main():
         
     except Exception as e:
         print(f"\n❌ 演示过程中出现错误: {e}")
-        import traceback
-        traceback.print_exc()
+        print_tb()
 
 
 if __name__ == "__main__":
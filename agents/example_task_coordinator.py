@@ -2,34 +2,56 @@
 """
 任务协调Agent使用示例
 演示如何使用TaskCoordinatorAgent进行智能任务管理
+
+在项目根目录运行: python -m agents.example_task_coordinator
 """
 
-import sys
-import os
-from pathlib import Path
+import asyncio
+import functools
+import time
+from itertools import islice
+
+from ._demo_io import print_tb, read_line, write_banner, write_lines
+
+# task_coordinator 会连带加载 CrewAI 等重量级依赖，延迟到演示函数内导入
+
+# 演示输出使用的分隔线
+_EQ50 = "=" * 50
+_EQ60 = "=" * 60
+_DASH30 = "-" * 30
+_DASH40 = "-" * 40
+_DASH50 = "-" * 50
+
+# 静态横幅预先编码为UTF-8字节，输出时无需再次编码
+_BANNER_MAIN = f"🚀 TaskCoordinatorAgent 使用示例\n{_EQ60}\n".encode("utf-8")
+_BANNER_BASIC = f"🎯 任务协调Agent - 基础使用示例\n{_EQ50}\n".encode("utf-8")
+_BANNER_MANUAL = f"\n🎯 任务协调Agent - 手动任务管理示例\n{_EQ50}\n".encode("utf-8")
+_BANNER_WORKFLOW = f"\n🎯 任务协调Agent - 复杂工作流示例\n{_EQ50}\n".encode("utf-8")
+_BANNER_INTERACTIVE = f"\n🎯 任务协调Agent - 交互式演示\n{_EQ50}\n".encode("utf-8")
+
 
-# 添加agents目录到Python路径
-sys.path.append(str(Path(__file__).parent))
+def _preview(s, n=200):
+    """截取预览文本，短文本直接返回不做切片"""
+    return s if len(s) <= n else s[:n]
 
-from task_coordinator import (
-    task_coordinator, 
-    handle_request, 
-    get_system_status,
-    TaskType,
-    TaskPriority,
-    create_manual_task,
-    execute_task_by_id
-)
+
+@functools.lru_cache(maxsize=1)
+def _cached_status(bucket):
+    """按秒分桶缓存系统状态，连续查询时避免重复遍历全部任务"""
+    from .task_coordinator import get_system_status
+    
+    return get_system_status()
 
 
 def demo_basic_usage():
     """演示基础使用方法"""
-    print("🎯 任务协调Agent - 基础使用示例")
-    print("=" * 50)
+    from .task_coordinator import get_system_status, handle_request
+    
+    write_banner(_BANNER_BASIC)
     
     # 1. 系统状态检查
     print("\n🔹 1. 系统状态检查")
-    print("-" * 30)
+    print(_DASH30)
     status = get_system_status()
     print(f"总任务数: {status['total_tasks']}")
     print(f"队列长度: {status['queue_length']}")
@@ -37,7 +59,7 @@ def demo_basic_usage():
     
     # 2. 处理用户请求
     print("\n🔹 2. 处理用户请求")
-    print("-" * 30)
+    print(_DASH30)
     user_request = "为用户管理模块生成API文档和代码分析报告"
     result = handle_request(user_request, auto_execute=True)
     
@@ -55,12 +77,19 @@ def demo_basic_usage():
 
 def demo_manual_task_creation():
     """演示手动任务创建和管理"""
-    print("\n🎯 任务协调Agent - 手动任务管理示例")
-    print("=" * 50)
+    from .task_coordinator import (
+        task_coordinator,
+        TaskType,
+        TaskPriority,
+        create_manual_task,
+        execute_task_by_id
+    )
+    
+    write_banner(_BANNER_MANUAL)
     
     # 1. 创建文档生成任务
     print("\n🔹 1. 创建文档生成任务")
-    print("-" * 30)
+    print(_DASH30)
     doc_task_id = create_manual_task(
         title="生成权限中间件API文档",
         description="为backend/middleware/permission.py生成详细的API文档",
@@ -71,7 +100,7 @@ def demo_manual_task_creation():
     
     # 2. 创建代码分析任务
     print("\n🔹 2. 创建代码分析任务")
-    print("-" * 30)
+    print(_DASH30)
     analysis_task_id = create_manual_task(
         title="用户模型代码分析",
         description="分析backend/models/user.py的代码质量和结构",
@@ -82,39 +111,44 @@ def demo_manual_task_creation():
     
     # 3. 执行任务
     print("\n🔹 3. 执行任务")
-    print("-" * 30)
+    print(_DASH30)
     
-    # 执行文档任务
+    # 两个任务互不依赖，并发执行
     print("执行文档生成任务...")
-    doc_success = execute_task_by_id(doc_task_id)
-    print(f"文档任务执行: {'✅ 成功' if doc_success else '❌ 失败'}")
-    
-    # 执行分析任务
     print("执行代码分析任务...")
-    analysis_success = execute_task_by_id(analysis_task_id)
+    
+    async def execute_both():
+        return await asyncio.gather(
+            asyncio.to_thread(execute_task_by_id, doc_task_id),
+            asyncio.to_thread(execute_task_by_id, analysis_task_id)
+        )
+    
+    doc_success, analysis_success = asyncio.run(execute_both())
+    print(f"文档任务执行: {'✅ 成功' if doc_success else '❌ 失败'}")
     print(f"分析任务执行: {'✅ 成功' if analysis_success else '❌ 失败'}")
     
     # 4. 查看任务结果
     print("\n🔹 4. 查看任务结果")
-    print("-" * 30)
+    print(_DASH30)
     
     if doc_success:
         doc_task = task_coordinator.tasks[doc_task_id]
         print(f"文档任务状态: {doc_task.status.value}")
         if doc_task.result:
-            print(f"文档结果预览: {doc_task.result[:200]}...")
+            print(f"文档结果预览: {_preview(doc_task.result)}...")
     
     if analysis_success:
         analysis_task = task_coordinator.tasks[analysis_task_id]
         print(f"分析任务状态: {analysis_task.status.value}")
         if analysis_task.result:
-            print(f"分析结果预览: {analysis_task.result[:200]}...")
+            print(f"分析结果预览: {_preview(analysis_task.result)}...")
 
 
 def demo_complex_workflow():
     """演示复杂工作流处理"""
-    print("\n🎯 任务协调Agent - 复杂工作流示例")
-    print("=" * 50)
+    from .task_coordinator import handle_request
+    
+    write_banner(_BANNER_WORKFLOW)
     
     # 模拟复杂的开发需求
     complex_request = """
@@ -130,7 +164,7 @@ def demo_complex_workflow():
     
     # 处理复杂请求
     print("\n🔹 处理复杂工作流...")
-    print("-" * 40)
+    print(_DASH40)
     
     result = handle_request(complex_request, auto_execute=True)
     
@@ -148,90 +182,100 @@ def demo_complex_workflow():
         # 显示任务详情
         if exec_results['details']:
             print(f"  - 任务详情:")
-            for detail in exec_results['details'][:3]:  # 只显示前3个
-                print(f"    * {detail['title'][:40]}... - {detail['status']}")
+            for detail in islice(exec_results['details'], 3):  # 只显示前3个
+                print(f"    * {_preview(detail['title'], 40)}... - {detail['status']}")
 
 
 def demo_system_monitoring():
     """演示系统监控功能"""
-    print("\n🎯 任务协调Agent - 系统监控示例")
-    print("=" * 50)
+    lines = []
+    lines.append("\n🎯 任务协调Agent - 系统监控示例")
+    lines.append(_EQ50)
     
     # 获取详细状态报告
-    status_report = get_system_status()
+    status_report = _cached_status(int(time.monotonic()))
     
-    print("\n🔹 系统状态详情")
-    print("-" * 30)
-    print(f"报告时间: {status_report['timestamp']}")
-    print(f"任务统计:")
+    lines.append("\n🔹 系统状态详情")
+    lines.append(_DASH30)
+    lines.append(f"报告时间: {status_report['timestamp']}")
+    lines.append(f"任务统计:")
     for status, count in status_report['task_status'].items():
-        print(f"  - {status}: {count}")
+        lines.append(f"  - {status}: {count}")
     
-    print(f"\nAgent状态:")
+    lines.append(f"\nAgent状态:")
     for agent_name, agent_status in status_report['agent_status'].items():
-        utilization = agent_status['utilization'] * 100
-        print(f"  - {agent_name}:")
-        print(f"    * 可用: {'✅' if agent_status['available'] else '❌'}")
-        print(f"    * 利用率: {utilization:.1f}%")
-        print(f"    * 当前任务: {agent_status['current_tasks']}/{agent_status['max_tasks']}")
+        lines.append(f"  - {agent_name}:")
+        lines.append(f"    * 可用: {'✅' if agent_status['available'] else '❌'}")
+        lines.append(f"    * 利用率: {agent_status['utilization']:.1%}")
+        lines.append(f"    * 当前任务: {agent_status['current_tasks']}/{agent_status['max_tasks']}")
     
-    print(f"\n系统健康:")
+    lines.append(f"\n系统健康:")
     health = status_report['system_health']
-    print(f"  - 状态: {health['status']}")
+    lines.append(f"  - 状态: {health['status']}")
     if 'details' in health:
         # 只显示健康检查的关键信息
-        health_lines = health['details'].split('\n')[:5]
+        health_lines = health['details'].split('\n', 5)[:5]
         for line in health_lines:
             if line.strip():
-                print(f"    {line.strip()}")
+                lines.append(f"    {line.strip()}")
+    
+    write_lines(lines)
+
+
+# 交互式演示中的内置命令，其余输入均作为需求交给Agent处理
+_DISPATCH = {
+    'status': demo_system_monitoring,
+}
 
 
 def interactive_demo():
     """交互式演示"""
-    print("\n🎯 任务协调Agent - 交互式演示")
-    print("=" * 50)
+    from .task_coordinator import handle_request
+    
+    write_banner(_BANNER_INTERACTIVE)
     print("输入您的需求，Agent将自动分解并执行任务")
     print("输入 'quit' 退出，输入 'status' 查看系统状态")
-    print("-" * 50)
+    print(_DASH50)
     
-    while True:
-        try:
-            user_input = input("\n👤 您的需求: ").strip()
+    # 中断处理放在循环外，循环内只保护请求处理本身
+    try:
+        while True:
+            user_input = read_line("\n👤 您的需求: ").strip()
             
             if user_input.lower() in ['quit', 'exit', 'q']:
                 print("👋 再见！")
                 break
-            elif user_input.lower() == 'status':
-                demo_system_monitoring()
-            elif user_input:
-                print(f"\n🤖 处理中...")
-                result = handle_request(user_input, auto_execute=True)
+            
+            try:
+                command = _DISPATCH.get(user_input.lower())
+                if command:
+                    command()
+                elif user_input:
+                    print(f"\n🤖 处理中...")
+                    result = handle_request(user_input, auto_execute=True)
                 
-                print(f"✅ 处理完成:")
-                print(f"  - 创建任务: {result['created_tasks']}")
+                    print(f"✅ 处理完成:")
+                    print(f"  - 创建任务: {result['created_tasks']}")
                 
-                if 'execution_results' in result:
-                    exec_results = result['execution_results']
-                    print(f"  - 执行结果: 完成{exec_results['completed']}, 失败{exec_results['failed']}")
+                    if 'execution_results' in result:
+                        exec_results = result['execution_results']
+                        print(f"  - 执行结果: 完成{exec_results['completed']}, 失败{exec_results['failed']}")
                     
-                    # 显示部分结果
-                    for detail in exec_results['details'][:2]:
-                        if detail['result']:
-                            print(f"  - {detail['title']}: {detail['result'][:100]}...")
-            else:
-                print("请输入有效的需求")
-                
-        except KeyboardInterrupt:
-            print("\n👋 用户中断，再见！")
-            break
-        except Exception as e:
-            print(f"❌ 处理错误: {e}")
+                        # 显示部分结果
+                        for detail in islice(exec_results['details'], 2):
+                            if detail['result']:
+                                print(f"  - {detail['title']}: {_preview(detail['result'], 100)}...")
+                else:
+                    print("请输入有效的需求")
+            except Exception as e:
+                print(f"❌ 处理错误: {e}")
+    except (KeyboardInterrupt, EOFError):
+        print("\n👋 用户中断，再见！")
 
 
 def main():
     """主函数"""
-    print("🚀 TaskCoordinatorAgent 使用示例")
-    print("=" * 60)
+    write_banner(_BANNER_MAIN)
     
     # 运行所有演示
     try:
@@ -241,7 +285,7 @@ def main():
         demo_system_monitoring()
         
         # 询问是否进入交互模式
-        print("\n" + "=" * 60)
+        print("\n" + _EQ60)
         choice = input("是否进入交互式演示？(y/N): ").strip().lower()
         if choice in ['y', 'yes']:
             interactive_demo()
@@ -250,13 +294,13 @@ def main():
         print("\n👋 演示中断")
     except Exception as e:
         print(f"\n❌ 演示过程中出现错误: {e}")
-        import traceback
-        traceback.print_exc()
+        print_tb()
     
     finally:
         # 显示最终状态
         print("\n🔹 最终系统状态")
-        print("-" * 30)
+        print(_DASH30)
+        from .task_coordinator import get_system_status
         final_status = get_system_status()
         print(f"总任务数: {final_status['total_tasks']}")
         print(f"完成任务: {final_status['completed_tasks']}")
@@ -11,14 +11,21 @@ from pathlib import Path
 # 添加agents目录到Python路径
 sys.path.append(str(Path(__file__).parent))
 
+# 演示输出使用的分隔线
+_EQ50 = "=" * 50
+_EQ60 = "=" * 60
+_DASH40 = "-" * 40
+_DASH50 = "-" * 50
 
-def demo_unit_test_generation():
-    """演示单元测试生成功能"""
-    print("🧪 测试Agent - 单元测试生成示例")
-    print("=" * 50)
+
+def _unit_test_generation_lines():
+    """单元测试生成功能示例的输出行"""
+    lines = []
+    lines.append("🧪 测试Agent - 单元测试生成示例")
+    lines.append(_EQ50)
     
-    print("\n🔹 1. 自动分析源代码并生成单元测试")
-    print("-" * 40)
+    lines.append("\n🔹 1. 自动分析源代码并生成单元测试")
+    lines.append(_DASH40)
     
     # 示例配置
     test_config = {
@@ -29,18 +36,18 @@ def demo_unit_test_generation():
         'test_coverage': 'comprehensive'
     }
     
-    print(f"源文件: {test_config['source_file']}")
-    print(f"目标类: {test_config['target_class']}")
-    print(f"测试类型: {test_config['test_type']}")
-    print(f"包含Mock: {test_config['include_mocks']}")
-    print(f"覆盖级别: {test_config['test_coverage']}")
+    lines.append(f"源文件: {test_config['source_file']}")
+    lines.append(f"目标类: {test_config['target_class']}")
+    lines.append(f"测试类型: {test_config['test_type']}")
+    lines.append(f"包含Mock: {test_config['include_mocks']}")
+    lines.append(f"覆盖级别: {test_config['test_coverage']}")
     
-    print("\n✅ 将生成以下测试内容:")
-    print("- TestUserCRUD 测试类")
-    print("- pytest fixtures和Mock对象")
-    print("- 完整的CRUD方法测试用例")
-    print("- 边界值和异常情况测试")
-    print("- 业务逻辑验证测试")
+    lines.append("\n✅ 将生成以下测试内容:")
+    lines.append("- TestUserCRUD 测试类")
+    lines.append("- pytest fixtures和Mock对象")
+    lines.append("- 完整的CRUD方法测试用例")
+    lines.append("- 边界值和异常情况测试")
+    lines.append("- 业务逻辑验证测试")
     
     expected_tests = [
         "test_get_user_by_id_exists",
@@ -52,18 +59,21 @@ def demo_unit_test_generation():
         "test_get_users_pagination"
     ]
     
-    print("\n📋 预期测试方法:")
+    lines.append("\n📋 预期测试方法:")
     for test in expected_tests:
-        print(f"  - {test}()")
+        lines.append(f"  - {test}()")
+    
+    return lines
 
 
-def demo_api_test_generation():
-    """演示API测试生成功能"""
-    print("\n🌐 测试Agent - API测试生成示例")
-    print("=" * 50)
+def _api_test_generation_lines():
+    """API测试生成功能示例的输出行"""
+    lines = []
+    lines.append("\n🌐 测试Agent - API测试生成示例")
+    lines.append(_EQ50)
     
-    print("\n🔹 1. FastAPI路由测试生成")
-    print("-" * 40)
+    lines.append("\n🔹 1. FastAPI路由测试生成")
+    lines.append(_DASH40)
     
     # API端点配置
     api_endpoints = [
@@ -76,9 +86,9 @@ def demo_api_test_generation():
         "/api/v1/employees"
     ]
     
-    print("目标API端点:")
+    lines.append("目标API端点:")
     for endpoint in api_endpoints:
-        print(f"  - {endpoint}")
+        lines.append(f"  - {endpoint}")
     
     test_features = {
         "认证测试": ["JWT令牌验证", "权限检查", "令牌刷新"],
@@ -88,26 +98,29 @@ def demo_api_test_generation():
         "性能测试": ["响应时间", "并发请求", "负载测试"]
     }
     
-    print("\n🔍 测试功能范围:")
+    lines.append("\n🔍 测试功能范围:")
     for category, tests in test_features.items():
-        print(f"  {category}:")
+        lines.append(f"  {category}:")
         for test in tests:
-            print(f"    - {test}")
+            lines.append(f"    - {test}")
     
-    print("\n✅ 生成文件:")
-    print("- test_api_users.py - 用户API测试")
-    print("- test_api_auth.py - 认证API测试")
-    print("- test_api_departments.py - 部门API测试")
-    print("- test_api_employees.py - 员工API测试")
+    lines.append("\n✅ 生成文件:")
+    lines.append("- test_api_users.py - 用户API测试")
+    lines.append("- test_api_auth.py - 认证API测试")
+    lines.append("- test_api_departments.py - 部门API测试")
+    lines.append("- test_api_employees.py - 员工API测试")
+    
+    return lines
 
 
-def demo_performance_test_generation():
-    """演示性能测试生成功能"""
-    print("\n⚡ 测试Agent - 性能测试生成示例")
-    print("=" * 50)
+def _performance_test_generation_lines():
+    """性能测试生成功能示例的输出行"""
+    lines = []
+    lines.append("\n⚡ 测试Agent - 性能测试生成示例")
+    lines.append(_EQ50)
     
-    print("\n🔹 1. Locust性能测试脚本生成")
-    print("-" * 40)
+    lines.append("\n🔹 1. Locust性能测试脚本生成")
+    lines.append(_DASH40)
     
     # 性能测试配置
     performance_config = {
@@ -118,9 +131,9 @@ def demo_performance_test_generation():
         'spawn_rate': 10
     }
     
-    print("性能测试配置:")
+    lines.append("性能测试配置:")
     for key, value in performance_config.items():
-        print(f"  {key}: {value}")
+        lines.append(f"  {key}: {value}")
     
     test_scenarios = [
         "🔥 负载测试 - 模拟正常业务负载",
@@ -130,9 +143,9 @@ def demo_performance_test_generation():
         "📈 容量规划 - 系统扩展性评估"
     ]
     
-    print("\n📊 测试场景:")
+    lines.append("\n📊 测试场景:")
     for scenario in test_scenarios:
-        print(f"  {scenario}")
+        lines.append(f"  {scenario}")
     
     performance_metrics = {
         "响应时间": "< 200ms (95th percentile)",
@@ -143,18 +156,21 @@ def demo_performance_test_generation():
         "内存使用": "< 80%"
     }
     
-    print("\n🎯 性能指标:")
+    lines.append("\n🎯 性能指标:")
     for metric, target in performance_metrics.items():
-        print(f"  {metric}: {target}")
+        lines.append(f"  {metric}: {target}")
+    
+    return lines
 
 
-def demo_test_data_generation():
-    """演示测试数据生成功能"""
-    print("\n📊 测试Agent - 测试数据生成示例")
-    print("=" * 50)
+def _test_data_generation_lines():
+    """测试数据生成功能示例的输出行"""
+    lines = []
+    lines.append("\n📊 测试Agent - 测试数据生成示例")
+    lines.append(_EQ50)
     
-    print("\n🔹 1. Mock数据和Factory类生成")
-    print("-" * 40)
+    lines.append("\n🔹 1. Mock数据和Factory类生成")
+    lines.append(_DASH40)
     
     # 数据模型
     data_models = [
@@ -162,9 +178,9 @@ def demo_test_data_generation():
         "Role", "Permission", "SystemLog"
     ]
     
-    print("数据模型:")
+    lines.append("数据模型:")
     for model in data_models:
-        print(f"  - {model}")
+        lines.append(f"  - {model}")
     
     data_generation_types = {
         "Factory类": [
@@ -184,13 +200,13 @@ def demo_test_data_generation():
         ]
     }
     
-    print("\n🏭 数据生成类型:")
+    lines.append("\n🏭 数据生成类型:")
     for category, items in data_generation_types.items():
-        print(f"  {category}:")
+        lines.append(f"  {category}:")
         for item in items:
-            print(f"    - {item}")
+            lines.append(f"    - {item}")
     
-    print("\n🔐 隐私保护特性:")
+    lines.append("\n🔐 隐私保护特性:")
     privacy_features = [
         "数据脱敏 - 敏感信息替换",
         "随机生成 - Faker库生成逼真数据",
@@ -200,16 +216,19 @@ def demo_test_data_generation():
     ]
     
     for feature in privacy_features:
-        print(f"  - {feature}")
+        lines.append(f"  - {feature}")
+    
+    return lines
 
 
-def demo_frontend_test_generation():
-    """演示前端测试生成功能"""
-    print("\n🎨 测试Agent - 前端测试生成示例")
-    print("=" * 50)
+def _frontend_test_generation_lines():
+    """前端测试生成功能示例的输出行"""
+    lines = []
+    lines.append("\n🎨 测试Agent - 前端测试生成示例")
+    lines.append(_EQ50)
     
-    print("\n🔹 1. Vue.js组件测试生成")
-    print("-" * 40)
+    lines.append("\n🔹 1. Vue.js组件测试生成")
+    lines.append(_DASH40)
     
     # Vue组件
     vue_components = [
@@ -218,9 +237,9 @@ def demo_frontend_test_generation():
         "Dashboard.vue", "NavigationMenu.vue"
     ]
     
-    print("目标Vue组件:")
+    lines.append("目标Vue组件:")
     for component in vue_components:
-        print(f"  - {component}")
+        lines.append(f"  - {component}")
     
     frontend_test_types = {
         "单元测试 (Jest)": [
@@ -246,13 +265,13 @@ def demo_frontend_test_generation():
         ]
     }
     
-    print("\n🧪 前端测试类型:")
+    lines.append("\n🧪 前端测试类型:")
     for category, tests in frontend_test_types.items():
-        print(f"  {category}:")
+        lines.append(f"  {category}:")
         for test in tests:
-            print(f"    - {test}")
+            lines.append(f"    - {test}")
     
-    print("\n📱 测试覆盖范围:")
+    lines.append("\n📱 测试覆盖范围:")
     coverage_areas = [
         "✅ 组件渲染正确性",
         "🔄 数据响应性和双向绑定",
@@ -264,16 +283,19 @@ def demo_frontend_test_generation():
     ]
     
     for area in coverage_areas:
-        print(f"  {area}")
+        lines.append(f"  {area}")
+    
+    return lines
 
 
-def demo_comprehensive_test_suite():
-    """演示综合测试套件生成"""
-    print("\n🎯 测试Agent - 综合测试套件示例")
-    print("=" * 50)
+def _comprehensive_test_suite_lines():
+    """综合测试套件生成示例的输出行"""
+    lines = []
+    lines.append("\n🎯 测试Agent - 综合测试套件示例")
+    lines.append(_EQ50)
     
-    print("\n🔹 1. 用户管理模块完整测试套件")
-    print("-" * 40)
+    lines.append("\n🔹 1. 用户管理模块完整测试套件")
+    lines.append(_DASH40)
     
     module_info = {
         "目标模块": "用户管理系统",
@@ -288,14 +310,14 @@ def demo_comprehensive_test_suite():
         "覆盖级别": "comprehensive"
     }
     
-    print("模块信息:")
+    lines.append("模块信息:")
     for key, value in module_info.items():
         if isinstance(value, list):
-            print(f"  {key}:")
+            lines.append(f"  {key}:")
             for item in value:
-                print(f"    - {item}")
+                lines.append(f"    - {item}")
         else:
-            print(f"  {key}: {value}")
+            lines.append(f"  {key}: {value}")
     
     test_layers = {
         "🏗️ 数据层测试": [
@@ -330,13 +352,13 @@ def demo_comprehensive_test_suite():
         ]
     }
     
-    print("\n📋 测试分层架构:")
+    lines.append("\n📋 测试分层架构:")
     for layer, tests in test_layers.items():
-        print(f"  {layer}:")
+        lines.append(f"  {layer}:")
         for test in tests:
-            print(f"    - {test}")
+            lines.append(f"    - {test}")
     
-    print("\n📈 质量指标:")
+    lines.append("\n📈 质量指标:")
     quality_metrics = {
         "代码覆盖率": "> 85%",
         "分支覆盖率": "> 80%", 
@@ -346,16 +368,19 @@ def demo_comprehensive_test_suite():
     }
     
     for metric, target in quality_metrics.items():
-        print(f"  - {metric}: {target}")
+        lines.append(f"  - {metric}: {target}")
+    
+    return lines
 
 
-def demo_test_analysis_and_optimization():
-    """演示测试分析和优化功能"""
-    print("\n📊 测试Agent - 测试分析优化示例")  
-    print("=" * 50)
+def _test_analysis_and_optimization_lines():
+    """测试分析和优化功能示例的输出行"""
+    lines = []
+    lines.append("\n📊 测试Agent - 测试分析优化示例")  
+    lines.append(_EQ50)
     
-    print("\n🔹 1. 现有测试代码质量分析")
-    print("-" * 40)
+    lines.append("\n🔹 1. 现有测试代码质量分析")
+    lines.append(_DASH40)
     
     analysis_targets = [
         "backend/tests/unit/",
@@ -364,9 +389,9 @@ def demo_test_analysis_and_optimization():
         "frontend/tests/"
     ]
     
-    print("分析目标:")
+    lines.append("分析目标:")
     for target in analysis_targets:
-        print(f"  - {target}")
+        lines.append(f"  - {target}")
     
     analysis_dimensions = {
         "📊 覆盖率分析": [
@@ -395,11 +420,11 @@ def demo_test_analysis_and_optimization():
         ]
     }
     
-    print("\n🔍 分析维度:")
+    lines.append("\n🔍 分析维度:")
     for category, items in analysis_dimensions.items():
-        print(f"  {category}:")
+        lines.append(f"  {category}:")
         for item in items:
-            print(f"    - {item}")
+            lines.append(f"    - {item}")
     
     optimization_suggestions = [
         "🚀 提高覆盖率的具体方案和优先级",
@@ -410,18 +435,21 @@ def demo_test_analysis_and_optimization():
         "🔄 完善回归测试和CI/CD集成"
     ]
     
-    print("\n💡 优化建议:")
+    lines.append("\n💡 优化建议:")
     for suggestion in optimization_suggestions:
-        print(f"  {suggestion}")
+        lines.append(f"  {suggestion}")
+    
+    return lines
 
 
-def demo_ci_cd_integration():
-    """演示CI/CD集成功能"""
-    print("\n🔄 测试Agent - CI/CD集成示例")
-    print("=" * 50)
+def _ci_cd_integration_lines():
+    """CI/CD集成功能示例的输出行"""
+    lines = []
+    lines.append("\n🔄 测试Agent - CI/CD集成示例")
+    lines.append(_EQ50)
     
-    print("\n🔹 1. GitHub Actions测试流水线")
-    print("-" * 40)
+    lines.append("\n🔹 1. GitHub Actions测试流水线")
+    lines.append(_DASH40)
     
     ci_cd_features = {
         "🔧 自动化测试流程": [
@@ -450,11 +478,11 @@ def demo_ci_cd_integration():
         ]
     }
     
-    print("CI/CD集成功能:")
+    lines.append("CI/CD集成功能:")
     for category, features in ci_cd_features.items():
-        print(f"  {category}:")
+        lines.append(f"  {category}:")
         for feature in features:
-            print(f"    - {feature}")
+            lines.append(f"    - {feature}")
     
     pipeline_stages = [
         "1️⃣ 代码检出和环境准备",
@@ -469,15 +497,98 @@ def demo_ci_cd_integration():
         "🔟 通知和结果反馈"
     ]
     
-    print("\n🔄 流水线阶段:")
+    lines.append("\n🔄 流水线阶段:")
     for stage in pipeline_stages:
-        print(f"  {stage}")
+        lines.append(f"  {stage}")
+    
+    return lines
+
+
+# 以下演示的输出与输入无关，导入时渲染一次，之后每次演示只需一次写出
+_UNIT_TEST_BLOCK = "\n".join(_unit_test_generation_lines()) + "\n"
+_API_TEST_BLOCK = "\n".join(_api_test_generation_lines()) + "\n"
+_PERFORMANCE_TEST_BLOCK = "\n".join(_performance_test_generation_lines()) + "\n"
+_TEST_DATA_BLOCK = "\n".join(_test_data_generation_lines()) + "\n"
+_FRONTEND_TEST_BLOCK = "\n".join(_frontend_test_generation_lines()) + "\n"
+_COMPREHENSIVE_SUITE_BLOCK = "\n".join(_comprehensive_test_suite_lines()) + "\n"
+_TEST_ANALYSIS_BLOCK = "\n".join(_test_analysis_and_optimization_lines()) + "\n"
+_CI_CD_BLOCK = "\n".join(_ci_cd_integration_lines()) + "\n"
+# 默认演示序列的完整输出
+_ALL_DEMOS_BLOCK = "".join((
+    _UNIT_TEST_BLOCK,
+    _API_TEST_BLOCK,
+    _PERFORMANCE_TEST_BLOCK,
+    _TEST_DATA_BLOCK,
+    _FRONTEND_TEST_BLOCK,
+    _COMPREHENSIVE_SUITE_BLOCK,
+    _TEST_ANALYSIS_BLOCK,
+    _CI_CD_BLOCK,
+))
+
+
+def demo_unit_test_generation():
+    """演示单元测试生成功能"""
+    sys.stdout.write(_UNIT_TEST_BLOCK)
+
+
+def demo_api_test_generation():
+    """演示API测试生成功能"""
+    sys.stdout.write(_API_TEST_BLOCK)
+
+
+def demo_performance_test_generation():
+    """演示性能测试生成功能"""
+    sys.stdout.write(_PERFORMANCE_TEST_BLOCK)
+
+
+def demo_test_data_generation():
+    """演示测试数据生成功能"""
+    sys.stdout.write(_TEST_DATA_BLOCK)
+
+
+def demo_frontend_test_generation():
+    """演示前端测试生成功能"""
+    sys.stdout.write(_FRONTEND_TEST_BLOCK)
+
+
+def demo_comprehensive_test_suite():
+    """演示综合测试套件生成"""
+    sys.stdout.write(_COMPREHENSIVE_SUITE_BLOCK)
+
+
+def demo_test_analysis_and_optimization():
+    """演示测试分析和优化功能"""
+    sys.stdout.write(_TEST_ANALYSIS_BLOCK)
+
+
+def demo_ci_cd_integration():
+    """演示CI/CD集成功能"""
+    sys.stdout.write(_CI_CD_BLOCK)
+
+
+def _run_all_demos():
+    """运行全部演示（main 与交互模式的 all 选项共用），整段输出一次写出"""
+    sys.stdout.write(_ALL_DEMOS_BLOCK)
+
+
+# 交互式演示的选项分发表：编号和名称都映射到对应演示
+_DISPATCH = {
+    '1': demo_unit_test_generation, 'unit': demo_unit_test_generation,
+    '2': demo_api_test_generation, 'api': demo_api_test_generation,
+    '3': demo_performance_test_generation, 'performance': demo_performance_test_generation,
+    '4': demo_test_data_generation, 'data': demo_test_data_generation,
+    '5': demo_frontend_test_generation, 'frontend': demo_frontend_test_generation,
+    '6': demo_comprehensive_test_suite, 'comprehensive': demo_comprehensive_test_suite,
+    '7': demo_test_analysis_and_optimization, 'analysis': demo_test_analysis_and_optimization,
+    '8': demo_ci_cd_integration, 'cicd': demo_ci_cd_integration,
+    '9': _run_all_demos, 'all': _run_all_demos,
+}
 
 
 def interactive_demo():
     """交互式演示"""
     print("\n🎯 测试Agent - 交互式演示")
-    print("=" * 50)
+    print(_EQ50)
     print("选择要演示的测试功能：")
     print("1. 单元测试生成 (unit)")
     print("2. API测试生成 (api)")
@@ -489,7 +600,7 @@ def interactive_demo():
     print("8. CI/CD集成 (cicd)")
     print("9. 所有演示 (all)")
     print("输入 'quit' 退出")
-    print("-" * 50)
+    print(_DASH50)
     
     while True:
         try:
@@ -498,31 +609,10 @@ def interactive_demo():
             if choice in ['quit', 'exit', 'q']:
                 print("👋 演示结束！")
                 break
-            elif choice in ['1', 'unit']:
-                demo_unit_test_generation()
-            elif choice in ['2', 'api']:
-                demo_api_test_generation()
-            elif choice in ['3', 'performance']:
-                demo_performance_test_generation()
-            elif choice in ['4', 'data']:
-                demo_test_data_generation()
-            elif choice in ['5', 'frontend']:
-                demo_frontend_test_generation()
-            elif choice in ['6', 'comprehensive']:
-                demo_comprehensive_test_suite()
-            elif choice in ['7', 'analysis']:
-                demo_test_analysis_and_optimization()
-            elif choice in ['8', 'cicd']:
-                demo_ci_cd_integration()
-            elif choice in ['9', 'all']:
-                demo_unit_test_generation()
-                demo_api_test_generation()
-                demo_performance_test_generation()
-                demo_test_data_generation()
-                demo_frontend_test_generation()
-                demo_comprehensive_test_suite()
-                demo_test_analysis_and_optimization()
-                demo_ci_cd_integration()
+            
+            handler = _DISPATCH.get(choice)
+            if handler:
+                handler()
             else:
                 print("❌ 无效选择，请输入 1-9 或 all")
                 
@@ -536,24 +626,17 @@ def interactive_demo():
 def main():
     """主函数"""
     print("🧪 TestAgent 使用示例")
-    print("=" * 60)
+    print(_EQ60)
     print("质量保证和测试专家Agent演示")
     print("涵盖完整的测试生命周期和质量保证流程")
-    print("=" * 60)
+    print(_EQ60)
     
     try:
         # 运行默认演示
-        demo_unit_test_generation()
-        demo_api_test_generation()
-        demo_performance_test_generation()
-        demo_test_data_generation()
-        demo_frontend_test_generation()
-        demo_comprehensive_test_suite()
-        demo_test_analysis_and_optimization()
-        demo_ci_cd_integration()
+        _run_all_demos()
         
         # 询问是否进入交互模式
-        print("\n" + "=" * 60)
+        print("\n" + _EQ60)
         choice = input("是否进入交互式演示？(y/N): ").strip().lower()
         if choice in ['y', 'yes']:
             interactive_demo()
@@ -3,120 +3,41 @@ FastAPI后端开发专家Agent
 专门负责FastAPI应用开发、数据库设计、API构建等后端任务
 """
 
-from crewai import Agent, Task, Crew, Process
-from typing import Dict, List, Any, Optional
-from .fastapi_tools import (
-    APIGenerationTool,
-    ModelGenerationTool,
-    CRUDGenerationTool,
-    SchemaGenerationTool,
-    MigrationGenerationTool
-)
-from .tools import (
-    CodeAnalysisTool,
-    ProjectStructureTool,
-    HealthCheckTool
-)
+import functools
+import threading
+from typing import Dict, List, Any, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from crewai import Agent
+
+
+@functools.lru_cache(maxsize=1)
+def _get_fastapi_tools() -> tuple:
+    """获取FastAPI专用工具实例（进程内只创建一次）"""
+    from .fastapi_tools import (
+        APIGenerationTool,
+        ModelGenerationTool,
+        CRUDGenerationTool,
+        SchemaGenerationTool,
+        MigrationGenerationTool,
+        ResourceBundleTool
+    )
+    
+    return (
+        APIGenerationTool(),
+        ModelGenerationTool(),
+        CRUDGenerationTool(),
+        SchemaGenerationTool(),
+        MigrationGenerationTool(),
+        ResourceBundleTool()
+    )
 
 
 class FastAPIBackendAgent:
     """FastAPI后端开发专家Agent类"""
     
-    def __init__(self):
-        # FastAPI专用工具集
-        self.fastapi_tools = [
-            APIGenerationTool(),
-            ModelGenerationTool(),
-            CRUDGenerationTool(),
-            SchemaGenerationTool(),
-            MigrationGenerationTool()
-        ]
-        
-        # 通用开发工具
-        self.general_tools = [
-            CodeAnalysisTool(),
-            ProjectStructureTool(),
-            HealthCheckTool()
-        ]
-        
-        # 合并所有工具
-        self.tools = self.fastapi_tools + self.general_tools
-        
-        # 创建专家Agent
-        self.agent = self._create_agent()
-    
-    def _create_agent(self) -> Agent:
-        """创建FastAPI后端开发专家Agent"""
-        return Agent(
-            role='FastAPI Backend Development Expert',
-            goal='构建高质量、可扩展的FastAPI后端应用，包括API设计、数据库建模、权限控制和性能优化',
-            backstory="""
-            你是一位资深的FastAPI后端开发专家，拥有深厚的Python Web开发经验。
-            你的专业技能涵盖：
-            
-            🐍 **Python & FastAPI 专长**:
-            - FastAPI框架深度应用和最佳实践
-            - 异步编程和高性能API设计
-            - Pydantic数据验证和序列化
-            - SQLAlchemy ORM和数据库设计
-            - Alembic数据库迁移管理
-            
-            🏗️ **架构设计能力**:
-            - RESTful API设计规范
-            - 微服务架构和模块化设计
-            - 数据库Schema设计和优化
-            - 依赖注入和中间件开发
-            - 错误处理和异常管理
-            
-            🔐 **安全与认证**:
-            - JWT令牌认证机制
-            - RBAC权限控制系统
-            - 数据加密和安全最佳实践
-            - CORS和安全中间件配置
-            - OAuth2和第三方登录集成
-            
-            📊 **数据库专长**:
-            - PostgreSQL高级特性应用
-            - Redis缓存策略和实现
-            - 数据库查询优化
-            - 事务管理和数据一致性
-            - 数据库连接池和性能调优
-            
-            🚀 **DevOps与部署**:
-            - Docker容器化部署
-            - CI/CD流程设计
-            - 监控和日志管理
-            - API文档生成和维护
-            - 性能测试和负载优化
-            
-            💡 **开发理念**:
-            - 代码清洁度和可维护性
-            - 测试驱动开发(TDD)
-            - 敏捷开发和持续集成
-            - 文档驱动开发
-            - 安全第一的开发思维
-            
-            你的目标是帮助团队构建出高质量、可扩展、安全可靠的FastAPI后端系统。
-            """,
-            tools=self.tools,
-            verbose=True,
-            allow_delegation=False,
-            max_iter=5
-        )
-    
-    def create_complete_resource(
-        self, 
-        resource_name: str, 
-        fields: Dict[str, str],
-        include_auth: bool = True,
-        custom_endpoints: List[str] = []
-    ) -> Dict[str, str]:
-        """创建完整的资源（模型+CRUD+API+Schema）"""
-        
-        model_name = resource_name.title().rstrip('s')
-        table_name = resource_name.lower()
-        
-        task_description = f"""
+    # 各类任务的描述模板，类加载时构造一次，调用时只做变量替换
+    _RESOURCE_TEMPLATE = """
         为 {resource_name} 创建完整的FastAPI资源实现，包括：
         
         **资源信息**：
@@ -139,7 +60,7 @@ class FastAPIBackendAgent:
         - 包含完整的类型注解
         - 实现适当的错误处理
         - 添加详细的文档字符串
-        - {'集成JWT权限验证' if include_auth else '无需权限验证'}
+        - {auth_requirement}
         - 生成完整的API文档
         
         **代码质量标准**：
@@ -149,56 +70,18 @@ class FastAPIBackendAgent:
         - 实现数据验证
         - 错误信息友好
         """
-        
-        task = Task(
-            description=task_description,
-            agent=self.agent,
-            expected_output="完整的FastAPI资源实现，包含所有必要的文件和代码"
-        )
-        
-        crew = Crew(
-            agents=[self.agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        try:
-            result = crew.kickoff()
-            return {
-                'status': 'success',
-                'resource_name': resource_name,
-                'model_name': model_name,
-                'result': result
-            }
-        except Exception as e:
-            return {
-                'status': 'error',
-                'resource_name': resource_name,
-                'error': str(e)
-            }
-    
-    def implement_api_endpoint(
-        self, 
-        endpoint_path: str, 
-        method: str, 
-        description: str,
-        include_auth: bool = True,
-        request_schema: Optional[str] = None,
-        response_schema: Optional[str] = None
-    ) -> str:
-        """实现单个API端点"""
-        
-        task_description = f"""
-        实现FastAPI端点：{method.upper()} {endpoint_path}
+    _RESOURCE_OUTPUT = "完整的FastAPI资源实现，包含所有必要的文件和代码"
+
+    _ENDPOINT_TEMPLATE = """
+        实现FastAPI端点：{method} {endpoint_path}
         
         **端点需求**：
         - 路径: {endpoint_path}
-        - 方法: {method.upper()}
+        - 方法: {method}
         - 功能描述: {description}
-        - 权限验证: {'是' if include_auth else '否'}
-        - 请求Schema: {request_schema or '无'}
-        - 响应Schema: {response_schema or '标准响应'}
+        - 权限验证: {auth_required}
+        - 请求Schema: {request_schema}
+        - 响应Schema: {response_schema}
         
         **实现要求**：
         1. 编写完整的端点函数
@@ -206,7 +89,7 @@ class FastAPIBackendAgent:
         3. 实现请求数据验证
         4. 添加错误处理逻辑
         5. 编写详细的API文档
-        6. {'集成权限中间件' if include_auth else '无需权限验证'}
+        6. {auth_step}
         
         **代码标准**：
         - 遵循FastAPI规范
@@ -214,41 +97,19 @@ class FastAPIBackendAgent:
         - 实现适当的状态码
         - 返回标准JSON响应
         """
-        
-        task = Task(
-            description=task_description,
-            agent=self.agent,
-            expected_output="完整的FastAPI端点实现代码"
-        )
-        
-        crew = Crew(
-            agents=[self.agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        return crew.kickoff()
-    
-    def design_database_schema(
-        self, 
-        requirements: str,
-        tables: List[str] = [],
-        relationships: Dict[str, List[str]] = {}
-    ) -> str:
-        """设计数据库Schema"""
-        
-        task_description = f"""
+    _ENDPOINT_OUTPUT = "完整的FastAPI端点实现代码"
+
+    _DATABASE_TEMPLATE = """
         根据业务需求设计数据库Schema：
         
         **业务需求**：
         {requirements}
         
         **涉及数据表**：
-        {tables if tables else '待分析确定'}
+        {tables}
         
         **表关系**：
-        {relationships if relationships else '待设计'}
+        {relationships}
         
         **设计任务**：
         1. 🔍 分析业务需求
@@ -271,26 +132,9 @@ class FastAPIBackendAgent:
         - 数据库迁移脚本
         - 关系说明文档
         """
-        
-        task = Task(
-            description=task_description,
-            agent=self.agent,
-            expected_output="完整的数据库Schema设计方案"
-        )
-        
-        crew = Crew(
-            agents=[self.agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        return crew.kickoff()
-    
-    def optimize_api_performance(self, target_api: str) -> str:
-        """优化API性能"""
-        
-        task_description = f"""
+    _DATABASE_OUTPUT = "完整的数据库Schema设计方案"
+
+    _PERFORMANCE_TEMPLATE = """
         优化FastAPI应用性能，重点关注：{target_api}
         
         **性能优化目标**：
@@ -322,37 +166,15 @@ class FastAPIBackendAgent:
         4. 代码实施改进
         5. 效果验证测试
         """
-        
-        task = Task(
-            description=task_description,
-            agent=self.agent,
-            expected_output="详细的API性能优化方案和实施代码"
-        )
-        
-        crew = Crew(
-            agents=[self.agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        return crew.kickoff()
-    
-    def implement_authentication_system(
-        self, 
-        auth_type: str = "JWT",
-        include_rbac: bool = True,
-        oauth_providers: List[str] = []
-    ) -> str:
-        """实现认证系统"""
-        
-        task_description = f"""
+    _PERFORMANCE_OUTPUT = "详细的API性能优化方案和实施代码"
+
+    _AUTH_TEMPLATE = """
         实现FastAPI认证和权限系统：
         
         **认证配置**：
         - 认证类型: {auth_type}
-        - 包含RBAC: {'是' if include_rbac else '否'}
-        - OAuth提供商: {oauth_providers if oauth_providers else '无'}
+        - 包含RBAC: {include_rbac}
+        - OAuth提供商: {oauth_providers}
         
         **系统功能**：
         1. 🔐 用户注册和登录
@@ -383,30 +205,13 @@ class FastAPIBackendAgent:
         - 提供权限验证装饰器
         - 实现登录登出API
         """
-        
-        task = Task(
-            description=task_description,
-            agent=self.agent,
-            expected_output="完整的认证和权限系统实现"
-        )
-        
-        crew = Crew(
-            agents=[self.agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        return crew.kickoff()
-    
-    def code_review_and_refactor(self, target_files: List[str]) -> str:
-        """代码审查和重构"""
-        
-        task_description = f"""
+    _AUTH_OUTPUT = "完整的认证和权限系统实现"
+
+    _REVIEW_TEMPLATE = """
         对FastAPI代码进行专业审查和重构：
         
         **审查文件**：
-        {chr(10).join(f'- {file}' for file in target_files)}
+        {file_list}
         
         **审查维度**：
         1. 🔍 代码质量检查
@@ -438,26 +243,9 @@ class FastAPIBackendAgent:
         - 重构代码示例
         - 最佳实践推荐
         """
-        
-        task = Task(
-            description=task_description,
-            agent=self.agent,
-            expected_output="详细的代码审查报告和重构建议"
-        )
-        
-        crew = Crew(
-            agents=[self.agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        return crew.kickoff()
-    
-    def health_check(self) -> str:
-        """检查Agent健康状态"""
-        task = Task(
-            description="""
+    _REVIEW_OUTPUT = "详细的代码审查报告和重构建议"
+
+    _HEALTH_CHECK_TEMPLATE = """
             检查FastAPI后端开发环境和工具状态：
             
             **检查项目**：
@@ -479,23 +267,251 @@ class FastAPIBackendAgent:
             - 虚拟环境状态
             - 依赖包完整性
             - 数据库访问权限
-            """,
-            agent=self.agent,
-            expected_output="FastAPI开发环境健康检查报告"
-        )
+            """
+    _HEALTH_CHECK_OUTPUT = "FastAPI开发环境健康检查报告"
+    
+    def __init__(self):
+        # 延迟导入crewai及工具模块，避免导入本模块时加载整个依赖栈
+        from crewai import Crew, Process
+        from .tools import get_shared_tools
+        
+        # FastAPI专用工具 + 通用开发工具；工具实例无状态，多个Agent实例共享同一组
+        _, code_tool, structure_tool, health_tool = get_shared_tools()
+        self.tools = (*_get_fastapi_tools(), code_tool, structure_tool, health_tool)
         
-        crew = Crew(
+        # 创建专家Agent
+        self.agent = self._create_agent()
+        
+        # 复用同一个Crew，每次调用只替换任务，避免重复构建和校验
+        self._crew = Crew(
             agents=[self.agent],
-            tasks=[task],
+            tasks=[],
             process=Process.sequential,
             verbose=True
         )
+        self._crew_lock = threading.Lock()
+    
+    def _create_agent(self) -> "Agent":
+        """创建FastAPI后端开发专家Agent"""
+        from crewai import Agent
+        
+        return Agent(
+            role='FastAPI Backend Development Expert',
+            goal='构建高质量、可扩展的FastAPI后端应用，包括API设计、数据库建模、权限控制和性能优化',
+            backstory="""
+            你是一位资深的FastAPI后端开发专家，拥有深厚的Python Web开发经验。
+            你的专业技能涵盖：
+            
+            🐍 **Python & FastAPI 专长**:
+            - FastAPI框架深度应用和最佳实践
+            - 异步编程和高性能API设计
+            - Pydantic数据验证和序列化
+            - SQLAlchemy ORM和数据库设计
+            - Alembic数据库迁移管理
+            
+            🏗️ **架构设计能力**:
+            - RESTful API设计规范
+            - 微服务架构和模块化设计
+            - 数据库Schema设计和优化
+            - 依赖注入和中间件开发
+            - 错误处理和异常管理
+            
+            🔐 **安全与认证**:
+            - JWT令牌认证机制
+            - RBAC权限控制系统
+            - 数据加密和安全最佳实践
+            - CORS和安全中间件配置
+            - OAuth2和第三方登录集成
+            
+            📊 **数据库专长**:
+            - PostgreSQL高级特性应用
+            - Redis缓存策略和实现
+            - 数据库查询优化
+            - 事务管理和数据一致性
+            - 数据库连接池和性能调优
+            
+            🚀 **DevOps与部署**:
+            - Docker容器化部署
+            - CI/CD流程设计
+            - 监控和日志管理
+            - API文档生成和维护
+            - 性能测试和负载优化
+            
+            💡 **开发理念**:
+            - 代码清洁度和可维护性
+            - 测试驱动开发(TDD)
+            - 敏捷开发和持续集成
+            - 文档驱动开发
+            - 安全第一的开发思维
+            
+            你的目标是帮助团队构建出高质量、可扩展、安全可靠的FastAPI后端系统。
+            """,
+            tools=self.tools,
+            verbose=True,
+            allow_delegation=False,
+            max_iter=5
+        )
+    
+    def _run(self, template: str, expected_output: str, **params) -> str:
+        """根据描述模板创建任务，并在复用的Crew上执行"""
+        from crewai import Task
+        
+        task = Task(
+            description=template.format(**params) if params else template,
+            agent=self.agent,
+            expected_output=expected_output
+        )
+        with self._crew_lock:
+            self._crew.tasks = [task]
+            return self._crew.kickoff()
+    
+    def run_batch(self, specs: List[Tuple[str, str]]) -> List[Any]:
+        """批量执行 (任务描述, 期望输出) 列表，在同一Crew上通过 kickoff_for_each 依次完成"""
+        from crewai import Task
+        
+        if not specs:
+            return []
+        # 描述与期望输出作为输入变量注入，所有请求共用同一个任务定义
+        task = Task(
+            description="{description}",
+            agent=self.agent,
+            expected_output="{expected_output}"
+        )
+        inputs = [{"description": description, "expected_output": expected_output} for description, expected_output in specs]
+        with self._crew_lock:
+            self._crew.tasks = [task]
+            return self._crew.kickoff_for_each(inputs=inputs)
+    
+    def create_complete_resource(
+        self, 
+        resource_name: str, 
+        fields: Dict[str, str],
+        include_auth: bool = True,
+        custom_endpoints: Optional[List[str]] = None
+    ) -> Dict[str, str]:
+        """创建完整的资源（模型+CRUD+API+Schema）"""
+        # 提示词中原样展示该参数，保持空列表的呈现
+        custom_endpoints = custom_endpoints or []
+        
+        model_name = resource_name.title().rstrip('s')
+        table_name = resource_name.lower()
+        
+        try:
+            result = self._run(
+                self._RESOURCE_TEMPLATE,
+                self._RESOURCE_OUTPUT,
+                resource_name=resource_name,
+                model_name=model_name,
+                table_name=table_name,
+                fields=fields,
+                include_auth=include_auth,
+                custom_endpoints=custom_endpoints,
+                auth_requirement='集成JWT权限验证' if include_auth else '无需权限验证'
+            )
+            return {
+                'status': 'success',
+                'resource_name': resource_name,
+                'model_name': model_name,
+                'result': result
+            }
+        except Exception as e:
+            return {
+                'status': 'error',
+                'resource_name': resource_name,
+                'error': str(e)
+            }
+    
+    def implement_api_endpoint(
+        self, 
+        endpoint_path: str, 
+        method: str, 
+        description: str,
+        include_auth: bool = True,
+        request_schema: Optional[str] = None,
+        response_schema: Optional[str] = None
+    ) -> str:
+        """实现单个API端点"""
+        
+        return self._run(
+            self._ENDPOINT_TEMPLATE,
+            self._ENDPOINT_OUTPUT,
+            method=method.upper(),
+            endpoint_path=endpoint_path,
+            description=description,
+            auth_required='是' if include_auth else '否',
+            request_schema=request_schema or '无',
+            response_schema=response_schema or '标准响应',
+            auth_step='集成权限中间件' if include_auth else '无需权限验证'
+        )
+    
+    def design_database_schema(
+        self, 
+        requirements: str,
+        tables: Optional[List[str]] = None,
+        relationships: Optional[Dict[str, List[str]]] = None
+    ) -> str:
+        """设计数据库Schema"""
+        tables = tables or ()
+        relationships = relationships or {}
+        
+        return self._run(
+            self._DATABASE_TEMPLATE,
+            self._DATABASE_OUTPUT,
+            requirements=requirements,
+            tables=tables if tables else '待分析确定',
+            relationships=relationships if relationships else '待设计'
+        )
+    
+    def optimize_api_performance(self, target_api: str) -> str:
+        """优化API性能"""
         
-        return crew.kickoff()
+        return self._run(
+            self._PERFORMANCE_TEMPLATE,
+            self._PERFORMANCE_OUTPUT,
+            target_api=target_api
+        )
+    
+    def implement_authentication_system(
+        self, 
+        auth_type: str = "JWT",
+        include_rbac: bool = True,
+        oauth_providers: Optional[List[str]] = None
+    ) -> str:
+        """实现认证系统"""
+        oauth_providers = oauth_providers or ()
+        
+        return self._run(
+            self._AUTH_TEMPLATE,
+            self._AUTH_OUTPUT,
+            auth_type=auth_type,
+            include_rbac='是' if include_rbac else '否',
+            oauth_providers=oauth_providers if oauth_providers else '无'
+        )
+    
+    def code_review_and_refactor(self, target_files: List[str]) -> str:
+        """代码审查和重构"""
+        
+        return self._run(
+            self._REVIEW_TEMPLATE,
+            self._REVIEW_OUTPUT,
+            file_list='\n'.join(f'- {file}' for file in target_files)
+        )
+    
+    def health_check(self) -> str:
+        """检查Agent健康状态"""
+        return self._run(self._HEALTH_CHECK_TEMPLATE, self._HEALTH_CHECK_OUTPUT)
+
+
+@functools.lru_cache(maxsize=1)
+def get_fastapi_agent() -> FastAPIBackendAgent:
+    """获取全局FastAPI后端Agent实例（首次调用时创建）"""
+    return FastAPIBackendAgent()
 
 
-# 创建全局FastAPI后端Agent实例
-fastapi_backend_agent = FastAPIBackendAgent()
+def __getattr__(name):
+    if name == "fastapi_backend_agent":
+        return get_fastapi_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # 便捷函数
@@ -503,10 +519,10 @@ def create_resource(
     resource_name: str, 
     fields: Dict[str, str],
     include_auth: bool = True,
-    custom_endpoints: List[str] = []
+    custom_endpoints: Optional[List[str]] = None
 ) -> Dict[str, str]:
     """创建完整资源的便捷函数"""
-    return fastapi_backend_agent.create_complete_resource(
+    return get_fastapi_agent().create_complete_resource(
         resource_name, fields, include_auth, custom_endpoints
     )
 
@@ -518,43 +534,48 @@ def implement_endpoint(
     include_auth: bool = True
 ) -> str:
     """实现API端点的便捷函数"""
-    return fastapi_backend_agent.implement_api_endpoint(
+    return get_fastapi_agent().implement_api_endpoint(
         endpoint_path, method, description, include_auth
     )
 
 
 def design_database(
     requirements: str,
-    tables: List[str] = [],
-    relationships: Dict[str, List[str]] = {}
+    tables: Optional[List[str]] = None,
+    relationships: Optional[Dict[str, List[str]]] = None
 ) -> str:
     """设计数据库的便捷函数"""
-    return fastapi_backend_agent.design_database_schema(
+    return get_fastapi_agent().design_database_schema(
         requirements, tables, relationships
     )
 
 
 def optimize_performance(target_api: str) -> str:
     """性能优化的便捷函数"""
-    return fastapi_backend_agent.optimize_api_performance(target_api)
+    return get_fastapi_agent().optimize_api_performance(target_api)
 
 
 def setup_auth_system(
     auth_type: str = "JWT",
     include_rbac: bool = True,
-    oauth_providers: List[str] = []
+    oauth_providers: Optional[List[str]] = None
 ) -> str:
     """设置认证系统的便捷函数"""
-    return fastapi_backend_agent.implement_authentication_system(
+    return get_fastapi_agent().implement_authentication_system(
         auth_type, include_rbac, oauth_providers
     )
 
 
 def review_code(target_files: List[str]) -> str:
     """代码审查的便捷函数"""
-    return fastapi_backend_agent.code_review_and_refactor(target_files)
+    return get_fastapi_agent().code_review_and_refactor(target_files)
+
+
+def batch(specs: List[Tuple[str, str]]) -> List[Any]:
+    """批量执行多个任务的便捷函数"""
+    return get_fastapi_agent().run_batch(specs)
 
 
 def check_fastapi_health() -> str:
     """健康检查的便捷函数"""
-    return fastapi_backend_agent.health_check()
\ No newline at end of file
+    return get_fastapi_agent().health_check()
\ No newline at end of file
@@ -3,17 +3,110 @@ FastAPI后端开发专用工具集
 为FastAPI后端开发Agent提供专门的工具
 """
 
+import copy
+import functools
 import os
 import re
-from typing import Type, Any, Dict, List, Optional
+from datetime import datetime
+from typing import Type, Any, ClassVar, Dict, List, Optional, Tuple
 from pathlib import Path
+from jinja2 import Environment, FileSystemLoader
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 
-from .claude_integration import claude_integration
 
+# 生成文件写入的backend目录，可用CLAUDE_FASTAPI_BACKEND环境变量覆盖，默认为仓库内的backend
+_BACKEND = Path(os.environ.get(
+    "CLAUDE_FASTAPI_BACKEND", Path(__file__).resolve().parents[1] / "backend"
+))
 
-class APIGenerationInput(BaseModel):
+
+# 代码模板放在 templates/ 目录，模块加载时创建一次环境；
+# 关闭自动重载并不限制缓存大小，每个模板只编译一次
+_ENV = Environment(
+    loader=FileSystemLoader(Path(__file__).resolve().parent / "templates"),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=True,
+    auto_reload=False,
+    cache_size=-1,
+)
+
+# 生成结果按参数缓存的条目上限；生成函数是参数的纯函数，同一资源反复生成时直接复用
+_TEMPLATE_CACHE_SIZE = 128
+
+# 字段类型到SQLAlchemy / Pydantic类型的映射，未知类型按字符串处理
+_SQLA_TYPE_MAP = {
+    'string': 'String(255)',
+    'text': 'Text',
+    'int': 'Integer',
+    'integer': 'Integer',
+    'float': 'Float',
+    'bool': 'Boolean',
+    'boolean': 'Boolean',
+    'datetime': 'DateTime'
+}
+
+_PYD_TYPE_MAP = {
+    'string': 'str',
+    'text': 'str',
+    'int': 'int',
+    'integer': 'int',
+    'float': 'float',
+    'bool': 'bool',
+    'boolean': 'bool',
+    'datetime': 'datetime'
+}
+
+
+def _write_file(path: Path, code: str, fsync: bool = False) -> None:
+    """将生成的代码以UTF-8写入文件，绕过文本IO层，小文件通常一次write完成；fsync为True时关闭前落盘"""
+    data = memoryview(code.encode('utf-8'))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+        if fsync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _snake_case(name: str) -> str:
+    """驼峰类名转为蛇形模块名，如 OrderItem -> order_item"""
+    return re.sub(r'(?<!^)(?=[A-Z])', '_', name).lower()
+
+
+def _fsync_dirs(paths) -> None:
+    """刷新文件所在目录的目录项，每个目录只刷新一次"""
+    for directory in dict.fromkeys(path.parent for path in paths):
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+# 各输入模型默认参数下的JSON Schema，导入时生成一次
+_JSON_SCHEMA_CACHE: Dict[type, Dict[str, Any]] = {}
+
+
+class _ToolInput(BaseModel):
+    """工具输入模型基类，缓存Agent反复读取的参数JSON Schema"""
+    
+    @classmethod
+    def model_json_schema(cls, *args, **kwargs) -> Dict[str, Any]:
+        # 自定义生成参数时不走缓存
+        if args or kwargs:
+            return super().model_json_schema(*args, **kwargs)
+        schema = _JSON_SCHEMA_CACHE.get(cls)
+        if schema is None:
+            schema = _JSON_SCHEMA_CACHE[cls] = super().model_json_schema()
+        # 返回副本，调用方修改结果不会污染缓存
+        return copy.deepcopy(schema)
+
+
+class APIGenerationInput(_ToolInput):
     """API生成输入模型"""
     resource_name: str = Field(..., description="资源名称，如 'users', 'products'")
     model_name: str = Field(..., description="模型名称，如 'User', 'Product'")
@@ -28,6 +121,11 @@ class APIGenerationTool(BaseTool):
     description: str = "生成完整的FastAPI路由文件，包含CRUD操作和权限验证"
     args_schema: Type[BaseModel] = APIGenerationInput
     
+    # 需要权限验证时追加到端点参数列表的依赖参数
+    _AUTH_PARAMS: ClassVar[str] = '''
+    request: Request,
+    current_user: {model_name} = Depends(get_current_user),'''
+    
     def _run(
         self, 
         resource_name: str, 
@@ -40,201 +138,82 @@ class APIGenerationTool(BaseTool):
         try:
             # 生成路由代码模板
             router_code = self._generate_router_template(
-                resource_name, model_name, include_crud, include_auth, custom_endpoints
+                resource_name, model_name, include_crud, include_auth, tuple(custom_endpoints)
             )
             
             # 保存到文件
-            file_path = f"/Users/chiyingjie/code/git/claude-fastapi/backend/api/v1/{resource_name}.py"
+            file_path = _BACKEND / "api" / "v1" / f"{resource_name}.py"
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(router_code)
+            _write_file(file_path, router_code)
             
             return f"✅ 成功生成FastAPI路由文件: {file_path}\n\n预览:\n{router_code[:500]}..."
             
         except Exception as e:
             return f"❌ API生成失败: {str(e)}"
     
+    @staticmethod
+    @functools.lru_cache(maxsize=_TEMPLATE_CACHE_SIZE)
     def _generate_router_template(
-        self, 
         resource_name: str, 
         model_name: str,
         include_crud: bool,
         include_auth: bool,
-        custom_endpoints: List[str]
+        custom_endpoints: Tuple[str, ...],
+        singular: Optional[str] = None
     ) -> str:
-        """生成路由代码模板"""
+        """生成路由代码模板，相同参数直接返回缓存结果；singular为crud/models/schemas模块名"""
         
+        # 单数名和权限资源类型每次生成只计算一次，传给各段模板复用
+        singular = singular or resource_name.rstrip('s')
+        resource_type = f"ResourceType.{singular.upper()}" if include_auth else None
+        
+        # 各段代码先收集到列表，最后一次性拼接
         # 基础导入和路由设置
-        template = f'''from typing import List, Optional
-
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from sqlalchemy.orm import Session
-
-from ...api.deps import get_current_active_user, get_current_superuser, get_current_user
-from ...crud.{resource_name.rstrip('s')} import {resource_name.rstrip('s')}_crud
-from ...db.base import get_db'''
-
-        if include_auth:
-            template += f'''
-from ...middleware.permission import (
-    PermissionAction,
-    ResourceType,
-    require_permission,
-    require_read_permission,
-    require_write_permission,
-)'''
-
-        template += f'''
-from ...models.{resource_name.rstrip('s')} import {model_name}
-from ...schemas.{resource_name.rstrip('s')} import {model_name}Create, {model_name}Response, {model_name}Update
-
-router = APIRouter()
-
-'''
+        parts = [_ENV.get_template("router.j2").render(
+            singular=singular, model_name=model_name, include_auth=include_auth
+        )]
 
         # 如果包含CRUD操作，生成标准CRUD端点
         if include_crud:
-            template += self._generate_crud_endpoints(resource_name, model_name, include_auth)
+            parts.append(APIGenerationTool._generate_crud_endpoints(
+                resource_name, model_name, include_auth, singular, resource_type
+            ))
         
         # 添加自定义端点
-        for endpoint in custom_endpoints:
-            template += self._generate_custom_endpoint(endpoint, resource_name, model_name, include_auth)
+        parts.extend(
+            APIGenerationTool._generate_custom_endpoint(endpoint, resource_name, model_name, include_auth)
+            for endpoint in custom_endpoints
+        )
         
-        return template
+        return "".join(parts)
     
-    def _generate_crud_endpoints(self, resource_name: str, model_name: str, include_auth: bool) -> str:
+    @staticmethod
+    def _generate_crud_endpoints(
+        resource_name: str,
+        model_name: str,
+        include_auth: bool,
+        singular: str,
+        resource_type: Optional[str]
+    ) -> str:
         """生成标准CRUD端点"""
-        singular = resource_name.rstrip('s')
-        auth_decorator = ""
-        auth_params = ""
-        
-        if include_auth:
-            resource_type = f"ResourceType.{singular.upper()}"
-            auth_params = '''
-    request: Request,
-    current_user: {model_name} = Depends(get_current_user),'''
-
-        return f'''
-# 创建{model_name}
-@router.post(
-    "/",
-    response_model={model_name}Response,
-    summary="创建{model_name}",
-    description="创建新的{model_name}记录",
-    status_code=status.HTTP_201_CREATED
-)
-{"@require_write_permission(" + resource_type + ")" if include_auth else ""}
-async def create_{singular}(
-    {singular}_data: {model_name}Create,{auth_params}
-    db: Session = Depends(get_db)
-):
-    """创建{model_name}"""
-    new_{singular} = {singular}_crud.create_{singular}(db, {singular}_data)
-    return new_{singular}
-
-
-# 获取{model_name}列表
-@router.get(
-    "/",
-    response_model=List[{model_name}Response],
-    summary="获取{model_name}列表",
-    description="获取{model_name}列表，支持分页和筛选"
-)
-{"@require_read_permission(" + resource_type + ")" if include_auth else ""}
-async def get_{resource_name}(
-    skip: int = Query(0, ge=0, description="跳过的记录数"),
-    limit: int = Query(20, ge=1, le=100, description="返回的记录数"),{auth_params}
-    db: Session = Depends(get_db)
-):
-    """获取{model_name}列表"""
-    {resource_name} = {singular}_crud.get_{resource_name}(db, skip=skip, limit=limit)
-    return {resource_name}
-
-
-# 获取单个{model_name}
-@router.get(
-    "/{{{singular}_id}}",
-    response_model={model_name}Response,
-    summary="获取{model_name}详情",
-    description="根据ID获取{model_name}详细信息"
-)
-{"@require_permission(" + resource_type + ", PermissionAction.READ, resource_id_param=\"" + singular + "_id\")" if include_auth else ""}
-async def get_{singular}(
-    {singular}_id: int,{auth_params}
-    db: Session = Depends(get_db)
-):
-    """获取单个{model_name}"""
-    {singular} = {singular}_crud.get_{singular}(db, {singular}_id)
-    if not {singular}:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="{model_name}不存在"
-        )
-    return {singular}
-
-
-# 更新{model_name}
-@router.put(
-    "/{{{singular}_id}}",
-    response_model={model_name}Response,
-    summary="更新{model_name}",
-    description="根据ID更新{model_name}信息"
-)
-{"@require_permission(" + resource_type + ", PermissionAction.UPDATE, resource_id_param=\"" + singular + "_id\")" if include_auth else ""}
-async def update_{singular}(
-    {singular}_id: int,
-    {singular}_update: {model_name}Update,{auth_params}
-    db: Session = Depends(get_db)
-):
-    """更新{model_name}"""
-    updated_{singular} = {singular}_crud.update_{singular}(db, {singular}_id, {singular}_update)
-    if not updated_{singular}:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="{model_name}不存在"
+        return _ENV.get_template("router_crud.j2").render(
+            resource_name=resource_name,
+            model_name=model_name,
+            include_auth=include_auth,
+            singular=singular,
+            resource_type=resource_type,
+            auth_params=APIGenerationTool._AUTH_PARAMS if include_auth else "",
         )
-    return updated_{singular}
-
-
-# 删除{model_name}
-@router.delete(
-    "/{{{singular}_id}}",
-    summary="删除{model_name}",
-    description="根据ID删除{model_name}"
-)
-{"@require_permission(" + resource_type + ", PermissionAction.DELETE, resource_id_param=\"" + singular + "_id\")" if include_auth else ""}
-async def delete_{singular}(
-    {singular}_id: int,{auth_params}
-    db: Session = Depends(get_db)
-):
-    """删除{model_name}"""
-    success = {singular}_crud.delete_{singular}(db, {singular}_id)
-    if not success:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="{model_name}不存在"
-        )
-    return {{"message": "{model_name}已删除", "{singular}_id": {singular}_id}}
-'''
     
-    def _generate_custom_endpoint(self, endpoint_name: str, resource_name: str, model_name: str, include_auth: bool) -> str:
+    @staticmethod
+    def _generate_custom_endpoint(endpoint_name: str, resource_name: str, model_name: str, include_auth: bool) -> str:
         """生成自定义端点"""
-        return f'''
-
-# 自定义端点: {endpoint_name}
-@router.post(
-    "/{endpoint_name}",
-    summary="{endpoint_name}",
-    description="自定义{model_name}操作: {endpoint_name}"
-)
-async def {endpoint_name.replace('-', '_')}():
-    """自定义操作: {endpoint_name}"""
-    # TODO: 实现{endpoint_name}逻辑
-    return {{"message": "{endpoint_name}操作完成"}}
-'''
+        return _ENV.get_template("router_custom.j2").render(
+            endpoint_name=endpoint_name, model_name=model_name
+        )
 
 
-class ModelGenerationInput(BaseModel):
+class ModelGenerationInput(_ToolInput):
     """数据模型生成输入"""
     model_name: str = Field(..., description="模型名称，如 'Product'")
     table_name: str = Field(..., description="表名，如 'products'")
@@ -260,29 +239,33 @@ class ModelGenerationTool(BaseTool):
         """生成SQLAlchemy模型"""
         try:
             model_code = self._generate_model_template(
-                model_name, table_name, fields, include_timestamps, include_relationships
+                model_name,
+                table_name,
+                tuple(fields.items()),
+                include_timestamps,
+                tuple(include_relationships)
             )
             
             # 保存到文件
-            file_path = f"/Users/chiyingjie/code/git/claude-fastapi/backend/models/{table_name.rstrip('s')}.py"
+            file_path = _BACKEND / "models" / f"{table_name.rstrip('s')}.py"
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(model_code)
+            _write_file(file_path, model_code)
             
             return f"✅ 成功生成SQLAlchemy模型: {file_path}\n\n预览:\n{model_code[:500]}..."
             
         except Exception as e:
             return f"❌ 模型生成失败: {str(e)}"
     
+    @staticmethod
+    @functools.lru_cache(maxsize=_TEMPLATE_CACHE_SIZE)
     def _generate_model_template(
-        self,
         model_name: str,
         table_name: str,
-        fields: Dict[str, str],
+        fields: Tuple[Tuple[str, str], ...],
         include_timestamps: bool,
-        include_relationships: List[str]
+        include_relationships: Tuple[str, ...]
     ) -> str:
-        """生成模型代码模板"""
+        """生成模型代码模板，fields为(字段名, 字段类型)元组，保持定义顺序"""
         
         imports = ["from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text, Float, ForeignKey"]
         if include_relationships:
@@ -290,70 +273,27 @@ class ModelGenerationTool(BaseTool):
         if include_timestamps:
             imports.append("from sqlalchemy.sql import func")
         
-        template = f'''{"".join(import_line + chr(10) for import_line in imports)}
-
-# 绝对导入，避免相对导入问题
-try:
-    from backend.db.base import Base
-except ImportError:
-    from db.base import Base
-
-
-class {model_name}(Base):
-    """{model_name}模型"""
-    
-    __tablename__ = "{table_name}"
-    
-    id = Column(Integer, primary_key=True, index=True, comment="{model_name}ID")
-'''
-        
-        # 添加字段定义
-        for field_name, field_type in fields.items():
-            template += f'    {field_name} = Column({self._map_field_type(field_type)}, comment="{field_name}")\n'
+        columns = [
+            (field_name, _SQLA_TYPE_MAP.get(field_type.lower(), 'String(255)'))
+            for field_name, field_type in fields
+        ]
         
-        # 添加时间戳字段
-        if include_timestamps:
-            template += '''
-    # 时间字段
-    created_at = Column(
-        DateTime(timezone=True), server_default=func.now(), comment="创建时间"
-    )
-    updated_at = Column(
-        DateTime(timezone=True),
-        server_default=func.now(),
-        onupdate=func.now(),
-        comment="更新时间"
-    )
-'''
-        
-        # 添加关系字段
-        for relationship in include_relationships:
-            template += f'    {relationship} = relationship("{relationship.title()}", back_populates="{table_name}")\n'
-        
-        # 添加方法
-        template += f'''
-    def __repr__(self):
-        return f"<{model_name}(id={{self.id}})>"
-'''
-        
-        return template
+        return _ENV.get_template("model.j2").render(
+            imports=imports,
+            model_name=model_name,
+            table_name=table_name,
+            columns=columns,
+            include_timestamps=include_timestamps,
+            include_relationships=include_relationships,
+        )
     
-    def _map_field_type(self, field_type: str) -> str:
+    @staticmethod
+    def _map_field_type(field_type: str) -> str:
         """映射字段类型到SQLAlchemy类型"""
-        type_mapping = {
-            'string': 'String(255)',
-            'text': 'Text',
-            'int': 'Integer',
-            'integer': 'Integer',
-            'float': 'Float',
-            'bool': 'Boolean',
-            'boolean': 'Boolean',
-            'datetime': 'DateTime'
-        }
-        return type_mapping.get(field_type.lower(), 'String(255)')
-
-
-class CRUDGenerationInput(BaseModel):
+        return _SQLA_TYPE_MAP.get(field_type.lower(), 'String(255)')
+
+
+class CRUDGenerationInput(_ToolInput):
     """CRUD生成输入"""
     model_name: str = Field(..., description="模型名称")
     include_advanced_queries: bool = Field(default=True, description="是否包含高级查询方法")
@@ -372,131 +312,36 @@ class CRUDGenerationTool(BaseTool):
             
             # 保存到文件
             singular_name = model_name.lower()
-            file_path = f"/Users/chiyingjie/code/git/claude-fastapi/backend/crud/{singular_name}.py"
+            file_path = _BACKEND / "crud" / f"{singular_name}.py"
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(crud_code)
+            _write_file(file_path, crud_code)
             
             return f"✅ 成功生成CRUD文件: {file_path}\n\n预览:\n{crud_code[:500]}..."
             
         except Exception as e:
             return f"❌ CRUD生成失败: {str(e)}"
     
-    def _generate_crud_template(self, model_name: str, include_advanced_queries: bool) -> str:
-        """生成CRUD代码模板"""
-        singular_name = model_name.lower()
-        plural_name = singular_name + 's'
-        
-        template = f'''from typing import List, Optional
-
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc
-
-from ..models.{singular_name} import {model_name}
-from ..schemas.{singular_name} import {model_name}Create, {model_name}Update
-
-
-class {model_name}CRUD:
-    """{model_name} CRUD操作类"""
-    
-    def create_{singular_name}(self, db: Session, {singular_name}_data: {model_name}Create) -> {model_name}:
-        """创建{model_name}"""
-        db_{singular_name} = {model_name}(**{singular_name}_data.dict())
-        db.add(db_{singular_name})
-        db.commit()
-        db.refresh(db_{singular_name})
-        return db_{singular_name}
-    
-    def get_{singular_name}(self, db: Session, {singular_name}_id: int) -> Optional[{model_name}]:
-        """根据ID获取{model_name}"""
-        return db.query({model_name}).filter({model_name}.id == {singular_name}_id).first()
-    
-    def get_{plural_name}(
-        self, 
-        db: Session, 
-        skip: int = 0, 
-        limit: int = 20,
-        order_by: str = "id",
-        desc: bool = False
-    ) -> List[{model_name}]:
-        """获取{model_name}列表"""
-        query = db.query({model_name})
-        
-        # 排序
-        order_column = getattr({model_name}, order_by, {model_name}.id)
-        if desc:
-            query = query.order_by(order_column.desc())
-        else:
-            query = query.order_by(order_column.asc())
-        
-        return query.offset(skip).limit(limit).all()
-    
-    def update_{singular_name}(
-        self, 
-        db: Session, 
-        {singular_name}_id: int, 
-        {singular_name}_update: {model_name}Update
-    ) -> Optional[{model_name}]:
-        """更新{model_name}"""
-        db_{singular_name} = db.query({model_name}).filter({model_name}.id == {singular_name}_id).first()
-        if not db_{singular_name}:
-            return None
-        
-        update_data = {singular_name}_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_{singular_name}, field, value)
-        
-        db.commit()
-        db.refresh(db_{singular_name})
-        return db_{singular_name}
-    
-    def delete_{singular_name}(self, db: Session, {singular_name}_id: int) -> bool:
-        """删除{model_name}"""
-        db_{singular_name} = db.query({model_name}).filter({model_name}.id == {singular_name}_id).first()
-        if not db_{singular_name}:
-            return False
-        
-        db.delete(db_{singular_name})
-        db.commit()
-        return True
-    
-    def get_{plural_name}_count(self, db: Session) -> int:
-        """获取{model_name}总数"""
-        return db.query({model_name}).count()
-'''
-        
-        if include_advanced_queries:
-            template += f'''
-    def search_{plural_name}(
-        self, 
-        db: Session, 
-        search_term: str,
-        skip: int = 0,
-        limit: int = 20
-    ) -> List[{model_name}]:
-        """搜索{model_name}"""
-        # TODO: 根据实际字段实现搜索逻辑
-        query = db.query({model_name})
-        # 示例：如果有name字段
-        # query = query.filter({model_name}.name.ilike(f"%{{search_term}}%"))
-        return query.offset(skip).limit(limit).all()
-    
-    def get_active_{plural_name}(self, db: Session) -> List[{model_name}]:
-        """获取活跃的{model_name}"""
-        # TODO: 根据实际业务逻辑实现
-        return db.query({model_name}).all()
-'''
-        
-        template += f'''
-
-# 创建全局CRUD实例
-{singular_name}_crud = {model_name}CRUD()
-'''
+    @staticmethod
+    @functools.lru_cache(maxsize=_TEMPLATE_CACHE_SIZE)
+    def _generate_crud_template(
+        model_name: str,
+        include_advanced_queries: bool,
+        singular: Optional[str] = None,
+        plural: Optional[str] = None
+    ) -> str:
+        """生成CRUD代码模板，singular/plural未指定时由模型名推导"""
+        # 单复数名只计算一次，模板中直接引用
+        singular = singular or model_name.lower()
         
-        return template
+        return _ENV.get_template("crud.j2").render(
+            model_name=model_name,
+            singular=singular,
+            plural=plural or singular + 's',
+            include_advanced_queries=include_advanced_queries,
+        )
 
 
-class SchemaGenerationInput(BaseModel):
+class SchemaGenerationInput(_ToolInput):
     """Schema生成输入"""
     model_name: str = Field(..., description="模型名称")
     fields: Dict[str, str] = Field(..., description="字段定义")
@@ -517,92 +362,50 @@ class SchemaGenerationTool(BaseTool):
     ) -> str:
         """生成Pydantic Schema"""
         try:
-            schema_code = self._generate_schema_template(model_name, fields, include_base_schemas)
+            schema_code = self._generate_schema_template(
+                model_name, tuple(fields.items()), include_base_schemas
+            )
             
             # 保存到文件
             singular_name = model_name.lower()
-            file_path = f"/Users/chiyingjie/code/git/claude-fastapi/backend/schemas/{singular_name}.py"
+            file_path = _BACKEND / "schemas" / f"{singular_name}.py"
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(schema_code)
+            _write_file(file_path, schema_code)
             
             return f"✅ 成功生成Schema文件: {file_path}\n\n预览:\n{schema_code[:500]}..."
             
         except Exception as e:
             return f"❌ Schema生成失败: {str(e)}"
     
-    def _generate_schema_template(self, model_name: str, fields: Dict[str, str], include_base_schemas: bool) -> str:
-        """生成Schema代码模板"""
-        template = f'''from datetime import datetime
-from typing import Optional
-
-from pydantic import BaseModel, Field
-
-
-class {model_name}Base(BaseModel):
-    """{model_name}基础Schema"""
-'''
-        
-        # 添加基础字段
-        for field_name, field_type in fields.items():
-            pydantic_type = self._map_to_pydantic_type(field_type)
-            template += f'    {field_name}: {pydantic_type}\n'
-        
-        template += f'''
-
-
-class {model_name}Create({model_name}Base):
-    """{model_name}创建Schema"""
-    pass
-
-
-class {model_name}Update(BaseModel):
-    """{model_name}更新Schema"""
-'''
-        
-        # 更新Schema的字段都是可选的
-        for field_name, field_type in fields.items():
-            pydantic_type = self._map_to_pydantic_type(field_type)
+    @staticmethod
+    @functools.lru_cache(maxsize=_TEMPLATE_CACHE_SIZE)
+    def _generate_schema_template(
+        model_name: str,
+        fields: Tuple[Tuple[str, str], ...],
+        include_base_schemas: bool
+    ) -> str:
+        """生成Schema代码模板，fields为(字段名, 字段类型)元组，保持定义顺序"""
+        base_fields = []
+        update_fields = []
+        for field_name, field_type in fields:
+            pydantic_type = _PYD_TYPE_MAP.get(field_type.lower(), 'str')
+            base_fields.append((field_name, pydantic_type))
+            # 更新Schema的字段都是可选的
             if not pydantic_type.startswith('Optional'):
                 pydantic_type = f"Optional[{pydantic_type}] = None"
-            template += f'    {field_name}: {pydantic_type}\n'
+            update_fields.append((field_name, pydantic_type))
         
-        template += f'''
-
-
-class {model_name}Response({model_name}Base):
-    """{model_name}响应Schema"""
-    id: int
-    created_at: datetime
-    updated_at: datetime
+        return _ENV.get_template("schema.j2").render(
+            model_name=model_name, base_fields=base_fields, update_fields=update_fields
+        )
     
-    class Config:
-        from_attributes = True
+    @staticmethod
+    def _map_to_pydantic_type(field_type: str) -> str:
+        """映射字段类型到Pydantic类型"""
+        return _PYD_TYPE_MAP.get(field_type.lower(), 'str')
 
 
-class {model_name}Profile({model_name}Response):
-    """{model_name}档案Schema"""
-    pass
-'''
-        
-        return template
-    
-    def _map_to_pydantic_type(self, field_type: str) -> str:
-        """映射字段类型到Pydantic类型"""
-        type_mapping = {
-            'string': 'str',
-            'text': 'str',
-            'int': 'int',
-            'integer': 'int',
-            'float': 'float',
-            'bool': 'bool',
-            'boolean': 'bool',
-            'datetime': 'datetime'
-        }
-        return type_mapping.get(field_type.lower(), 'str')
-
-
-class MigrationGenerationInput(BaseModel):
+class MigrationGenerationInput(_ToolInput):
     """数据库迁移生成输入"""
     migration_name: str = Field(..., description="迁移文件名称")
     model_changes: str = Field(..., description="模型变更描述")
@@ -622,13 +425,11 @@ class MigrationGenerationTool(BaseTool):
                 # 执行alembic命令生成迁移
                 import subprocess
                 
-                # 切换到backend目录
-                backend_path = "/Users/chiyingjie/code/git/claude-fastapi/backend"
-                
+                # 在独立进程中运行，env.py的配置读取、日志设置和模型导入都限定在backend目录内
                 cmd = ["alembic", "revision", "--autogenerate", "-m", migration_name]
                 result = subprocess.run(
                     cmd, 
-                    cwd=backend_path,
+                    cwd=_BACKEND,
                     capture_output=True, 
                     text=True
                 )
@@ -647,41 +448,90 @@ class MigrationGenerationTool(BaseTool):
     
     def _generate_migration_template(self, migration_name: str, model_changes: str) -> str:
         """生成迁移代码模板"""
-        return f'''"""
-{migration_name}
-
-Revision ID: auto_generated
-Revises: 
-Create Date: {datetime.now().isoformat()}
+        return _ENV.get_template("migration.j2").render(
+            migration_name=migration_name,
+            model_changes=model_changes,
+            create_date=datetime.now().isoformat(),
+        )
 
-"""
-from alembic import op
-import sqlalchemy as sa
 
-# revision identifiers
-revision = 'auto_generated'
-down_revision = None
-branch_labels = None
-depends_on = None
+class ResourceBundleInput(_ToolInput):
+    """资源整体生成输入"""
+    resource_name: str = Field(..., description="资源名称，如 'products'")
+    model_name: str = Field(..., description="模型名称，如 'Product'")
+    fields: Dict[str, str] = Field(..., description="字段定义，格式: {字段名: 字段类型}")
+    include_auth: bool = Field(default=True, description="是否包含权限验证")
 
 
-def upgrade():
-    """
-    升级数据库
+class ResourceBundleTool(BaseTool):
+    """资源整体生成工具，一次调用生成同一资源的模型、Schema、CRUD和路由"""
+    name: str = "fastapi_resource_bundle_generator"
+    description: str = "一次性生成资源的SQLAlchemy模型、Pydantic Schema、CRUD操作和FastAPI路由文件"
+    args_schema: Type[BaseModel] = ResourceBundleInput
     
-    变更内容: {model_changes}
-    """
-    # TODO: 实现升级逻辑
-    pass
+    def _run(
+        self,
+        resource_name: str,
+        model_name: str,
+        fields: Dict[str, str],
+        include_auth: bool = True
+    ) -> str:
+        """生成资源的全部文件"""
+        try:
+            frozen_fields = tuple(fields.items())
+            # 四个文件共用同一个模块名（模型名转蛇形，如OrderItem -> order_item），
+            # 复数名取资源名，保证生成的文件之间能相互导入
+            module_name = _snake_case(model_name)
+            
+            # 先在内存中生成全部代码，任一模板出错时不会留下部分文件
+            files = (
+                (
+                    _BACKEND / "models" / f"{module_name}.py",
+                    ModelGenerationTool._generate_model_template(
+                        model_name, resource_name, frozen_fields, True, ()
+                    )
+                ),
+                (
+                    _BACKEND / "schemas" / f"{module_name}.py",
+                    SchemaGenerationTool._generate_schema_template(model_name, frozen_fields, True)
+                ),
+                (
+                    _BACKEND / "crud" / f"{module_name}.py",
+                    CRUDGenerationTool._generate_crud_template(
+                        model_name, True, module_name, resource_name
+                    )
+                ),
+                (
+                    _BACKEND / "api" / "v1" / f"{resource_name}.py",
+                    APIGenerationTool._generate_router_template(
+                        resource_name, model_name, True, include_auth, (), module_name
+                    )
+                ),
+            )
+            
+            # 每个文件关闭前落盘，全部写完后再统一刷新一次目录项
+            for file_path, code in files:
+                _write_file(file_path, code, fsync=True)
+            _fsync_dirs(file_path for file_path, _ in files)
+            
+            file_list = "\n".join(f"- {file_path}" for file_path, _ in files)
+            return f"✅ 成功生成{model_name}资源文件:\n{file_list}"
+            
+        except Exception as e:
+            return f"❌ 资源生成失败: {str(e)}"
 
 
-def downgrade():
-    """
-    回滚数据库
-    """
-    # TODO: 实现回滚逻辑
-    pass
-'''
+# 预先生成各工具参数的JSON Schema
+for _input_model in (
+    APIGenerationInput,
+    ModelGenerationInput,
+    CRUDGenerationInput,
+    SchemaGenerationInput,
+    MigrationGenerationInput,
+    ResourceBundleInput
+):
+    _input_model.model_json_schema()
+del _input_model
 
 
 # 导出所有工具
@@ -690,5 +540,6 @@ __all__ = [
     "ModelGenerationTool", 
     "CRUDGenerationTool",
     "SchemaGenerationTool",
-    "MigrationGenerationTool"
+    "MigrationGenerationTool",
+    "ResourceBundleTool"
 ]
\ No newline at end of file
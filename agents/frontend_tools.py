@@ -10,7 +10,7 @@ import os
 import json
 from pathlib import Path
 
-from .claude_integration import claude_integration
+from .claude_integration import get_claude_integration
 
 
 class VueComponentInput(BaseModel):
@@ -70,7 +70,7 @@ class VueComponentGeneratorTool(BaseTool):
             - 样式变量说明
             """
             
-            result = claude_integration.execute_command(prompt)
+            result = get_claude_integration().execute_command(prompt)
             
             # 保存组件到frontend/src/components/generated/
             self._save_component(component_name, result)
@@ -168,7 +168,7 @@ class UIDesignTool(BaseTool):
             以Markdown格式输出，包含具体的代码示例和配置。
             """
             
-            result = claude_integration.execute_command(prompt)
+            result = get_claude_integration().execute_command(prompt)
             
             # 保存设计文档
             self._save_design_doc(design_target, result)
@@ -239,7 +239,7 @@ class VuetifyComponentTool(BaseTool):
             输出格式应包含完整的Vue组件代码和使用说明。
             """
             
-            result = claude_integration.execute_command(prompt)
+            result = get_claude_integration().execute_command(prompt)
             return f"✅ Vuetify组件定制完成:\n\n{result}"
             
         except Exception as e:
@@ -306,7 +306,7 @@ class ResponsiveDesignTool(BaseTool):
             输出应包含具体的CSS代码和Vue组件实现示例。
             """
             
-            result = claude_integration.execute_command(prompt)
+            result = get_claude_integration().execute_command(prompt)
             return f"✅ 响应式设计优化完成:\n\n{result}"
             
         except Exception as e:
@@ -355,7 +355,7 @@ class FrontendAnalysisTool(BaseTool):
             - 长期改进规划
             """
             
-            result = claude_integration.execute_command(prompt)
+            result = get_claude_integration().execute_command(prompt)
             
             # 保存分析报告
             self._save_analysis_report(analysis_type, result)
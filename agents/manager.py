@@ -3,7 +3,8 @@ Agent管理器
 统一管理和协调所有Agent的工作
 """
 
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Tuple
 try:
     from .doc_agent import DocumentationAgent
 except ImportError:
@@ -16,7 +17,28 @@ except ImportError:
     # CrewAI不可用时使用简化版
     from .frontend_agent_simple import FrontendDeveloperAgentSimple as FrontendDeveloperAgent
 
-from .claude_integration import claude_integration
+from .claude_integration import ttl_cache, STATUS_CACHE_TTL
+
+
+# 各Agent支持的任务类型（静态只读表，模块加载时构建一次）
+_CAPABILITIES: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    'documentation': (
+        'generate_api_doc',
+        'generate_tech_doc', 
+        'generate_user_guide',
+        'update_readme',
+        'analyze_code',
+        'health_check'
+    ),
+    'frontend': (
+        'generate_component',
+        'design_layout',
+        'optimize_ux',
+        'create_component_library',
+        'analyze_performance',
+        'health_check'
+    )
+})
 
 
 class AgentManager:
@@ -133,32 +155,14 @@ class AgentManager:
         except Exception as e:
             return f"❌ 执行失败: {str(e)}"
     
-    def get_agent_capabilities(self, agent_name: str) -> Dict[str, List[str]]:
+    def get_agent_capabilities(self, agent_name: Optional[str] = None) -> Dict[str, List[str]]:
         """获取Agent的能力列表"""
-        capabilities = {
-            'documentation': [
-                'generate_api_doc',
-                'generate_tech_doc', 
-                'generate_user_guide',
-                'update_readme',
-                'analyze_code',
-                'health_check'
-            ],
-            'frontend': [
-                'generate_component',
-                'design_layout',
-                'optimize_ux',
-                'create_component_library',
-                'analyze_performance',
-                'health_check'
-            ]
-        }
-        
-        if agent_name in capabilities:
-            return {agent_name: capabilities[agent_name]}
-        else:
-            return capabilities
+        # 每次返回新的字典和列表，调用方修改结果不会影响静态表
+        if agent_name in _CAPABILITIES:
+            return {agent_name: list(_CAPABILITIES[agent_name])}
+        return {name: list(tasks) for name, tasks in _CAPABILITIES.items()}
     
+    @ttl_cache(STATUS_CACHE_TTL)
     def system_status(self) -> Dict[str, Any]:
         """获取所有Agent的状态"""
         status = {}
@@ -8,7 +8,8 @@ from enum import Enum
 from dataclasses import dataclass, field
 from datetime import datetime
 import uuid
-import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from crewai import Agent, Task, Crew, Process
 
 from .tools import (
@@ -90,6 +91,8 @@ class TaskCoordinatorAgent:
         self.agents: Dict[str, AgentInfo] = {}
         self.task_queue: List[str] = []
         self.completed_tasks: List[str] = []
+        # 并发执行任务时保护共享的队列和分配记录
+        self._bookkeeping_lock = threading.Lock()
         
         # 初始化工具集
         self.tools = [
@@ -343,34 +346,36 @@ class TaskCoordinatorAgent:
     
     def assign_task(self, task_id: str, agent_name: str = None) -> bool:
         """分配任务给Agent"""
-        task = self.tasks.get(task_id)
-        if not task or task.status != TaskStatus.PENDING:
-            return False
-        
-        # 检查依赖任务是否完成
-        for dep_id in task.dependencies:
-            dep_task = self.tasks.get(dep_id)
-            if not dep_task or dep_task.status != TaskStatus.COMPLETED:
-                task.status = TaskStatus.BLOCKED
+        # 选择Agent、检查容量和登记分配需在同一把锁内完成，避免并发分配超出Agent上限
+        with self._bookkeeping_lock:
+            task = self.tasks.get(task_id)
+            if not task or task.status != TaskStatus.PENDING:
                 return False
-        
-        # 自动选择Agent
-        if not agent_name:
-            agent_name = self.find_best_agent(task_id)
-        
-        if not agent_name or agent_name not in self.agents:
-            return False
-        
-        # 执行分配
-        agent_info = self.agents[agent_name]
-        if len(agent_info.current_tasks) >= agent_info.max_concurrent_tasks:
-            return False
-        
-        task.assigned_agent = agent_name
-        task.status = TaskStatus.ASSIGNED
-        agent_info.current_tasks.append(task_id)
-        
-        return True
+            
+            # 检查依赖任务是否完成
+            for dep_id in task.dependencies:
+                dep_task = self.tasks.get(dep_id)
+                if not dep_task or dep_task.status != TaskStatus.COMPLETED:
+                    task.status = TaskStatus.BLOCKED
+                    return False
+            
+            # 自动选择Agent
+            if not agent_name:
+                agent_name = self.find_best_agent(task_id)
+            
+            if not agent_name or agent_name not in self.agents:
+                return False
+            
+            # 执行分配
+            agent_info = self.agents[agent_name]
+            if len(agent_info.current_tasks) >= agent_info.max_concurrent_tasks:
+                return False
+            
+            task.assigned_agent = agent_name
+            task.status = TaskStatus.ASSIGNED
+            agent_info.current_tasks.append(task_id)
+            
+            return True
     
     def execute_task(self, task_id: str) -> bool:
         """执行任务"""
@@ -404,15 +409,16 @@ class TaskCoordinatorAgent:
             task.status = TaskStatus.COMPLETED
             task.completed_at = datetime.now()
             
-            # 清理Agent分配
-            if task.assigned_agent:
-                agent_info = self.agents[task.assigned_agent]
-                if task_id in agent_info.current_tasks:
-                    agent_info.current_tasks.remove(task_id)
-            
-            self.completed_tasks.append(task_id)
-            if task_id in self.task_queue:
-                self.task_queue.remove(task_id)
+            with self._bookkeeping_lock:
+                # 清理Agent分配
+                if task.assigned_agent:
+                    agent_info = self.agents[task.assigned_agent]
+                    if task_id in agent_info.current_tasks:
+                        agent_info.current_tasks.remove(task_id)
+                
+                self.completed_tasks.append(task_id)
+                if task_id in self.task_queue:
+                    self.task_queue.remove(task_id)
             
             return True
             
@@ -422,6 +428,16 @@ class TaskCoordinatorAgent:
             print(f"❌ 任务执行失败: {e}")
             return False
     
+    def execute_tasks_parallel(self, task_ids: List[str], max_concurrency: int = 4) -> Dict[str, bool]:
+        """并发执行多个已分配的任务，返回 {任务ID: 是否执行成功}
+        
+        依赖关系在分配阶段检查，传入的任务应已通过 assign_task 分配。
+        """
+        if not task_ids:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(task_ids))) as pool:
+            return dict(zip(task_ids, pool.map(self.execute_task, task_ids)))
+    
     def _execute_documentation_task(self, task: TaskInfo) -> str:
         """执行文档生成任务"""
         from .doc_agent import doc_agent
@@ -11,8 +11,6 @@ from pathlib import Path
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 
-from .claude_integration import claude_integration
-
 
 class UnitTestGenerationInput(BaseModel):
     """单元测试生成输入模型"""
@@ -138,13 +136,14 @@ class UnitTestGenerationTool(BaseTool):
         # 添加源文件导入
         source_imports = self._generate_source_imports(analysis['file_path'], analysis)
         imports.extend(source_imports)
+        imports_block = "\n".join(imports)
         
         test_code = f'''"""
 {os.path.basename(analysis['file_path'])} 的{test_type}测试
 自动生成的测试用例 - 请根据实际业务逻辑调整
 """
 
-{chr(10).join(imports)}
+{imports_block}
 
 
 '''
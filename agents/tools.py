@@ -3,11 +3,20 @@ Agent工具集合
 为不同的Agent提供专门的工具
 """
 
-from typing import Type, Any
+import functools
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Type, Any, Dict, Iterable, List, Tuple
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 
-from .claude_integration import claude_integration
+try:
+    import orjson
+except ImportError:
+    # orjson为可选依赖，未安装时使用标准库json
+    orjson = None
+
+from .claude_integration import get_claude_integration
 
 
 class DocumentationGenerationInput(BaseModel):
@@ -26,12 +35,12 @@ class DocumentationGenerationTool(BaseTool):
     def _run(self, target: str, doc_type: str = "api", include_examples: bool = True) -> str:
         """执行文档生成"""
         try:
-            result = claude_integration.generate_documentation(target, doc_type)
+            result = get_claude_integration().generate_documentation(target, doc_type)
             
             if include_examples and doc_type == "api":
                 # 为API文档添加使用示例
                 example_prompt = f"为 {target} 的API提供详细的使用示例和代码片段"
-                examples = claude_integration.execute_command(example_prompt)
+                examples = get_claude_integration().execute_command(example_prompt)
                 result += f"\n\n## 使用示例\n\n{examples}"
             
             return f"✅ 文档生成完成:\n\n{result}"
@@ -56,13 +65,13 @@ class CodeAnalysisTool(BaseTool):
         """执行代码分析"""
         try:
             if analysis_type == "full":
-                return claude_integration.analyze_file(file_path)
+                return get_claude_integration().analyze_file(file_path)
             elif analysis_type == "structure":
-                return claude_integration.explain_code(file_path)
+                return get_claude_integration().explain_code(file_path)
             elif analysis_type == "quality":
-                return claude_integration.review_code(file_path)
+                return get_claude_integration().review_code(file_path)
             else:
-                return claude_integration.analyze_file(file_path)
+                return get_claude_integration().analyze_file(file_path)
                 
         except Exception as e:
             return f"❌ 代码分析失败: {str(e)}"
@@ -82,11 +91,11 @@ class ProjectStructureTool(BaseTool):
     def _run(self, show_details: bool = True) -> str:
         """执行项目结构分析"""
         try:
-            structure = claude_integration.get_project_structure()
+            structure = get_claude_integration().get_project_structure()
             
             if show_details:
                 # 添加Python文件统计
-                python_files = claude_integration.list_python_files()
+                python_files = get_claude_integration().list_python_files()
                 file_summary = f"\n\n📊 项目统计:\n- Python文件数量: {len(python_files)}"
                 
                 # 按目录分组
@@ -121,7 +130,7 @@ class ImprovementSuggestionTool(BaseTool):
     def _run(self, target: str, focus_area: str = "all") -> str:
         """执行改进建议分析"""
         try:
-            suggestions = claude_integration.suggest_improvements(target)
+            suggestions = get_claude_integration().suggest_improvements(target)
             
             if focus_area != "all":
                 # 针对特定领域的建议
@@ -129,7 +138,7 @@ class ImprovementSuggestionTool(BaseTool):
                 针对 {target} 的 {focus_area} 方面提供详细的改进建议：
                 包括具体的实施步骤和代码示例
                 """
-                focused_suggestions = claude_integration.execute_command(focused_prompt)
+                focused_suggestions = get_claude_integration().execute_command(focused_prompt)
                 suggestions += f"\n\n🎯 {focus_area} 专项建议:\n{focused_suggestions}"
             
             return f"💡 改进建议:\n\n{suggestions}"
@@ -146,7 +155,7 @@ class HealthCheckTool(BaseTool):
     def _run(self) -> str:
         """执行健康检查"""
         try:
-            health_status = claude_integration.health_check()
+            health_status = get_claude_integration().health_check()
             
             status_text = f"""
 🔍 系统健康检查报告:
@@ -169,11 +178,79 @@ Python文件: {health_status.get('python_files_count', 0)} 个
             return f"❌ 健康检查失败: {str(e)}"
 
 
+class ToolInvocation(BaseModel):
+    """单次工具调用"""
+    tool_name: str = Field(..., description="工具名称")
+    arguments: Dict[str, Any] = Field(default_factory=dict, description="工具参数")
+
+
+class BatchToolInput(BaseModel):
+    """批量工具调用输入模型"""
+    invocations: List[ToolInvocation] = Field(..., description="需要同时执行的工具调用列表")
+
+
+class BatchTool(BaseTool):
+    """批量调用工具，一轮对话内并发执行多个工具调用"""
+    name: str = "batch"
+    description: str = "一次提交多个工具调用并并发执行，返回按调用顺序排列的JSON结果列表"
+    args_schema: Type[BaseModel] = BatchToolInput
+    registry: Dict[str, Any] = Field(default_factory=dict, exclude=True)
+    
+    def __init__(self, tools: Iterable[BaseTool], **kwargs):
+        super().__init__(registry={tool.name: tool for tool in tools}, **kwargs)
+    
+    def _invoke(self, invocation: Dict[str, Any]) -> Dict[str, Any]:
+        tool_name = invocation.get("tool_name")
+        tool = self.registry.get(tool_name)
+        if tool is None:
+            return {"tool_name": tool_name, "error": f"未知工具: {tool_name}"}
+        try:
+            return {"tool_name": tool_name, "result": tool._run(**invocation.get("arguments", {}))}
+        except Exception as e:
+            return {"tool_name": tool_name, "error": str(e)}
+    
+    def _run(self, invocations: List[Any]) -> str:
+        """并发执行所有调用"""
+        invocations = [
+            item.model_dump() if isinstance(item, BaseModel) else item
+            for item in invocations
+        ]
+        if not invocations:
+            return "[]"
+        with ThreadPoolExecutor(max_workers=min(len(invocations), 8)) as pool:
+            results = list(pool.map(self._invoke, invocations))
+        if orjson is not None:
+            return orjson.dumps(results).decode()
+        return json.dumps(results, ensure_ascii=False)
+
+
+@functools.lru_cache(maxsize=1)
+def get_shared_tools() -> Tuple[BaseTool, ...]:
+    """获取各Agent共享的通用工具实例（进程内只创建一次）"""
+    return (
+        DocumentationGenerationTool(),
+        CodeAnalysisTool(),
+        ProjectStructureTool(),
+        HealthCheckTool()
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def get_doc_tools() -> Tuple[BaseTool, ...]:
+    """获取文档Agent使用的工具实例（含批量调用工具），通用工具与其他Agent共享"""
+    doc_tool, code_tool, structure_tool, health_tool = get_shared_tools()
+    tools = (doc_tool, code_tool, structure_tool, ImprovementSuggestionTool(), health_tool)
+    return tools + (BatchTool(tools),)
+
+
 # 导出所有工具
 __all__ = [
     "DocumentationGenerationTool",
     "CodeAnalysisTool", 
     "ProjectStructureTool",
     "ImprovementSuggestionTool",
-    "HealthCheckTool"
+    "HealthCheckTool",
+    "BatchTool",
+    "get_shared_tools",
+    "get_doc_tools"
 ]
\ No newline at end of file